@@ -4,7 +4,7 @@ title = One Night Werewolf
 package.name = onenightwerewolf
 package.domain = com.example
 source.dir = .
-source.include_exts = py,kv,png,jpg,jpeg,ttf,ttc,otf,txt,md,mp3,wav,ogg
+source.include_exts = py,kv,png,jpg,jpeg,atlas,ttf,ttc,otf,txt,md,mp3,wav,ogg
 
 # Kivy 依赖
 requirements = python3==3.9.*,kivy==2.3.0,pyjnius==1.6.1
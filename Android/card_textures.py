@@ -0,0 +1,74 @@
+"""卡图纹理缓存：按 (角色, 尺寸档) 返回可直接赋给 background_normal / source 的图片地址。
+
+优先使用构建期生成的 atlas（wolf/tools/build_card_atlas.py，默认输出到 Android/atlas）：同一尺寸档的所有卡图在同一张
+GPU 纹理上，启动时预载入 Kivy 的 'kv.atlas' 缓存（该缓存不过期），之后每步重建按钮只是取
+同一纹理的子区域，不再重复解码、上传。没有 atlas（桌面调试）时退回原图路径。
+"""
+import glob
+import os
+import re
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from kivy.atlas import Atlas
+from kivy.cache import Cache
+from kivy.metrics import dp
+
+ATLAS_PATTERN = re.compile(r'^cards-(\d+)\.atlas$')
+
+
+def _to_px(height) -> float:
+    if isinstance(height, str):
+        return dp(height[:-2]) if height.endswith('dp') else float(height)
+    return float(height)
+
+
+class CardTextures:
+    def __init__(self, atlas_dirs: Iterable[str], resolve_path: Callable[[str], Optional[str]]):
+        self._resolve_path = resolve_path
+        # 尺寸档 -> (atlas:// 前缀, Atlas)
+        self._atlases: Dict[int, Tuple[str, Atlas]] = {}
+        self._cache: Dict[Tuple[str, Optional[int]], Optional[str]] = {}
+        for d in atlas_dirs:
+            if not d or not os.path.isdir(d):
+                continue
+            for path in sorted(glob.glob(os.path.join(d, 'cards-*.atlas'))):
+                m = ATLAS_PATTERN.match(os.path.basename(path))
+                if not m or int(m.group(1)) in self._atlases:
+                    continue
+                self._load(int(m.group(1)), path)
+        self.sizes = sorted(self._atlases)
+
+    def _load(self, size: int, path: str):
+        try:
+            atlas = Atlas(path)
+        except Exception:
+            return
+        base = os.path.splitext(os.path.abspath(path))[0]
+        # 与 kivy.core.image 解析 atlas:// 地址时使用的键一致，命中即不再加载
+        Cache.append('kv.atlas', base, atlas)
+        self._atlases[size] = (f"atlas://{base}", atlas)
+
+    def bucket(self, height) -> Optional[int]:
+        """不小于目标像素高度的最小档位；都不够时取最大档。无 atlas 返回 None。"""
+        if not self.sizes:
+            return None
+        px = _to_px(height)
+        for size in self.sizes:
+            if size >= px:
+                return size
+        return self.sizes[-1]
+
+    def source(self, role: str, height='180dp') -> Optional[str]:
+        size = self.bucket(height)
+        key = (role, size)
+        if key in self._cache:
+            return self._cache[key]
+        src = None
+        if size is not None:
+            prefix, atlas = self._atlases[size]
+            if role in atlas.textures:
+                src = f"{prefix}/{role}"
+        if src is None:
+            src = self._resolve_path(role)
+        self._cache[key] = src
+        return src
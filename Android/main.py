@@ -1,6 +1,5 @@
 import os
 import sys
-import random
 from collections import Counter
 from typing import List
 
@@ -44,6 +43,13 @@ for _wd in _wolf_candidates:
         break
 
 from core.werewolf_dealer import WerewolfDealer  # noqa: E402
+from core.night_controller import GROUP_ROLES, NightActionError, NightController  # noqa: E402
+from core.random_pool import random_pool  # noqa: E402
+from card_textures import CardTextures  # noqa: E402
+from sound_cache import SoundCache, VoiceChannel  # noqa: E402
+from narration import (  # noqa: E402
+    NIGHT_OVER_TEXT, NIGHT_START_TEXT, NarrationCache, copied_instruction, night_texts, step_instruction,
+)
 
 ROLE_DISPLAY_NAMES = {
     "werewolf": "狼人",
@@ -67,9 +73,18 @@ if WOLF_DIR:
 # 开发态回退到项目根的 images/roles；打包时我们会把图片复制到 Android/wolf/resources/roles
 ASSET_ROLE_DIRS.append(os.path.join(ROOT, '..', 'images', 'roles'))
 
-CARD_BACK = None
-CENTER_BACK = None
+# 构建期生成的卡图 atlas（见 wolf/tools/build_card_atlas.py）
+ATLAS_DIRS = [os.path.join(ROOT, 'atlas')]
+if WOLF_DIR:
+    ATLAS_DIRS.append(os.path.join(WOLF_DIR, 'resources', 'atlas'))
+
+CARD_TEXTURES = None
 SOUNDS_DIR = None
+# 除 wake/close 外角色额外用到的语音片段
+ROLE_VOICE_EXTRAS = {
+    'doppelganger': ('doppelganger_action',),
+    'minion': ('minion_thumb',),
+}
 
 
 def find_image(role: str):
@@ -112,6 +127,22 @@ def find_placeholder():
     return None
 
 
+def _resolve_card_path(role: str):
+    if role == 'background':
+        return find_placeholder()
+    return find_image(role)
+
+
+def card_image(role: str, height='180dp'):
+    """按角色与显示高度返回卡图地址（atlas 子图或原图路径），结果按尺寸档缓存。"""
+    global CARD_TEXTURES
+    if CARD_TEXTURES is None:
+        CARD_TEXTURES = CardTextures(ATLAS_DIRS, _resolve_card_path)
+    if role != 'background':
+        role = WerewolfDealer.normalize_role(role)
+    return CARD_TEXTURES.source(role, height)
+
+
 class RootManager(ScreenManager):
     pass
 
@@ -143,9 +174,9 @@ class OneNightApp(App):
         self.night_finished = False
         self.result_decided = False
         self._action_context = None
-        self._playing_sounds = []
-        self._tts_engine = plyer_tts
-        self._tts_available = self._tts_engine is not None
+        self._voice = None
+        # 旁白缓存：Android 上启动即初始化 TTS 引擎（预热），夜晚开始时预合成本局文案
+        self._narration = NarrationCache.for_platform(os.path.join(self.user_data_dir, 'narration'), fallback=plyer_tts)
         self._last_spoken_text = None
         self._advancing_role = False
 
@@ -159,6 +190,9 @@ class OneNightApp(App):
         self.init_role_select_screen()
         return self.manager
 
+    def on_stop(self):
+        self._narration.shutdown()
+
     def _init_cn_font(self):
         # 依次尝试项目内 fonts/、上级 fonts/、Windows/Android 常见中文字体
         candidates = []
@@ -211,12 +245,12 @@ class OneNightApp(App):
         roles_grid.clear_widgets()
         self.selected_set = set()
         self.role_tiles = {}
-        ph = find_placeholder()
+        ph = card_image('background', '210dp')
         for r in self.available_roles:
             # 容器：图片 + 文字
             box = BoxLayout(orientation='vertical', size_hint_y=None, height='260dp', padding='4dp', spacing='4dp')
             # 图片按钮
-            img_path = find_image(r) or ph or ''
+            img_path = card_image(r, '210dp') or ph or ''
             img_btn = Button(size_hint_y=None, height='210dp', background_normal=img_path, background_down=img_path)
             img_btn.role_internal = r
             # 角色中文名
@@ -341,21 +375,11 @@ class OneNightApp(App):
         if wolf_cnt > total_needed:
             wolf_cnt = total_needed
 
-        remaining = total_needed - wolf_cnt
-        candidates = [r for r in self.available_roles if r != 'werewolf']
-        random.shuffle(candidates)
-
-        picked = []
-        for role in candidates:
-            weight = 2 if role == 'mason' else 1
-            if weight <= remaining:
-                picked.append(role)
-                remaining -= weight
-            if remaining == 0:
-                break
-
-        if remaining != 0:
-            self.popup('随机失败', '可选角色不足以组成完整牌堆，请调整狼人数量或玩家人数。')
+        # 在可选角色（不含狼人）的所有合法组合中均匀抽取
+        try:
+            picked = random_pool(player_count, wolf_cnt, {'candidates': self.available_roles})
+        except ValueError as e:
+            self.popup('随机失败', str(e))
             return
 
         # 更新 UI 选中状态
@@ -381,7 +405,7 @@ class OneNightApp(App):
     def refresh_viewer(self):
         sc = self.manager.get_screen('viewing')
         sc.ids.viewer_title.text = f"玩家{self.view_index+1}"
-        self._update_viewer_image(self.get_back())
+        self._update_viewer_image(self.get_back(height='300dp'))
         sc.ids.viewer_name.text = ''
 
     def _update_viewer_image(self, path):
@@ -399,8 +423,8 @@ class OneNightApp(App):
         sc = self.manager.get_screen('viewing')
         if not self.viewed[idx]:
             role = self.player_roles[idx]
-            img = find_image(role)
-            self._update_viewer_image(img or self.get_back())
+            img = card_image(role, '300dp')
+            self._update_viewer_image(img or self.get_back(height='300dp'))
             try:
                 norm = WerewolfDealer.normalize_role(role)
             except Exception:
@@ -446,7 +470,7 @@ class OneNightApp(App):
             box.add_widget(Label(text=f'玩家{i+1}', size_hint_y=None, height='24dp'))
             btn = Button(size_hint_y=None, height='180dp', background_normal='', background_down='', border=(0, 0, 0, 0))
             btn.card_back = self.get_back()
-            btn.card_front = find_image(role) or self.get_back()
+            btn.card_front = card_image(role) or self.get_back()
             btn.showing = False
             if btn.card_back:
                 btn.background_normal = btn.card_back
@@ -461,7 +485,7 @@ class OneNightApp(App):
             box.add_widget(Label(text=f'中央{j+1}', size_hint_y=None, height='24dp'))
             btn = Button(size_hint_y=None, height='180dp', background_normal='', background_down='', border=(0, 0, 0, 0))
             btn.card_back = self.get_back(True)
-            btn.card_front = find_image(role) or self.get_back(True)
+            btn.card_front = card_image(role) or self.get_back(True)
             btn.showing = False
             if btn.card_back:
                 btn.background_normal = btn.card_back
@@ -489,10 +513,16 @@ class OneNightApp(App):
             pass
         self._stop_voice_playback()
         self._night_start_bgm()
-        self.night_steps = self.dealer.get_night_steps() or []
-        self.night_step_idx = 0
+        # 夜晚流程由 core.night_controller 驱动（与桌面版共用）；回合列表与控制器共用
+        self.night_ctl = NightController(self.dealer)
+        self.night_ctl.start()
+        self.night_steps = self.night_ctl.turns
+        self._preload_night_sounds(self.night_steps)
+        narr_steps = [dict(t, players=self._turn_players(t)) for t in self.night_steps]
+        self._narration.prepare(night_texts(narr_steps, self.player_roles, WerewolfDealer.normalize_role))
+        self.night_step_idx = self.night_ctl.index
         self._night_set_status('夜晚进行中')
-        self._night_set_text('夜晚开始…')
+        self._night_set_text(NIGHT_START_TEXT)
         self._log_action('夜晚开始')
         self._action_context = None
         self._play_general_sound('night_start', on_complete=self.run_night_step)
@@ -544,9 +574,30 @@ class OneNightApp(App):
             pass
 
     def _next_night_step(self, *_):
-        self.night_step_idx += 1
+        ctl = self.night_ctl
+        if ctl.current_step() is not None:
+            # 要求的动作未完成（倒计时结束）时放弃该动作
+            if ctl.can_continue():
+                ctl.advance()
+            else:
+                ctl.timeout()
+        self.night_step_idx = ctl.index
         self.run_night_step()
 
+    @staticmethod
+    def _turn_players(turn):
+        """回合的行动玩家：群体角色为全部持有者，其余为该回合的单个行动者。"""
+        if turn['role'] in GROUP_ROLES or turn.get('actor') is None:
+            return list(turn['players'])
+        return [turn['actor']]
+
+    def _night_try(self, func, *args):
+        """执行一次控制器动作；不允许的操作（重复点击等）忽略并返回 None。"""
+        try:
+            return func(*args)
+        except NightActionError:
+            return None
+
     def run_night_step(self, *_):
         self._advancing_role = False
         self._stop_voice_playback()
@@ -556,8 +607,9 @@ class OneNightApp(App):
         self._set_continue_enabled(False)
         self._cancel_night_timer()
 
-        if self.night_step_idx >= len(self.night_steps):
-            self._night_set_text('夜晚结束。请点击“结束夜晚”进入讨论阶段。')
+        ctl = self.night_ctl
+        if ctl.finished:
+            self._night_set_text(NIGHT_OVER_TEXT)
             self._action_context = None
             self._play_general_sound('night_over')
             self._set_continue_enabled(False)
@@ -567,163 +619,85 @@ class OneNightApp(App):
         self.night_remaining = 20
         self._night_tick()
 
-        step = self.night_steps[self.night_step_idx]
-        role = step.get('role')
-        players = step.get('players', [])
-        in_center = step.get('in_center', False)
+        view = ctl.view()
+        role = view['role']
+        players = view['actors']
         role_players_text = self._format_players(players)
-        normalized_role = WerewolfDealer.normalize_role(role) if role else role
-        display_name = ROLE_DISPLAY_NAMES.get(normalized_role, role or '')
+        display_name = ROLE_DISPLAY_NAMES.get(role, role or '')
+        if view['doppelganger']:
+            display_name = f"化身幽灵（{display_name}）"
         label = display_name
         if role_players_text:
             label = f"{display_name}（{role_players_text}）"
         self._action_context = {
-            'role': normalized_role or role,
+            'role': role,
             'players': players,
             'label': label,
             'display': display_name,
+            # 化身幽灵追加的失眠者回合：收尾播放化身幽灵的 close
+            'dg_close_for_copied': view['doppelganger'],
         }
         if label:
             self._log_action(f"{label}开始行动")
-        self._play_role_wake(role)
+        self._play_role_wake('doppelganger' if view['doppelganger'] else role)
 
         # Dispatch per role
-        if role == 'werewolf':
-            if not players:
-                self._night_set_text('狼人：若在场，请互相确认身份。')
-                self._set_continue_enabled(True)
-            elif len(players) == 1:
-                if role_players_text:
-                    text = f"狼人：{role_players_text} 为独狼，可查看任意一张中央牌。"
-                else:
-                    text = '狼人：独狼可查看一张中央牌。'
-                self._night_set_text(text)
+        if view['doppelganger']:
+            text = copied_instruction(role, view['actor'])
+        else:
+            text = step_instruction(role, players, self.player_roles, WerewolfDealer.normalize_role)
+        if text:
+            self._night_set_text(text)
+        self._night_dispatch(view, label)
+
+    def _night_dispatch(self, view, label):
+        """按控制器视图进入当前行动角色的操作界面（化身幽灵复制后以新角色再次调用）。"""
+        acting = view['acting_role']
+        actor = view['actor']
+        if actor is None or view['done']:
+            # 仅中央牌有该角色，或已无可执行的动作：只播报提示
+            self._set_continue_enabled(True)
+        elif acting == 'werewolf':
+            if view['selectable_centers']:
                 def on_reveal(idx, seen_role):
                     name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(seen_role), seen_role)
                     self._log_action(f"{label}查看中央{idx+1}：{name}")
-                self._night_focus_centers(peek_count=1, on_done=lambda: self._set_continue_enabled(True), on_reveal=on_reveal)
+                self._night_focus_centers(on_done=lambda: self._set_continue_enabled(True), on_reveal=on_reveal)
             else:
-                if role_players_text:
-                    text = f"狼人：{role_players_text} 请互相确认身份。"
-                else:
-                    text = '狼人：互相确认身份。'
-                self._night_set_text(text)
-                if role_players_text:
-                    self._log_action(f"{label}互相确认身份")
-                else:
-                    self._log_action('狼人互相确认身份')
-                self._set_continue_enabled(True)
-        elif role == 'minion':
-            if not players:
-                self._night_set_text('爪牙：若在场，请默记守护对象。')
+                self._log_action(f"{label}互相确认身份")
                 self._set_continue_enabled(True)
-                return
-            wolf_idxs = [i for i, r in enumerate(self.player_roles) if WerewolfDealer.normalize_role(r) == 'werewolf']
-            wolf_text = self._format_players(wolf_idxs)
+        elif acting == 'minion':
+            wolf_text = self._format_players(view.get('wolves', []))
             if wolf_text:
-                if role_players_text:
-                    text = f"爪牙：{role_players_text}，狼人有 {wolf_text}。"
-                else:
-                    text = f"爪牙：狼人有 {wolf_text}。"
                 self._log_action(f"{label}确认狼人：{wolf_text}")
             else:
-                text = f"爪牙：{role_players_text}，本局没有狼人。" if role_players_text else '爪牙：本局没有狼人。'
                 self._log_action(f"{label}确认本局没有狼人")
-            self._night_set_text(text)
             # 音频顺序交由 _finish_role_and_then 统一处理（wake -> [thumb] -> close）
             self._set_continue_enabled(True)
-        elif role == 'mason':
-            if not players:
-                self._night_set_text('守夜人：若在场，请互相确认身份。')
-                self._set_continue_enabled(True)
-                return
-            if role_players_text:
-                text = f"守夜人：{role_players_text} 请互相确认身份。"
-            else:
-                text = '守夜人：两位守夜人互认。'
-            self._night_set_text(text)
-            if role_players_text:
-                self._log_action(f"{label}互认身份")
+        elif acting == 'mason':
+            self._log_action(f"{label}互认身份")
             self._set_continue_enabled(True)
-        elif role == 'seer':
-            if not players:
-                self._night_set_text('预言家：若在场，可查看两张中央或一名玩家。')
-                self._set_continue_enabled(True)
-                return
-            if role_players_text:
-                text = f"预言家：{role_players_text}，请选择“查看两张中央”或“查看一名玩家”。"
-            else:
-                text = '预言家：请选择“查看两张中央”或“查看一名玩家”。'
-            self._night_set_text(text)
+        elif acting == 'seer':
             self._night_action_buttons([
                 ('查看两张中央', lambda: self._seer_mode_center()),
                 ('查看一名玩家', lambda: self._seer_mode_player()),
             ])
-        elif role == 'robber':
-            robber = players[0] if players else None
-            if robber is not None:
-                text = f"强盗：玩家{robber+1}，请选择一名其他玩家交换。"
-            else:
-                if not players:
-                    self._night_set_text('强盗：若在场，请选择一名其他玩家交换。')
-                    self._set_continue_enabled(True)
-                    return
-                text = '强盗：请选择一名其他玩家交换。'
-            self._night_set_text(text)
-            self._robber_mode(robber)
-        elif role == 'troublemaker':
-            tm = players[0] if players else None
-            if tm is not None:
-                text = f"捣蛋鬼：玩家{tm+1}，请选择两名其他玩家交换。"
-            else:
-                if not players:
-                    self._night_set_text('捣蛋鬼：若在场，请选择两名玩家交换。')
-                    self._set_continue_enabled(True)
-                    return
-                text = '捣蛋鬼：请选择两名其他玩家交换。'
-            self._night_set_text(text)
-            self._troublemaker_mode(tm)
-        elif role == 'drunk':
-            drunk = players[0] if players else None
-            if drunk is not None:
-                text = f"酒鬼：玩家{drunk+1}，请选择一张中央牌交换（不展示新牌）。"
-            else:
-                if not players:
-                    self._night_set_text('酒鬼：若在场，请与中央任意一张牌交换。')
-                    self._set_continue_enabled(True)
-                    return
-                text = '酒鬼：请选择一张中央牌交换（不展示新牌）。'
-            self._night_set_text(text)
-            self._drunk_mode(drunk)
-        elif role == 'insomniac':
-            i_idx = players[0] if players else None
-            if i_idx is not None:
-                text = f"失眠者：玩家{i_idx+1}，查看你当前的牌，然后点击继续。"
-            else:
-                if not players:
-                    self._night_set_text('失眠者：若在场，请查看你当前的牌。')
-                    self._set_continue_enabled(True)
-                    return
-                text = '失眠者：查看你当前的牌。'
-            self._night_set_text(text)
-            if i_idx is not None:
-                self._night_focus_single_player(i_idx)
-                seen_role = self.player_roles[i_idx]
+        elif acting == 'robber':
+            self._robber_mode(actor)
+        elif acting == 'troublemaker':
+            self._troublemaker_mode(actor)
+        elif acting == 'drunk':
+            self._drunk_mode(actor)
+        elif acting == 'insomniac':
+            seen_role = self._night_try(self.night_ctl.view_own)
+            self._night_focus_single_player(actor)
+            if seen_role:
                 name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(seen_role), seen_role)
                 self._log_action(f"{label}查看当前身份：{name}")
             self._set_continue_enabled(True)
-        elif role == 'doppelganger':
+        elif acting == 'doppelganger':
             # 化身幽灵：选择一名其他玩家查看并复制其角色，随后执行复制角色的夜晚行动
-            if not players:
-                self._night_set_text('化身幽灵：若在场，请选择一名玩家复制其角色。')
-                self._set_continue_enabled(True)
-                return
-            if role_players_text:
-                text = f"化身幽灵：{role_players_text}，请选择一名其他玩家复制其角色，然后点击“确认复制”。"
-            else:
-                text = '化身幽灵：请选择一名其他玩家，查看并复制其角色，然后点击“确认复制”。'
-            self._night_set_text(text)
-            self._dg_mode(players)
+            self._dg_mode(actor)
         else:
             # Unknown or no-op role
             self._set_continue_enabled(True)
@@ -736,23 +710,10 @@ class OneNightApp(App):
             pass
 
     def _speak_instruction(self, text):
-        if not text:
+        if not text or not self._narration.available:
             return
-        if not getattr(self, '_tts_available', False):
-            return
-        engine = getattr(self, '_tts_engine', None)
-        if not engine:
-            return
-        try:
-            if hasattr(engine, 'stop'):
-                engine.stop()
-        except Exception:
-            pass
-        try:
-            engine.speak(text)
-            self._last_spoken_text = text
-        except Exception:
-            self._tts_available = False
+        self._narration.speak(text)
+        self._last_spoken_text = text
 
     def _night_set_text(self, text, speak=True):
         try:
@@ -831,41 +792,26 @@ class OneNightApp(App):
         except Exception:
             return None
 
-    def _night_focus_centers(self, peek_count=1, on_done=None, on_reveal=None):
+    def _night_focus_centers(self, on_done=None, on_reveal=None):
+        """展示可查看的中央牌；每次点击由控制器查看一张，控制器判定该角色查看完毕后调用 on_done。"""
         actions = self.manager.get_screen('board').ids.night_actions
         actions.clear_widgets()
-        remaining = {'n': peek_count}
-        def on_click(j):
-            if remaining['n'] <= 0:
-                return
-            role = self.center_roles[j]
-            # reveal by replacing button background
-            for child in actions.children:
-                pass
-            if on_reveal:
-                try:
-                    on_reveal(j, role)
-                except Exception:
-                    pass
-            remaining['n'] -= 1
-            if remaining['n'] <= 0 and on_done:
-                try:
-                    on_done()
-                except TypeError:
-                    on_done(None)
-        # build three center buttons
-        for j, role in enumerate(self.center_roles):
+        selectable = self.night_ctl.view()['selectable_centers']
+        for j in selectable:
             btn = Button(size_hint_y=None, height='180dp', background_normal=self.get_back(True), background_down='')
-            front = find_image(role) or self.get_back(True)
-            def bind_click(b=btn, idx=j, front_path=front):
-                def handler(_):
-                    # 仅当仍有剩余次数时允许翻开
-                    if remaining['n'] <= 0:
-                        return
-                    b.background_normal = front_path
-                    on_click(idx)
-                b.bind(on_release=handler)
-            bind_click()
+            def handler(b, idx=j):
+                role = self._night_try(self.night_ctl.peek_center, idx)
+                if role is None:
+                    return
+                b.background_normal = card_image(role) or self.get_back(True)
+                if on_reveal:
+                    try:
+                        on_reveal(idx, role)
+                    except Exception:
+                        pass
+                if self.night_ctl.view()['done'] and on_done:
+                    on_done()
+            btn.bind(on_release=handler)
             actions.add_widget(btn)
 
     def _night_focus_players(self, indices, on_click):
@@ -884,30 +830,33 @@ class OneNightApp(App):
         actions = self.manager.get_screen('board').ids.night_actions
         actions.clear_widgets()
         role = self.player_roles[idx]
-        img = find_image(role) or self.get_back()
+        img = card_image(role, '220dp') or self.get_back(height='220dp')
         btn = Button(size_hint_y=None, height='220dp', background_normal=img, background_down='')
         actions.add_widget(btn)
         name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(role), role)
         actions.add_widget(Label(text=f'玩家{idx+1}：{name}', size_hint_y=None, height='28dp'))
 
     # ---- Doppelganger (化身幽灵) ----
-    def _dg_mode(self, dg_indices):
-        # 选择一名不在 dg_indices 列表中的玩家作为复制目标
-        self._dg_state = {'players': dg_indices[:], 'target': None, 'copied_role': None, 'confirm_btn': None}
-        others = [i for i in range(self.player_count) if i not in dg_indices]
+    def _dg_mode(self, dg_idx):
+        # 选择一名其他玩家作为复制目标：点击即查看并复制（只能选一次）
+        self._dg_state = {'player': dg_idx, 'target': None, 'copied_role': None, 'confirm_btn': None}
+        others = self.night_ctl.view()['selectable_players']
         actions = self.manager.get_screen('board').ids.night_actions
         actions.clear_widgets()
         # 点击某玩家后，展示该玩家当前牌并记录复制角色
         def on_pick(i):
+            copied = self._night_try(self.night_ctl.copy, i)
+            if copied is None:
+                return
             role = self.player_roles[i]
-            img = find_image(role) or self.get_back()
+            img = card_image(role, '220dp') or self.get_back(height='220dp')
             actions.clear_widgets()
             btn = Button(size_hint_y=None, height='220dp', background_normal=img, background_down='')
             actions.add_widget(btn)
             name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(role), role)
             actions.add_widget(Label(text=f'玩家{i+1}：{name}', size_hint_y=None, height='28dp'))
             self._dg_state['target'] = i
-            self._dg_state['copied_role'] = role
+            self._dg_state['copied_role'] = copied
             # 启用确认按钮
             if self._dg_state.get('confirm_btn') is None:
                 box = self._night_buttons_box()
@@ -919,89 +868,52 @@ class OneNightApp(App):
         self._night_focus_players(others, on_pick)
 
     def _dg_confirm_copy(self):
-        role = self._dg_state.get('copied_role') if hasattr(self, '_dg_state') else None
-        dg_indices = self._dg_state.get('players') if hasattr(self, '_dg_state') else []
-        if not role or not dg_indices:
+        state = getattr(self, '_dg_state', None) or {}
+        role = state.get('copied_role')
+        if not role:
             # 未选择目标则直接进入下一步
-            self._next_night_step()
+            self._advance_role()
             return
-        target_idx = self._dg_state.get('target') if hasattr(self, '_dg_state') else None
+        target_idx = state.get('target')
         # 移除确认按钮，防止重复点击
         try:
-            btn = self._dg_state.get('confirm_btn')
+            btn = state.get('confirm_btn')
             if btn is not None:
                 box = self._night_buttons_box()
                 if box is not None:
                     box.remove_widget(btn)
-                self._dg_state['confirm_btn'] = None
+                state['confirm_btn'] = None
         except Exception:
             pass
-        if target_idx is not None:
-            copied_name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(role), role)
-            label = self._current_role_label('doppelganger', dg_indices) or '化身幽灵'
-            self._log_action(f"{label}复制了 玩家{target_idx+1}（{copied_name}）")
+        copied_name = ROLE_DISPLAY_NAMES.get(role, role)
+        label = self._current_role_label('doppelganger', [state.get('player')]) or '化身幽灵'
+        self._log_action(f"{label}复制了 玩家{target_idx+1}（{copied_name}）")
         # 确认复制后播放化身幽灵的行动提示音（action），音频结束后再进入复制角色的行动
-        copied = role
-        def _after_action():
-            self._dg_run_copied_role_action(copied, dg_indices)
-        if not self._play_sound('doppelganger_action.mp3', on_complete=lambda: _after_action()):
-            _after_action()
+        if not self._play_sound('doppelganger_action.mp3', on_complete=self._dg_run_copied_role_action):
+            self._dg_run_copied_role_action()
 
-    def _dg_run_copied_role_action(self, copied_role, dg_indices):
-        try:
-            role = WerewolfDealer.normalize_role(copied_role)
-        except Exception:
-            role = str(copied_role) if copied_role else None
-        if not role:
-            self._next_night_step()
+    def _dg_run_copied_role_action(self):
+        view = self.night_ctl.view()
+        if view['done']:
+            # 狼人/爪牙/守夜人随该角色一同醒来，失眠者在失眠者之后再次醒来；其它无行动：直接允许继续
+            self._set_continue_enabled(True)
             return
+        role = view['acting_role']
+        idx = view['actor']
         cn_name = ROLE_DISPLAY_NAMES.get(role, role)
-        players_text = self._format_players(dg_indices)
-        action_label = f"化身幽灵（{cn_name}）"
-        if players_text:
-            action_label = f"{action_label}（{players_text}）"
+        action_label = f"化身幽灵（{cn_name}）（玩家{idx+1}）"
         # 标记：这是化身幽灵执行复制角色的行动，收尾时应播放化身幽灵的 close
         self._action_context = {
             'role': role,
-            'players': dg_indices,
+            'players': [idx],
             'label': action_label,
             'display': action_label,
             'dg_close_for_copied': True,
         }
         self._log_action(f"{action_label}开始行动")
         # 不播放复制角色的提示音，避免暴露化身幽灵的新身份
-        # 选择首个化身幽灵玩家索引作为后续行动主体（与桌面版一致的简化）
-        idx = dg_indices[0] if dg_indices else None
-        if role == 'seer':
-            self._night_set_text('化身幽灵（预言家）：选择“查看两张中央”或“查看一名玩家”')
-            self._night_action_buttons([
-                ('查看两张中央', lambda: self._seer_mode_center()),
-                ('查看一名玩家', lambda: self._seer_mode_player()),
-            ])
-            return
-        if role == 'robber' and idx is not None:
-            self._night_set_text(f'化身幽灵（强盗）：玩家{idx+1}，请选择一名其他玩家交换')
-            self._robber_mode(idx)
-            return
-        if role == 'troublemaker' and idx is not None:
-            self._night_set_text(f'化身幽灵（捣蛋鬼）：玩家{idx+1}，请选择两名其他玩家交换')
-            self._troublemaker_mode(idx)
-            return
-        if role == 'drunk' and idx is not None:
-            self._night_set_text(f'化身幽灵（酒鬼）：玩家{idx+1}，请选择一张中央牌交换（不展示新牌）')
-            self._drunk_mode(idx)
-            return
-        if role == 'insomniac' and idx is not None:
-            self._night_set_text(f'化身幽灵（失眠者）：玩家{idx+1}，查看你当前的牌')
-            self._night_focus_single_player(idx)
-            seen_role = self.player_roles[idx]
-            name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(seen_role), seen_role)
-            label = self._current_role_label('insomniac', dg_indices) or action_label
-            self._log_action(f"{label}查看当前身份：{name}")
-            self._set_continue_enabled(True)
-            return
-        # werewolf/minion/mason 或其它无行动：直接允许继续
-        self._set_continue_enabled(True)
+        self._night_set_text(copied_instruction(role, idx))
+        self._night_dispatch(view, action_label)
 
     # ---- Role modes ----
     def _seer_mode_center(self):
@@ -1017,26 +929,25 @@ class OneNightApp(App):
                     parts.append(f"中央{idx+1}（{name}）")
                 self._log_action(f"{label}查看中央：{'，'.join(parts)}")
             self._set_continue_enabled(True)
-        self._night_focus_centers(peek_count=2, on_done=done, on_reveal=on_reveal)
+        self._night_focus_centers(on_done=done, on_reveal=on_reveal)
 
     def _seer_mode_player(self):
         def on_pick(i):
-            role = self.player_roles[i]
-            img = find_image(role)
+            role = self._night_try(self.night_ctl.peek_player, i)
+            if role is None:
+                return
+            img = card_image(role, '220dp')
             actions = self.manager.get_screen('board').ids.night_actions
             actions.clear_widgets()
-            btn = Button(size_hint_y=None, height='220dp', background_normal=(img or self.get_back()), background_down='')
+            btn = Button(size_hint_y=None, height='220dp', background_normal=(img or self.get_back(height='220dp')), background_down='')
             actions.add_widget(btn)
             name = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(role), role)
             actions.add_widget(Label(text=f'玩家{i+1}：{name}', size_hint_y=None, height='28dp'))
             label = self._current_role_label('seer') or '预言家'
             self._log_action(f"{label}查看玩家{i+1}：{name}")
             self._set_continue_enabled(True)
-        # 禁止查看自己：从当前执行预言家的玩家索引中过滤
-        ctx = getattr(self, '_action_context', {}) or {}
-        forbidden = set(ctx.get('players') or [])
-        selectable = [idx for idx in range(self.player_count) if idx not in forbidden]
-        self._night_focus_players(selectable, on_pick)
+        # 控制器给出的可选玩家已排除预言家本人
+        self._night_focus_players(self.night_ctl.view()['selectable_players'], on_pick)
 
     # ---- Focus mode (hide board grids during role actions) ----
     def _enter_focus_mode(self):
@@ -1067,18 +978,15 @@ class OneNightApp(App):
         # 选择一名其他玩家后，立即执行交换，并仅展示被点玩家的原牌与编号；不再显示选择界面/确认按钮。
         actions = self.manager.get_screen('board').ids.night_actions
         actions.clear_widgets()
-        others = [i for i in range(self.player_count) if i != robber_idx]
+        others = self.night_ctl.view()['selectable_players']
 
         def _pick_once(i):
-            # 记录被点玩家当前牌用于展示
-            role_before = self.player_roles[i]
-            img = find_image(role_before) or self.get_back()
+            # 执行交换（控制器返回换来的新牌，即被点玩家的原牌）
+            role_before = self._night_try(self.night_ctl.rob, i)
+            if role_before is None:
+                return
+            img = card_image(role_before, '220dp') or self.get_back(height='220dp')
             name_before = ROLE_DISPLAY_NAMES.get(WerewolfDealer.normalize_role(role_before), role_before)
-            # 执行交换
-            try:
-                self.dealer.swap_between_players(robber_idx, i)
-            except Exception:
-                pass
             self._sync_from_session_android()
             # 日志记录强盗的新牌
             new_role = self.player_roles[robber_idx]
@@ -1109,7 +1017,7 @@ class OneNightApp(App):
         # 自定义独立操作界面：选择两名其他玩家，按“确认交换”生效
         actions = self.manager.get_screen('board').ids.night_actions
         actions.clear_widgets()
-        others = [i for i in range(self.player_count) if i != tm_idx]
+        others = self.night_ctl.view()['selectable_players']
         # 状态：已选列表和每个tile的高亮
         self._tm_state = {
             'sel': [],
@@ -1140,17 +1048,13 @@ class OneNightApp(App):
                 pass
 
         def _toggle(i):
-            sel = self._tm_state['sel']
-            if i in sel:
-                sel.remove(i)
-                _set_tile_selected(i, False)
-            else:
-                sel.append(i)
-                # 最多保留两个，超出的移除最早的一个
-                if len(sel) > 2:
-                    drop = sel.pop(0)
-                    _set_tile_selected(drop, False)
-                _set_tile_selected(i, True)
+            # 由控制器维护选择（最多两个，超出时移除最早的一个）
+            sel = self._night_try(self.night_ctl.select_for_swap, i)
+            if sel is None:
+                return
+            self._tm_state['sel'] = sel
+            for k in self._tm_state['tiles']:
+                _set_tile_selected(k, k in sel)
             _update_confirm()
 
         # 构建候选玩家操作卡片
@@ -1182,10 +1086,9 @@ class OneNightApp(App):
                 if len(sel) != 2:
                     return
                 a, b = sel[0], sel[1]
-                try:
-                    self.dealer.swap_between_players(a, b)
-                except Exception:
-                    pass
+                self._night_try(self.night_ctl.swap_players)
+                if not self.night_ctl.view()['done']:
+                    return
                 self._sync_from_session_android()
                 label = self._current_role_label('troublemaker', [tm_idx]) or f'捣蛋鬼（玩家{tm_idx+1}）'
                 self._log_action(f"{label}交换了 玩家{a+1} 与 玩家{b+1}")
@@ -1263,10 +1166,9 @@ class OneNightApp(App):
                 j = self._drunk_state.get('sel')
                 if j is None:
                     return
-                try:
-                    self.dealer.swap_with_center(drunk_idx, j)
-                except Exception:
-                    pass
+                self._night_try(self.night_ctl.swap_center, j)
+                if not self.night_ctl.view()['done']:
+                    return
                 self._sync_from_session_android()
                 label = self._current_role_label('drunk', [drunk_idx]) or f'酒鬼（玩家{drunk_idx+1}）'
                 self._log_action(f"{label}与 中央{j+1} 交换")
@@ -1309,6 +1211,23 @@ class OneNightApp(App):
                 break
         return SOUNDS_DIR
 
+    def _voice_channel(self):
+        if self._voice is None:
+            self._voice = VoiceChannel(SoundCache(self._ensure_sounds_dir()))
+        return self._voice
+
+    def _preload_night_sounds(self, steps):
+        # 只预加载本局会用到的片段：通用提示 + 有人持有或在中央的角色的 wake/close
+        names = ['night_start', 'night_over']
+        for step in steps:
+            role = step.get('role')
+            if not role or not (step.get('players') or step.get('in_center')):
+                continue
+            r = WerewolfDealer.normalize_role(role)
+            names += [f'{r}_wake', f'{r}_close']
+            names += ROLE_VOICE_EXTRAS.get(r, ())
+        self._voice_channel().cache.preload(names)
+
     def _play_role_wake(self, role):
         mp = {
             'seer': ('seer_wake.mp3',),
@@ -1392,73 +1311,17 @@ class OneNightApp(App):
                 on_complete()
 
     def _stop_voice_playback(self):
-        # stop all currently playing guide sounds/tts to avoid overlap
-        for snd in list(getattr(self, '_playing_sounds', []) or []):
-            try:
-                snd.stop()
-            except Exception:
-                pass
-        self._playing_sounds = []
-        if getattr(self, '_tts_available', False):
-            engine = getattr(self, '_tts_engine', None)
-            if engine and hasattr(engine, 'stop'):
-                try:
-                    engine.stop()
-                except Exception:
-                    pass
+        # 打断当前语音（不触发其完成回调），并停止 TTS，避免重叠
+        if self._voice is not None:
+            self._voice.stop()
+        self._narration.stop()
 
     def _play_sound(self, filename, on_complete=None):
-        d = self._ensure_sounds_dir()
-        if not d:
-            return False
-        path = os.path.join(d, filename)
-        if not os.path.exists(path):
-            # try uppercase extension variants
-            base, ext = os.path.splitext(filename)
-            alt = os.path.join(d, f'{base}.MP3')
-            if not os.path.exists(alt):
-                return False
-            path = alt
+        name = os.path.splitext(filename)[0]
         try:
-            snd = SoundLoader.load(path)
-            if snd:
-                self._stop_voice_playback()
-                fired = {'done': False}
-
-                def _cleanup(*_):
-                    if fired['done']:
-                        return
-                    fired['done'] = True
-                    try:
-                        snd.unbind(on_stop=_cleanup)
-                    except Exception:
-                        pass
-                    try:
-                        self._playing_sounds.remove(snd)
-                    except (ValueError, AttributeError):
-                        pass
-                    if on_complete:
-                        on_complete()
-
-                try:
-                    snd.bind(on_stop=_cleanup)
-                except Exception:
-                    pass
-                try:
-                    self._playing_sounds.append(snd)
-                except Exception:
-                    self._playing_sounds = [snd]
-                snd.play()
-                duration = getattr(snd, 'length', None)
-                if duration is None or duration <= 0:
-                    fallback_delay = 0.6
-                else:
-                    fallback_delay = duration + 0.05
-                Clock.schedule_once(lambda *_: _cleanup(), fallback_delay)
-                return True
+            return self._voice_channel().play(name, on_complete=on_complete)
         except Exception:
             return False
-        return False
 
     def _night_start_bgm(self):
         d = self._ensure_sounds_dir()
@@ -1493,7 +1356,7 @@ class OneNightApp(App):
         # 若夜晚已结束且尚未判定结果：翻开即判定结果一次
         if self.night_finished and not self.result_decided:
             # 先翻开
-            btn.background_normal = find_image(self.player_roles[idx]) or btn.card_front
+            btn.background_normal = card_image(self.player_roles[idx]) or btn.card_front
             btn.background_down = btn.background_normal
             self._evaluate_result(idx)
             return
@@ -1657,18 +1520,9 @@ class OneNightApp(App):
         # Finally, show the selection screen
         self.manager.current = 'role_select'
 
-    def get_back(self, center=False):
-        global CARD_BACK, CENTER_BACK
-        if center and CENTER_BACK:
-            return CENTER_BACK
-        if not center and CARD_BACK:
-            return CARD_BACK
-        ph = find_placeholder()
-        if center:
-            CENTER_BACK = ph or ''
-            return CENTER_BACK
-        CARD_BACK = ph or ''
-        return CARD_BACK
+    def get_back(self, center=False, height='180dp'):
+        # 玩家牌与中央牌共用同一卡背
+        return card_image('background', height) or ''
 
     def popup(self, title, msg):
         Popup(title=title, content=Label(text=msg), size_hint=(.8, .4)).open()
@@ -0,0 +1,369 @@
+"""夜晚旁白：文案生成与预合成缓存。
+
+每一步的提示文案只取决于本局发到的牌，夜晚开始时即可全部算出（night_texts）。
+NarrationCache 在后台线程把这些文案合成为音频文件（按文案哈希命名，跨局复用），
+播放时直接读取文件，不再在每一步临时调用 TTS 引擎：
+- Android：通过 pyjnius 使用常驻的 android.speech.tts.TextToSpeech，启动时初始化（预热），
+  synthesizeToFile 预合成；尚未合成完的文案用已预热的引擎直接朗读；
+- 其它平台：没有文件输出，退回 plyer，朗读放在后台线程，不阻塞夜晚计时。
+"""
+import hashlib
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+from kivy.utils import platform
+
+NIGHT_START_TEXT = '夜晚开始…'
+NIGHT_OVER_TEXT = '夜晚结束。请点击“结束夜晚”进入讨论阶段。'
+# 合成文件大小连续保持不变多久视为完成（秒）
+SYNTH_SETTLE = 0.3
+SYNTH_TIMEOUT = 15.0
+# 旁白缓存最多保留的文件数（文案含座位号，组合随局数增长），超出后按最近使用时间淘汰
+MAX_CACHE_FILES = 300
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:20]
+
+
+def _players_text(players: Sequence[int]) -> str:
+    return '、'.join(f"玩家{p+1}" for p in players)
+
+
+def step_instruction(role: str, players: Sequence[int], player_roles: Sequence[str],
+                     normalize: Callable[[str], str] = lambda r: r) -> Optional[str]:
+    """夜晚某一步的提示文案；未知角色返回 None。"""
+    who = _players_text(players)
+    first = players[0] + 1 if players else None
+    if role == 'werewolf':
+        if not players:
+            return '狼人：若在场，请互相确认身份。'
+        if len(players) == 1:
+            return f"狼人：{who} 为独狼，可查看任意一张中央牌。"
+        return f"狼人：{who} 请互相确认身份。"
+    if role == 'minion':
+        if not players:
+            return '爪牙：若在场，请默记守护对象。'
+        wolves = _players_text([i for i, r in enumerate(player_roles) if normalize(r) == 'werewolf'])
+        if wolves:
+            return f"爪牙：{who}，狼人有 {wolves}。"
+        return f"爪牙：{who}，本局没有狼人。"
+    if role == 'mason':
+        if not players:
+            return '守夜人：若在场，请互相确认身份。'
+        return f"守夜人：{who} 请互相确认身份。"
+    if role == 'seer':
+        if not players:
+            return '预言家：若在场，可查看两张中央或一名玩家。'
+        return f"预言家：{who}，请选择“查看两张中央”或“查看一名玩家”。"
+    if role == 'robber':
+        if not players:
+            return '强盗：若在场，请选择一名其他玩家交换。'
+        return f"强盗：玩家{first}，请选择一名其他玩家交换。"
+    if role == 'troublemaker':
+        if not players:
+            return '捣蛋鬼：若在场，请选择两名玩家交换。'
+        return f"捣蛋鬼：玩家{first}，请选择两名其他玩家交换。"
+    if role == 'drunk':
+        if not players:
+            return '酒鬼：若在场，请与中央任意一张牌交换。'
+        return f"酒鬼：玩家{first}，请选择一张中央牌交换（不展示新牌）。"
+    if role == 'insomniac':
+        if not players:
+            return '失眠者：若在场，请查看你当前的牌。'
+        return f"失眠者：玩家{first}，查看你当前的牌，然后点击继续。"
+    if role == 'doppelganger':
+        if not players:
+            return '化身幽灵：若在场，请选择一名玩家复制其角色。'
+        return f"化身幽灵：{who}，请选择一名其他玩家复制其角色，然后点击“确认复制”。"
+    return None
+
+
+def copied_instruction(role: str, idx: Optional[int]) -> Optional[str]:
+    """化身幽灵复制到有夜晚行动的角色后的提示文案；无行动返回 None。"""
+    if role == 'seer':
+        return '化身幽灵（预言家）：选择“查看两张中央”或“查看一名玩家”'
+    if idx is None:
+        return None
+    if role == 'robber':
+        return f'化身幽灵（强盗）：玩家{idx+1}，请选择一名其他玩家交换'
+    if role == 'troublemaker':
+        return f'化身幽灵（捣蛋鬼）：玩家{idx+1}，请选择两名其他玩家交换'
+    if role == 'drunk':
+        return f'化身幽灵（酒鬼）：玩家{idx+1}，请选择一张中央牌交换（不展示新牌）'
+    if role == 'insomniac':
+        return f'化身幽灵（失眠者）：玩家{idx+1}，查看你当前的牌'
+    return None
+
+
+def night_texts(steps: Iterable[Dict], player_roles: Sequence[str],
+                normalize: Callable[[str], str] = lambda r: r) -> List[str]:
+    """本局夜晚可能朗读的全部文案（按出现顺序去重）。"""
+    texts = [NIGHT_START_TEXT]
+    for step in steps:
+        players = step.get('players', [])
+        texts.append(step_instruction(step.get('role'), players, player_roles, normalize))
+        if step.get('role') == 'doppelganger' and players:
+            # 化身幽灵可能复制到场上任意角色
+            for r in sorted({normalize(r) for r in player_roles}):
+                texts.append(copied_instruction(r, players[0]))
+    texts.append(NIGHT_OVER_TEXT)
+    seen = set()
+    return [t for t in texts if t and not (t in seen or seen.add(t))]
+
+
+class AndroidTTS:
+    """常驻的 android.speech.tts.TextToSpeech（pyjnius）。构造即开始异步初始化。"""
+
+    def __init__(self):
+        from jnius import PythonJavaClass, autoclass, java_method
+
+        self.ready = False
+        self.failed = False
+        # speak/stop 的次数（主线程递增，合成线程比较），用于识别被打断的合成
+        self._flushes = 0
+        self._String = autoclass('java.lang.String')
+        self._File = autoclass('java.io.File')
+        TextToSpeech = autoclass('android.speech.tts.TextToSpeech')
+        Locale = autoclass('java.util.Locale')
+        self._QUEUE_FLUSH = TextToSpeech.QUEUE_FLUSH
+        self._SUCCESS = TextToSpeech.SUCCESS
+        owner = self
+
+        class _InitListener(PythonJavaClass):
+            __javainterfaces__ = ['android/speech/tts/TextToSpeech$OnInitListener']
+            __javacontext__ = 'app'
+
+            @java_method('(I)V')
+            def onInit(self, status):
+                if status == owner._SUCCESS:
+                    owner._tts.setLanguage(Locale.SIMPLIFIED_CHINESE)
+                    owner.ready = True
+                else:
+                    owner.failed = True
+
+        # 监听器需保持引用，否则会被回收
+        self._listener = _InitListener()
+        activity = autoclass('org.kivy.android.PythonActivity').mActivity
+        self._tts = TextToSpeech(activity, self._listener)
+
+    def wait_ready(self, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.ready and not self.failed and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self.ready
+
+    def speak(self, text: str):
+        if self.ready:
+            # QUEUE_FLUSH 会中止进行中的 synthesizeToFile，记一次打断让 synthesize 判定失败
+            self._flushes += 1
+            self._tts.speak(self._String(text), self._QUEUE_FLUSH, None, text_key(text))
+
+    def stop(self):
+        if self.ready:
+            self._flushes += 1
+            self._tts.stop()
+
+    def synthesize(self, text: str, path: str) -> bool:
+        """合成到文件并等待写完（文件大小稳定）。只在工作线程调用。"""
+        if not self.wait_ready():
+            return False
+        flushes = self._flushes
+        status = self._tts.synthesizeToFile(self._String(text), None, self._File(path), text_key(text))
+        if status != self._SUCCESS:
+            return False
+        # UtteranceProgressListener 是抽象类，pyjnius 无法继承，改为观察文件大小
+        deadline = time.monotonic() + SYNTH_TIMEOUT
+        last_size, stable_since = -1, None
+        while time.monotonic() < deadline:
+            if self._flushes != flushes:
+                # 合成途中被朗读或 stop 打断，文件不完整
+                return False
+            size = os.path.getsize(path) if os.path.exists(path) else -1
+            if size > 44 and size == last_size:
+                if stable_since is None:
+                    stable_since = time.monotonic()
+                elif time.monotonic() - stable_since >= SYNTH_SETTLE:
+                    return self._flushes == flushes
+            else:
+                stable_since = None
+            last_size = size
+            time.sleep(0.1)
+        return False
+
+    def shutdown(self):
+        try:
+            self._tts.shutdown()
+        except Exception:
+            pass
+
+
+class NarrationCache:
+    def __init__(self, cache_dir: str, engine: Optional[AndroidTTS] = None, fallback=None,
+                 max_files: int = MAX_CACHE_FILES):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.engine = engine
+        self.fallback = fallback
+        self.available = engine is not None or fallback is not None
+        self._sounds: Dict[str, object] = {}
+        self._current = None
+        self._engine_speaking = False
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name='narration', daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def for_platform(cls, cache_dir: str, fallback=None) -> "NarrationCache":
+        engine = None
+        if platform == 'android':
+            try:
+                engine = AndroidTTS()
+            except Exception:
+                engine = None
+        return cls(cache_dir, engine=engine, fallback=None if engine else fallback)
+
+    def path_for(self, text: str) -> str:
+        return os.path.join(self.cache_dir, f"{text_key(text)}.wav")
+
+    # --- 预合成 ---
+    def prepare(self, texts: Iterable[str]):
+        """后台合成尚无文件的文案；已有文件的在主线程空闲时载入。"""
+        for text in texts:
+            key = text_key(text)
+            if key in self._sounds:
+                continue
+            if os.path.exists(self.path_for(text)):
+                Clock.schedule_once(lambda _dt, t=text: self._load(t), 0)
+            elif self.engine is not None:
+                with self._lock:
+                    if key in self._pending:
+                        continue
+                    self._pending.add(key)
+                self._jobs.put(('render', text))
+
+    def _load(self, text: str):
+        key = text_key(text)
+        if key in self._sounds:
+            return
+        try:
+            snd = SoundLoader.load(self.path_for(text))
+        except Exception:
+            snd = None
+        if snd is not None:
+            self._sounds[key] = snd
+            # 以修改时间记录最近使用，供 _prune 按 LRU 淘汰
+            try:
+                os.utime(self.path_for(text))
+            except OSError:
+                pass
+
+    def _render(self, text: str):
+        path = self.path_for(text)
+        tmp = f"{path}.part"
+        try:
+            ok = self.engine.synthesize(text, tmp)
+            if ok:
+                os.replace(tmp, path)
+        except Exception:
+            ok = False
+        with self._lock:
+            self._pending.discard(text_key(text))
+        if ok:
+            # Sound 对象在主线程创建
+            Clock.schedule_once(lambda _dt: self._load(text), 0)
+            self._prune()
+        elif os.path.exists(tmp):
+            # 失败或被打断的半成品不入缓存；_pending 已清除，下一次 prepare 会重新合成
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _prune(self):
+        """缓存文件数超过 max_files 时删除最久未用的文件，本局已载入的文案不删。只在工作线程调用。"""
+        entries = []
+        for fn in os.listdir(self.cache_dir):
+            if not fn.endswith('.wav'):
+                continue
+            p = os.path.join(self.cache_dir, fn)
+            try:
+                entries.append((os.stat(p).st_mtime, fn[:-4], p))
+            except OSError:
+                continue
+        excess = len(entries) - self.max_files
+        if excess <= 0:
+            return
+        entries.sort()
+        for _mtime, key, p in entries:
+            if excess <= 0:
+                break
+            if key in self._sounds:
+                continue
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            excess -= 1
+
+    def _run(self):
+        while True:
+            kind, text = self._jobs.get()
+            try:
+                if kind == 'render':
+                    self._render(text)
+                elif kind == 'speak' and self.fallback is not None:
+                    self.fallback.speak(text)
+            except Exception:
+                if kind == 'speak':
+                    self.fallback = None
+                    self.available = self.engine is not None
+
+    # --- 播放 ---
+    def speak(self, text: str):
+        """立即朗读：有预合成文件则播放文件，否则用已预热引擎；都不会阻塞主线程。"""
+        if not text:
+            return
+        self.stop()
+        snd = self._sounds.get(text_key(text))
+        if snd is not None:
+            self._current = snd
+            snd.play()
+            return
+        if self.engine is not None and self.engine.ready:
+            # 直接朗读会清空引擎队列：进行中的合成因此失败并被丢弃，下次 prepare 时重新合成
+            self.engine.speak(text)
+            self._engine_speaking = True
+        elif self.fallback is not None:
+            self._jobs.put(('speak', text))
+
+    def stop(self):
+        if self._current is not None:
+            try:
+                self._current.stop()
+            except Exception:
+                pass
+            self._current = None
+        if self.engine is not None:
+            # 引擎 stop 也会中断后台合成，只在确实由引擎朗读时调用
+            if self._engine_speaking:
+                self.engine.stop()
+                self._engine_speaking = False
+        elif self.fallback is not None and hasattr(self.fallback, 'stop'):
+            try:
+                self.fallback.stop()
+            except Exception:
+                pass
+
+    def shutdown(self):
+        self.stop()
+        if self.engine is not None:
+            self.engine.shutdown()
@@ -0,0 +1,188 @@
+"""夜晚语音：按片段名缓存已加载的 Sound，并用单一语音通道保证同一时刻只播放一段。
+
+- SoundCache.preload(names) 在主线程按帧分批加载（每帧有时间预算），夜晚开始时把本局
+  角色用到的片段提前解码好，之后播放不再临时 SoundLoader.load；
+- VoiceChannel.play(name, on_complete) 会打断上一段；被打断或 stop() 的片段不触发回调，
+  只有自然播放结束才回调一次。结束以 on_stop 为准，另有状态轮询兜底（部分后端不派发 on_stop）。
+"""
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+
+SOUND_EXTS = ('.mp3', '.MP3', '.ogg', '.wav')
+# 每帧用于加载的时间上限（秒），避免夜晚开始时卡顿
+PRELOAD_BUDGET = 0.008
+POLL_INTERVAL = 0.1
+# length 未知时的最长等待（秒）
+MAX_CLIP_SECONDS = 30.0
+
+
+class SoundCache:
+    def __init__(self, sounds_dir: Optional[str]):
+        self.sounds_dir = sounds_dir
+        self._sounds: Dict[str, object] = {}
+        self._missing = set()
+        self._queue: List[str] = []
+        self._ev = None
+        self._on_loaded: List[Callable[[], None]] = []
+
+    def path_for(self, name: str) -> Optional[str]:
+        """片段名（不含扩展名）对应的文件，大小写扩展名都尝试。"""
+        if not self.sounds_dir:
+            return None
+        for ext in SOUND_EXTS:
+            p = os.path.join(self.sounds_dir, name + ext)
+            if os.path.exists(p):
+                return p
+        return None
+
+    def get(self, name: str):
+        """取已缓存的 Sound；未预加载时同步加载一次。无文件或加载失败返回 None。"""
+        snd = self._sounds.get(name)
+        if snd is not None or name in self._missing:
+            return snd
+        return self._load(name)
+
+    def _load(self, name: str):
+        path = self.path_for(name)
+        snd = None
+        if path:
+            try:
+                snd = SoundLoader.load(path)
+            except Exception:
+                snd = None
+        if snd is None:
+            self._missing.add(name)
+        else:
+            self._sounds[name] = snd
+        return snd
+
+    def preload(self, names: Iterable[str], on_done: Optional[Callable[[], None]] = None):
+        for name in names:
+            if name not in self._sounds and name not in self._missing and name not in self._queue:
+                self._queue.append(name)
+        if on_done is not None:
+            self._on_loaded.append(on_done)
+        if self._queue:
+            if self._ev is None:
+                self._ev = Clock.schedule_interval(self._load_some, 0)
+        else:
+            self._finish()
+
+    def _load_some(self, _dt):
+        start = time.perf_counter()
+        while self._queue and time.perf_counter() - start < PRELOAD_BUDGET:
+            name = self._queue.pop(0)
+            # 排队期间可能已被 get() 同步加载；不重复解码，也不替换正在播放的 Sound
+            if name not in self._sounds and name not in self._missing:
+                self._load(name)
+        if not self._queue:
+            self._ev.cancel()
+            self._ev = None
+            self._finish()
+            return False
+
+    def _finish(self):
+        callbacks, self._on_loaded = self._on_loaded, []
+        for cb in callbacks:
+            cb()
+
+    def unload(self):
+        if self._ev is not None:
+            self._ev.cancel()
+            self._ev = None
+        self._queue = []
+        for snd in self._sounds.values():
+            try:
+                snd.stop()
+                snd.unload()
+            except Exception:
+                pass
+        self._sounds.clear()
+        self._missing.clear()
+
+
+class VoiceChannel:
+    """单一语音通道：新片段打断旧片段，完成回调只在自然结束时触发一次。"""
+
+    def __init__(self, cache: SoundCache):
+        self.cache = cache
+        self._current = None
+        self._on_complete: Optional[Callable[[], None]] = None
+        self._poll_ev = None
+        self._deadline = 0.0
+        self._started = False
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None
+
+    def play(self, name: str, on_complete: Optional[Callable[[], None]] = None) -> bool:
+        """播放片段；找不到片段时同样停止上一段并返回 False（不回调，由调用方决定是否直接继续）。"""
+        snd = self.cache.get(name)
+        # 无论新片段是否存在，上一段都不应再继续播放到下一步
+        self.stop()
+        if snd is None:
+            return False
+        self._current = snd
+        self._on_complete = on_complete
+        self._started = False
+        snd.bind(on_stop=self._on_sound_stop)
+        try:
+            snd.seek(0)
+        except Exception:
+            pass
+        snd.play()
+        length = getattr(snd, 'length', None) or 0
+        self._deadline = time.monotonic() + (length + 2.0 if length > 0 else MAX_CLIP_SECONDS)
+        self._poll_ev = Clock.schedule_interval(self._poll, POLL_INTERVAL)
+        return True
+
+    def stop(self):
+        """打断当前片段，不触发其完成回调。"""
+        snd = self._detach()
+        if snd is not None:
+            try:
+                snd.stop()
+            except Exception:
+                pass
+
+    def _detach(self):
+        snd = self._current
+        if snd is None:
+            return None
+        try:
+            snd.unbind(on_stop=self._on_sound_stop)
+        except Exception:
+            pass
+        if self._poll_ev is not None:
+            self._poll_ev.cancel()
+            self._poll_ev = None
+        self._current = None
+        self._on_complete = None
+        return snd
+
+    def _complete(self):
+        cb = self._on_complete
+        self._detach()
+        if cb is not None:
+            cb()
+
+    def _on_sound_stop(self, snd):
+        if snd is self._current:
+            self._complete()
+
+    def _poll(self, _dt):
+        snd = self._current
+        if snd is None:
+            return False
+        state = getattr(snd, 'state', None)
+        if state == 'play':
+            self._started = True
+        # 开始播放后又回到 stop 说明已自然结束；超时兜底防止流程卡死
+        if (self._started and state == 'stop') or time.monotonic() >= self._deadline:
+            self._complete()
+            return False
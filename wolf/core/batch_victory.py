@@ -0,0 +1,113 @@
+"""批量胜负结算：一次对 n 局的终局牌面与处决结果做 NumPy 归约得到签名，再查 core.outcome_table 的胜负表，
+规则与 WerewolfDealer.evaluate_victory 一致。
+
+输入均为紧凑数组：
+    final_cards (n, players) int8   夜晚结束时玩家面前的角色 ID（WerewolfDealer.ROLE_IDS），-1 为空座位
+    executed    (n, k)       int    被处决的座位，-1 表示空位（未处决或补齐）
+    is_tie      (n,)         bool   平票（不死人）
+    copied      (n,)         int8   可选，化身幽灵复制到的角色 ID，-1 表示未复制
+    votes       (n, players) int    可选，每名玩家投票的座位，-1 表示未投票；给出时结算猎人连锁处决
+返回 {"good", "wolf", "tanner"} 三列布尔数组。
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from core import outcome_table
+from core.game_record import VERDICT_GOOD, VERDICT_TANNER, VERDICT_WOLF
+from core.werewolf_dealer import WerewolfDealer
+
+_IDS = WerewolfDealer.ROLE_IDS
+WEREWOLF = _IDS["werewolf"]
+MINION = _IDS["minion"]
+TANNER = _IDS["tanner"]
+DOPPELGANGER = _IDS["doppelganger"]
+HUNTER = _IDS["hunter"]
+
+
+def encode_cards(rows: Sequence[Sequence[str]], width: Optional[int] = None) -> np.ndarray:
+    """把若干局的角色名列表编码为 (n, width) int8 矩阵，不足处补 -1。"""
+    width = width or max((len(r) for r in rows), default=0)
+    out = np.full((len(rows), width), -1, dtype=np.int8)
+    role_id = WerewolfDealer.role_id
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = [role_id(r) for r in row]
+    return out
+
+
+def encode_executed(rows: Sequence[Sequence[int]], width: Optional[int] = None) -> np.ndarray:
+    """把若干局的座位列表（处决座位或投票）编码为 (n, width) 矩阵，不足处及 None 补 -1。"""
+    width = max(1, width or max((len(r) for r in rows), default=0))
+    out = np.full((len(rows), width), -1, dtype=np.int16)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = [-1 if x is None else x for x in row]
+    return out
+
+
+def resolve_copies(final_cards: np.ndarray, copied: Optional[np.ndarray]) -> np.ndarray:
+    """化身幽灵牌按其复制到的角色结算（未复制的保持原 ID）。"""
+    if copied is None:
+        return final_cards
+    copied = np.asarray(copied, dtype=np.int8)[:, None]
+    return np.where((final_cards == DOPPELGANGER) & (copied >= 0), copied, final_cards)
+
+
+def executed_mask(final_cards: np.ndarray, executed: np.ndarray, votes=None) -> np.ndarray:
+    """(n, players) 死亡座位掩码；空位与越界座位忽略。给出 votes 时按猎人连锁扩展。
+
+    与 WerewolfDealer.resolve_executions 相同：固定深度（不超过人数轮）迭代，
+    每轮把已死亡猎人的投票对象标记为死亡，某轮无新增即提前结束。
+    """
+    n, players = final_cards.shape
+    rows = np.arange(n)[:, None]
+    executed = np.asarray(executed).reshape(n, -1)
+    # 多出的一列收纳空位与越界座位，结束时丢弃
+    dead = np.zeros((n, players + 1), dtype=bool)
+    dead[rows, np.where((executed >= 0) & (executed < players), executed, players)] = True
+    if votes is not None:
+        votes = np.asarray(votes).reshape(n, -1)[:, :players]
+        if votes.shape[1] < players:
+            votes = np.pad(votes, ((0, 0), (0, players - votes.shape[1])), constant_values=-1)
+        targets = np.where((votes >= 0) & (votes < players), votes, players)
+        hunters = final_cards == HUNTER
+        if hunters.any():
+            for _ in range(players):
+                shooters = dead[:, :players] & hunters
+                before = dead.sum()
+                dead[rows, np.where(shooters, targets, players)] = True
+                if dead.sum() == before:
+                    break
+    return dead[:, :players]
+
+
+def signatures(final_cards: np.ndarray, dead: np.ndarray, tie: np.ndarray) -> np.ndarray:
+    """逐局计算 outcome_table 签名（uint8）；平票局忽略死亡者。"""
+    sig = np.where(tie, outcome_table.SIG_TIE, 0).astype(np.uint8)
+    killed = dead & ~tie[:, None]
+    seated = final_cards >= 0
+    for role, present_bit, kill_bit in ((WEREWOLF, outcome_table.SIG_WOLF, outcome_table.SIG_KILL_WOLF),
+                                        (MINION, outcome_table.SIG_MINION, outcome_table.SIG_KILL_MINION),
+                                        (TANNER, outcome_table.SIG_TANNER, outcome_table.SIG_KILL_TANNER)):
+        is_role = final_cards == role
+        sig |= np.where(is_role.any(axis=1), present_bit, 0).astype(np.uint8)
+        sig |= np.where((killed & is_role).any(axis=1), kill_bit, 0).astype(np.uint8)
+        seated &= ~is_role
+    sig |= np.where((killed & seated).any(axis=1), outcome_table.SIG_KILL_OTHER, 0).astype(np.uint8)
+    return sig
+
+
+def evaluate_victory_batch(final_cards, executed, is_tie=None, copied=None, votes=None) -> Dict[str, np.ndarray]:
+    final_cards = resolve_copies(np.asarray(final_cards, dtype=np.int8), copied)
+    n = final_cards.shape[0]
+    executed = np.asarray(executed).reshape(n, -1)
+    tie = np.zeros(n, dtype=bool) if is_tie is None else np.asarray(is_tie, dtype=bool)
+    if final_cards.ndim != 2 or tie.shape != (n,):
+        raise ValueError("final_cards 需为 (n, players)，is_tie 需为 (n,)")
+
+    dead = executed_mask(final_cards, executed, votes)
+    verdict = np.frombuffer(outcome_table.table(), dtype=np.uint8)[signatures(final_cards, dead, tie)]
+    return {
+        "good": (verdict & VERDICT_GOOD) > 0,
+        "wolf": (verdict & VERDICT_WOLF) > 0,
+        "tanner": (verdict & VERDICT_TANNER) > 0,
+    }
@@ -0,0 +1,237 @@
+"""跨机器分布式模拟：协调者（Coordinator）分发工作单元，工作者（run_worker）运行发牌引擎并回传聚合计数。
+
+协议为普通 TCP，每条消息 = 4 字节大端长度 + JSON：
+    工作者 -> 协调者  {"type": "request"}                          申请工作单元
+                      {"type": "result", "unit_id", "counts"}     交回结果（随后可继续 request）
+    协调者 -> 工作者  {"type": "unit", "unit": {...}, "lease"}     租约内须交回，否则重新排队
+                      {"type": "wait", "retry"}                    暂无可分配单元（仍有租约未完成）
+                      {"type": "done"}                             全部完成
+工作单元 = 角色池 × 一段种子区间；工作者断线或租约过期时，其持有的单元重新排队。
+结果按单元去重后合并到各角色池的聚合计数（core.simulation.TALLY_FIELDS）。
+"""
+import collections
+import json
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core import game_log
+from core.simulation import merge_tally, pool_id, tally
+
+_LENGTH = struct.Struct(">I")
+MAX_MESSAGE = 16 * 1024 * 1024
+DEFAULT_LEASE = 60.0
+DEFAULT_UNIT_GAMES = 2000
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+# ---- 消息收发 ----
+def send_message(sock: socket.socket, msg: Dict):
+    body = game_log.dumps(msg)
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            if buf:
+                raise ProtocolError("连接在消息中途关闭")
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict]:
+    """读取一条消息；对端正常关闭时返回 None。"""
+    head = _recv_exact(sock, _LENGTH.size)
+    if head is None:
+        return None
+    (size,) = _LENGTH.unpack(head)
+    if size > MAX_MESSAGE:
+        raise ProtocolError(f"消息过大：{size} 字节")
+    body = _recv_exact(sock, size)
+    if body is None:
+        raise ProtocolError("连接在消息中途关闭")
+    try:
+        msg = json.loads(body)
+    except ValueError as e:
+        raise ProtocolError(f"消息解析失败：{e}")
+    if not isinstance(msg, dict) or "type" not in msg:
+        raise ProtocolError("消息缺少 type")
+    return msg
+
+
+# ---- 工作单元 ----
+def make_units(pools: Sequence[Sequence[str]], games: int, seed: int = 0, policy: str = "random",
+               unit_games: int = DEFAULT_UNIT_GAMES) -> List[Dict]:
+    """把每个角色池的 games 局按 unit_games 切成工作单元（种子区间连续，合并后与单机结果一致）。"""
+    if unit_games < 1:
+        raise ValueError("unit_games 至少为 1")
+    units = []
+    for pool in pools:
+        for start in range(0, games, unit_games):
+            units.append({
+                "unit_id": len(units),
+                "pool": list(pool),
+                "pool_id": pool_id(pool),
+                "seed": seed + start,
+                "games": min(unit_games, games - start),
+                "policy": policy,
+            })
+    return units
+
+
+def run_unit(unit: Dict) -> Dict[str, int]:
+    return tally(unit["pool"], unit["games"], unit["seed"], unit["policy"])
+
+
+# ---- 协调者 ----
+class Coordinator:
+    """持有单元队列、租约与聚合结果；start() 后在后台线程监听，wait() 等待全部完成。"""
+
+    def __init__(self, units: Sequence[Dict], host: str = "127.0.0.1", port: int = 0,
+                 lease: float = DEFAULT_LEASE):
+        self.units = {u["unit_id"]: u for u in units}
+        self.lease = lease
+        self.totals: Dict[int, Dict[str, int]] = {}
+        self._pending = collections.deque(self.units)
+        self._leases: Dict[int, Tuple[float, int]] = {}  # unit_id -> (到期时间, 连接编号)
+        self._done = set()
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._next_conn = 0
+        if not self.units:
+            self._finished.set()
+        coordinator = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._serve(self.request)
+
+        class _Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = _Server((host, port), _Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "Coordinator":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="coordinator", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._done), len(self.units)
+
+    # --- 租约 ---
+    def _expire_leases(self, now: float):
+        for uid, (deadline, _conn) in list(self._leases.items()):
+            if deadline <= now:
+                del self._leases[uid]
+                self._pending.appendleft(uid)
+
+    def _release(self, conn: int):
+        """连接断开：该连接持有的租约全部重新排队。"""
+        with self._lock:
+            for uid, (_deadline, owner) in list(self._leases.items()):
+                if owner == conn:
+                    del self._leases[uid]
+                    self._pending.appendleft(uid)
+
+    def _lease_next(self, conn: int) -> Dict:
+        with self._lock:
+            if self._finished.is_set():
+                return {"type": "done"}
+            now = time.monotonic()
+            self._expire_leases(now)
+            while self._pending:
+                uid = self._pending.popleft()
+                if uid in self._done:
+                    continue
+                self._leases[uid] = (now + self.lease, conn)
+                return {"type": "unit", "unit": self.units[uid], "lease": self.lease}
+            return {"type": "wait", "retry": min(1.0, self.lease / 4)}
+
+    def _complete(self, uid: int, counts: Dict[str, int]):
+        with self._lock:
+            unit = self.units.get(uid)
+            # 重复交回（租约过期后被别的工作者重做）只计一次
+            if unit is None or uid in self._done:
+                return
+            self._done.add(uid)
+            self._leases.pop(uid, None)
+            merge_tally(self.totals.setdefault(unit["pool_id"], {}), counts)
+            if len(self._done) == len(self.units):
+                self._finished.set()
+
+    def _serve(self, sock: socket.socket):
+        with self._lock:
+            conn = self._next_conn
+            self._next_conn += 1
+        try:
+            while True:
+                msg = recv_message(sock)
+                if msg is None:
+                    break
+                if msg["type"] == "result":
+                    self._complete(msg.get("unit_id"), msg.get("counts") or {})
+                    continue
+                if msg["type"] != "request":
+                    raise ProtocolError(f"未知消息类型 {msg['type']!r}")
+                reply = self._lease_next(conn)
+                send_message(sock, reply)
+                if reply["type"] == "done":
+                    break
+        except (OSError, ProtocolError):
+            pass
+        finally:
+            self._release(conn)
+
+
+# ---- 工作者 ----
+def run_worker(host: str, port: int, max_units: Optional[int] = None, connect_timeout: float = 10.0) -> int:
+    """连接协调者并循环处理单元，直到收到 done（或处理满 max_units 个）；返回完成的单元数。"""
+    done = 0
+    with socket.create_connection((host, port), timeout=connect_timeout) as sock:
+        sock.settimeout(None)
+        while max_units is None or done < max_units:
+            send_message(sock, {"type": "request"})
+            msg = recv_message(sock)
+            if msg is None or msg["type"] == "done":
+                break
+            if msg["type"] == "wait":
+                time.sleep(float(msg.get("retry", 0.5)))
+                continue
+            unit = msg["unit"]
+            send_message(sock, {"type": "result", "unit_id": unit["unit_id"], "counts": run_unit(unit)})
+            done += 1
+    return done
@@ -0,0 +1,93 @@
+"""流式对局日志：把日志记录逐条写成 JSON Lines，不在内存中累积。
+
+sink 可以是任意可调用对象（接收一条 dict），也可以是生成器/协程（自动预激后逐条 send）。
+JsonlSink 为最常用的文件 sink；装有 orjson 时走其快速路径，否则用标准库 json。
+"""
+import json
+from typing import Callable, Dict, IO, Iterable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def _dumps_std(record: Dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _dumps_orjson(record: Dict) -> bytes:
+    return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS, default=_default)
+
+
+def _default(obj):
+    # frozenset / set（如夜晚计划中的中央角色集合）按排序后的列表输出
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"无法序列化 {type(obj).__name__}")
+
+
+dumps = _dumps_orjson if orjson is not None else _dumps_std
+
+
+def as_callback(sink) -> Optional[Callable[[Dict], None]]:
+    """把 sink 统一为回调：可调用对象原样返回；生成器预激后返回其 send。"""
+    if sink is None or callable(sink):
+        return sink
+    if hasattr(sink, "send"):
+        next(sink)
+        return sink.send
+    raise TypeError("sink 需为可调用对象或生成器")
+
+
+class JsonlSink:
+    """写 JSON Lines 的 sink；可传入路径（追加打开）或已打开的二进制文件对象。"""
+
+    def __init__(self, target: Union[str, IO[bytes]], flush_every: int = 256):
+        if isinstance(target, str):
+            self._f = open(target, "ab")
+            self._owns = True
+        else:
+            self._f = target
+            self._owns = False
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+
+    def __call__(self, record: Dict):
+        self._f.write(dumps(record) + b"\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._f.flush()
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        if self._f is None:
+            return
+        self._f.flush()
+        if self._owns:
+            self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_jsonl(records: Iterable[Dict], path: str) -> int:
+    """把记录流写入文件，返回写入条数。"""
+    with JsonlSink(path) as sink:
+        for record in records:
+            sink(record)
+        return sink.count
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
@@ -0,0 +1,302 @@
+"""紧凑二进制对局记录（.onwr）：定长记录，可追加写入，读取时 mmap 零拷贝。
+
+文件布局：
+- 文件头 16 字节：b"ONWR"、版本(u16)、记录长度(u16)、最大玩家数(u8)、最大行动数(u8)、保留
+- 之后为若干条定长记录（RECORD_SIZE 字节），每条一局：
+    player_count  u8
+    deal          int8[15]   发牌时的角色 ID（WerewolfDealer.ROLE_ORDER），前 n 个为玩家、随后 3 张中央，空位 -1
+    actions       24 × (kind u8, a int8, b int8)   每名玩家至多两个（化身幽灵的复制及复制来的行动）
+                  kind 低 5 位为行动角色 ID，ACTION_CENTER 表示 a/b 为中央牌序号，
+                  ACTION_DOPPEL 表示由化身幽灵执行复制来的行动；空槽 kind = 0xFF
+                  强盗与酒鬼的 b 为行动者座位（同一角色可有多名持有者）
+    executed      u16        被处决座位的位掩码
+    verdict       u8         VERDICT_* 位组合
+
+一千万局约 910MB。有 numpy 时 GameRecordReader 以结构化数组分批返回（文件映射上的视图，
+不复制）；没有 numpy 时退回 struct 逐条解码为字典。
+"""
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖
+    np = None
+
+from core.werewolf_dealer import WerewolfDealer
+
+MAGIC = b"ONWR"
+VERSION = 2
+MAX_PLAYERS = 12
+CENTER_SIZE = 3
+DEAL_SLOTS = MAX_PLAYERS + CENTER_SIZE
+MAX_ACTIONS = 2 * MAX_PLAYERS
+
+ACTION_ROLE_MASK = 0x1F
+ACTION_DOPPEL = 0x20
+ACTION_CENTER = 0x40
+ACTION_EMPTY = 0xFF
+
+VERDICT_GOOD = 1
+VERDICT_WOLF = 2
+VERDICT_TANNER = 4
+VERDICT_TIE = 8
+
+_HEADER = struct.Struct("<4sHHBB6x")
+_RECORD = struct.Struct("<B%db%s" % (DEAL_SLOTS, "Bbb" * MAX_ACTIONS) + "HB")
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+if np is not None:
+    ACTION_DTYPE = np.dtype([("kind", "u1"), ("a", "i1"), ("b", "i1")])
+    RECORD_DTYPE = np.dtype([
+        ("player_count", "u1"),
+        ("deal", "i1", (DEAL_SLOTS,)),
+        ("actions", ACTION_DTYPE, (MAX_ACTIONS,)),
+        ("executed", "<u2"),
+        ("verdict", "u1"),
+    ])
+    assert RECORD_DTYPE.itemsize == RECORD_SIZE
+else:
+    ACTION_DTYPE = RECORD_DTYPE = None
+
+
+class RecordFormatError(ValueError):
+    """文件不是 .onwr 记录或版本不兼容。"""
+
+
+def _pack_header() -> bytes:
+    return _HEADER.pack(MAGIC, VERSION, RECORD_SIZE, MAX_PLAYERS, MAX_ACTIONS)
+
+
+def _check_header(data: bytes):
+    if len(data) < HEADER_SIZE:
+        raise RecordFormatError("文件头不完整")
+    magic, version, rec_size, max_players, max_actions = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise RecordFormatError("不是对局记录文件")
+    if version != VERSION or rec_size != RECORD_SIZE or max_players != MAX_PLAYERS or max_actions != MAX_ACTIONS:
+        raise RecordFormatError(f"不支持的记录版本 {version}（记录长度 {rec_size}）")
+
+
+# ---- 编码 ----
+def verdict_bits(result: Dict[str, bool], is_tie: bool = False) -> int:
+    bits = VERDICT_TIE if is_tie else 0
+    if result.get("good"):
+        bits |= VERDICT_GOOD
+    if result.get("wolf"):
+        bits |= VERDICT_WOLF
+    if result.get("tanner"):
+        bits |= VERDICT_TANNER
+    return bits
+
+
+def actions_from_log(log: Iterable[Dict]) -> List[Tuple[int, int, int]]:
+    """把 run_night_automation 的日志转成 (kind, a, b) 行动元组（无状态变化的确认类日志不记录）。"""
+    rid = WerewolfDealer.ROLE_IDS
+    actions = []
+    for entry in log:
+        role = entry.get("role")
+        flag = ACTION_DOPPEL if entry.get("doppelganger") else 0
+        if role == "doppelganger" and "copied_from" in entry:
+            actions.append((rid["doppelganger"], entry["copied_from"], -1))
+        elif role == "werewolf" and "center_peek" in entry:
+            actions.append((rid["werewolf"] | ACTION_CENTER | flag, entry["center_peek"], -1))
+        elif role == "seer" and "peek_player" in entry:
+            actions.append((rid["seer"] | flag, entry["peek_player"], -1))
+        elif role == "seer" and "peek_center" in entry:
+            idxs = list(entry["peek_center"]) + [-1, -1]
+            actions.append((rid["seer"] | ACTION_CENTER | flag, idxs[0], idxs[1]))
+        elif role == "robber" and "swapped_with" in entry:
+            actions.append((rid["robber"] | flag, entry["swapped_with"], entry["robber"]))
+        elif role == "troublemaker" and "swapped" in entry:
+            a, b = entry["swapped"]
+            actions.append((rid["troublemaker"] | flag, a, b))
+        elif role == "drunk" and "center_index" in entry:
+            actions.append((rid["drunk"] | ACTION_CENTER | flag, entry["center_index"], entry["drunk"]))
+        elif role == "insomniac" and "insomniac" in entry:
+            actions.append((rid["insomniac"] | flag, entry["insomniac"], -1))
+    return actions
+
+
+def encode_game(player_cards: Sequence[str], center_cards: Sequence[str],
+                actions: Sequence[Tuple[int, int, int]] = (), executed: Iterable[int] = (),
+                verdict: int = 0) -> bytes:
+    """编码一局为 RECORD_SIZE 字节。player_cards / center_cards 为发牌时（夜晚前）的牌面。"""
+    n = len(player_cards)
+    if not 1 <= n <= MAX_PLAYERS or len(center_cards) > CENTER_SIZE:
+        raise ValueError(f"玩家人数需在 1~{MAX_PLAYERS} 之间、中央牌不超过 {CENTER_SIZE} 张")
+    if len(actions) > MAX_ACTIONS:
+        raise ValueError(f"夜晚行动超过 {MAX_ACTIONS} 个")
+    deal = [WerewolfDealer.role_id(r) for r in list(player_cards) + list(center_cards)]
+    deal += [-1] * (DEAL_SLOTS - len(deal))
+    flat: List[int] = []
+    for kind, a, b in actions:
+        flat += [kind, a, b]
+    flat += [ACTION_EMPTY, -1, -1] * (MAX_ACTIONS - len(actions))
+    mask = 0
+    for seat in executed:
+        if 0 <= seat < n:
+            mask |= 1 << seat
+    return _RECORD.pack(n, *deal, *flat, mask, verdict)
+
+
+def encode_session(dealer: WerewolfDealer, log: Iterable[Dict] = (), executed: Iterable[int] = (),
+                   result: Optional[Dict[str, bool]] = None, is_tie: bool = False) -> bytes:
+    s = dealer.session
+    verdict = verdict_bits(result or {}, is_tie)
+    return encode_game(s["initial_player_cards"], s["initial_center_cards"], actions_from_log(log), executed, verdict)
+
+
+# ---- 写入 ----
+class GameRecordWriter:
+    """追加写入；新文件（或空文件）先写文件头，已有文件校验文件头后接着写。"""
+
+    def __init__(self, path: str, buffer_records: int = 16384):
+        self.path = path
+        self._buffer_limit = max(1, buffer_records) * RECORD_SIZE
+        self._buf = bytearray()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                _check_header(f.read(HEADER_SIZE))
+            size = os.path.getsize(path)
+            if (size - HEADER_SIZE) % RECORD_SIZE:
+                # 上次写入中断留下的半条记录，截掉
+                with open(path, "r+b") as f:
+                    f.truncate(size - (size - HEADER_SIZE) % RECORD_SIZE)
+        self._f = open(path, "ab")
+        if not exists:
+            self._f.write(_pack_header())
+        self.count = 0
+
+    def write(self, record: bytes):
+        if len(record) != RECORD_SIZE:
+            raise ValueError("记录长度不符")
+        self._buf += record
+        self.count += 1
+        if len(self._buf) >= self._buffer_limit:
+            self.flush()
+
+    def append(self, player_cards, center_cards, actions=(), executed=(), verdict: int = 0):
+        self.write(encode_game(player_cards, center_cards, actions, executed, verdict))
+
+    def write_array(self, records):
+        """批量写入 RECORD_DTYPE 结构化数组（需要 numpy）。"""
+        if np is None:
+            raise RuntimeError("批量写入需要 numpy")
+        records = np.ascontiguousarray(records, dtype=RECORD_DTYPE)
+        self.flush()
+        self._f.write(records.tobytes())
+        self.count += len(records)
+
+    def flush(self):
+        if self._buf:
+            self._f.write(self._buf)
+            self._buf = bytearray()
+        self._f.flush()
+
+    def close(self):
+        if self._f is not None:
+            self.flush()
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---- 读取 ----
+def decode_record(data, offset: int = 0) -> Dict:
+    """struct 解码一条记录（无 numpy 的回退路径）。"""
+    fields = _RECORD.unpack_from(data, offset)
+    n = fields[0]
+    deal = fields[1:1 + DEAL_SLOTS]
+    raw = fields[1 + DEAL_SLOTS:1 + DEAL_SLOTS + 3 * MAX_ACTIONS]
+    actions = [tuple(raw[i:i + 3]) for i in range(0, len(raw), 3) if raw[i] != ACTION_EMPTY]
+    mask, verdict = fields[-2], fields[-1]
+    return {
+        "player_count": n,
+        "players": list(deal[:n]),
+        "center": [c for c in deal[n:n + CENTER_SIZE]],
+        "actions": actions,
+        "executed": [i for i in range(n) if mask >> i & 1],
+        "verdict": verdict,
+    }
+
+
+class GameRecordReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        _check_header(self._f.read(HEADER_SIZE))
+        self._count = (size - HEADER_SIZE) // RECORD_SIZE
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self._count else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def records(self):
+        """全部记录的结构化数组（文件映射上的只读视图）。"""
+        if np is None:
+            raise RuntimeError("结构化数组读取需要 numpy")
+        if not self._count:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.frombuffer(self._mm, dtype=RECORD_DTYPE, count=self._count, offset=HEADER_SIZE)
+
+    def iter_batches(self, batch_size: int = 65536) -> Iterator:
+        """按批返回结构化数组视图；无 numpy 时返回字典列表。"""
+        if np is None:
+            for start in range(0, self._count, batch_size):
+                stop = min(self._count, start + batch_size)
+                yield [decode_record(self._mm, HEADER_SIZE + i * RECORD_SIZE) for i in range(start, stop)]
+            return
+        recs = self.records
+        for start in range(0, self._count, batch_size):
+            yield recs[start:start + batch_size]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._count):
+            yield decode_record(self._mm, HEADER_SIZE + i * RECORD_SIZE)
+
+    def close(self):
+        # 仍有数组视图引用映射时 mmap 无法关闭，交给垃圾回收
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+            self._mm = None
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def replay_final(players: Sequence[int], center: Sequence[int],
+                 actions: Sequence[Tuple[int, int, int]]) -> Tuple[List[int], List[int]]:
+    """按行动重放交换，返回夜晚结束时的 (玩家牌, 中央牌) 角色 ID。"""
+    players, center = list(players), list(center)
+    rid = WerewolfDealer.ROLE_IDS
+    for kind, a, b in actions:
+        role = kind & ACTION_ROLE_MASK
+        if role == rid["robber"]:
+            # b 为行动者座位（强盗本人或复制了强盗的化身幽灵）
+            players[b], players[a] = players[a], players[b]
+        elif role == rid["troublemaker"]:
+            players[a], players[b] = players[b], players[a]
+        elif role == rid["drunk"]:
+            players[b], center[a] = center[a], players[b]
+    return players, center
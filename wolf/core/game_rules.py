@@ -0,0 +1,116 @@
+"""角色配置（roles_config.json）的加载、校验与编译。
+
+配置格式：{"人数": {"模式名": ["狼人", "预言家", ...]}}，角色名可用中文或内部英文名。
+编译结果按 人数 -> 模式 -> 角色计数向量（下标为 WerewolfDealer.ROLE_ORDER 中的角色 ID）索引。
+配置文件很小，每次加载都直接解析与校验，不做磁盘缓存。
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from core.werewolf_dealer import WerewolfDealer
+
+DEFAULT_RULES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'resources', 'roles_config.json'))
+# 派生数据（模拟结果缓存等）所在目录，位于配置文件旁
+CACHE_DIR_NAME = "__rules_cache__"
+
+MIN_PLAYERS = 4
+MAX_PLAYERS = 12
+
+
+class CompiledRules:
+    """编译后的规则：raw 为原始配置，vectors[人数][模式] 为角色计数向量。"""
+
+    __slots__ = ("source_hash", "raw", "vectors")
+
+    def __init__(self, source_hash: str, raw: Dict, vectors: Dict[int, Dict[str, Tuple[int, ...]]]):
+        self.source_hash = source_hash
+        self.raw = raw
+        self.vectors = vectors
+
+    def player_counts(self) -> List[int]:
+        return sorted(self.vectors)
+
+    def modes(self, player_count: int) -> List[str]:
+        return list(self.vectors.get(player_count, {}))
+
+    def role_counts(self, player_count: int, mode: str) -> Tuple[int, ...]:
+        try:
+            return self.vectors[player_count][mode]
+        except KeyError:
+            raise ValueError(f"未找到 {player_count} 人的模式 '{mode}'")
+
+    def role_pool(self, player_count: int, mode: str) -> List[str]:
+        """按计数向量展开为内部角色名列表。"""
+        pool = []
+        for rid, cnt in enumerate(self.role_counts(player_count, mode)):
+            pool.extend([WerewolfDealer.ROLE_ORDER[rid]] * cnt)
+        return pool
+
+
+def resolve_rules_path(path: Optional[str] = None) -> str:
+    """相对路径优先按当前目录解析，找不到时再按 wolf/ 目录解析（打包或从其它目录启动时）。"""
+    if not path:
+        return DEFAULT_RULES_PATH
+    if os.path.isabs(path) or os.path.exists(path):
+        return path
+    alt = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', path))
+    return alt if os.path.exists(alt) else path
+
+
+def validate_rules(rules) -> bool:
+    """校验规则结构，合法返回 True，否则抛出 ValueError 说明首个问题。"""
+    if not isinstance(rules, dict) or not rules:
+        raise ValueError("规则配置需为非空对象：{人数: {模式: [角色...]}}")
+    for key, modes in rules.items():
+        if not isinstance(key, str) or not key.isdigit():
+            raise ValueError(f"人数键需为数字字符串，当前 {key!r}")
+        player_count = int(key)
+        if player_count < MIN_PLAYERS or player_count > MAX_PLAYERS:
+            raise ValueError(f"人数需在{MIN_PLAYERS}~{MAX_PLAYERS}之间，当前 {player_count}")
+        if not isinstance(modes, dict) or not modes:
+            raise ValueError(f"{player_count} 人配置需为非空对象：{{模式: [角色...]}}")
+        for mode, pool in modes.items():
+            if not isinstance(pool, list):
+                raise ValueError(f"{player_count} 人模式 '{mode}' 的角色池需为列表")
+            required = player_count + 3
+            if len(pool) < required:
+                raise ValueError(f"{player_count} 人模式 '{mode}' 角色池需至少 {required} 张，当前 {len(pool)} 张")
+            for role in pool:
+                if not isinstance(role, str) or WerewolfDealer.role_id(role) < 0:
+                    raise ValueError(f"{player_count} 人模式 '{mode}' 含未知角色 {role!r}")
+    return True
+
+
+def compile_rules(rules: Dict, source_hash: str = "") -> CompiledRules:
+    """校验并编译为按 人数 -> 模式 -> 角色计数向量 索引的结构。"""
+    validate_rules(rules)
+    width = len(WerewolfDealer.ROLE_ORDER)
+    vectors: Dict[int, Dict[str, Tuple[int, ...]]] = {}
+    for key, modes in rules.items():
+        per_mode = vectors.setdefault(int(key), {})
+        for mode, pool in modes.items():
+            counts = [0] * width
+            for role in pool:
+                counts[WerewolfDealer.role_id(role)] += 1
+            per_mode[mode] = tuple(counts)
+    return CompiledRules(source_hash, rules, vectors)
+
+
+def load_compiled_rules(path: Optional[str] = None) -> CompiledRules:
+    """读取配置并返回编译结果；文件缺失抛 FileNotFoundError，配置非法抛 ValueError。"""
+    path = resolve_rules_path(path)
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    try:
+        rules = json.loads(content.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"规则配置解析失败：{e}")
+    return compile_rules(rules, digest)
+
+
+def load_rules(path: Optional[str] = None) -> Dict:
+    """读取并校验配置，返回原始规则字典。"""
+    return load_compiled_rules(path).raw
@@ -0,0 +1,420 @@
+"""与界面无关的引导式夜晚控制器。
+
+按 WerewolfDealer.get_night_steps() 的顺序把夜晚展开为回合（turns）逐个推进：
+狼人、爪牙、守夜人的全部持有者同一回合醒来（actors），其余角色每名持有者各占一个回合。
+每个回合只接受当前行动角色允许的操作，非法操作抛出 NightActionError（ValueError 子类）。
+牌面交换通过 dealer 的交换方法完成。
+界面层只负责渲染 view() 的结果、把点击翻译成动作调用，以及在倒计时结束时调用 timeout()。
+Tk、Qt 与 Kivy 三个界面共用本控制器。
+
+各角色的动作：
+- 化身幽灵 copy(target) 后：复制到预言家/强盗/捣蛋鬼/酒鬼立即以该角色继续行动（acting_role 变为复制角色）；
+  复制到狼人/爪牙/守夜人则随该角色一同醒来；复制到失眠者则在失眠者之后追加一个回合再次醒来
+- 独狼 peek_center(j) 一次；预言家 peek_center 两张不同中央，或 peek_player 一名其他玩家
+- 强盗 rob(target)；捣蛋鬼 swap_players(a, b)；酒鬼 swap_center(j)；失眠者 view_own()
+"""
+from typing import Dict, List, Optional
+
+from core.werewolf_dealer import WerewolfDealer
+
+ROLE_NAMES_CN = {
+    "werewolf": "狼人", "minion": "爪牙", "mason": "守夜人", "seer": "预言家", "robber": "强盗",
+    "troublemaker": "捣蛋鬼", "drunk": "酒鬼", "insomniac": "失眠者", "villager": "村民",
+    "tanner": "皮匠", "bodyguard": "保镖", "hunter": "猎人", "doppelganger": "化身幽灵",
+}
+
+# 需要完成动作才能继续的角色（无人持有时不要求）
+_REQUIRED = {"doppelganger", "seer", "robber", "troublemaker", "drunk"}
+# 全部持有者同一回合醒来的角色
+GROUP_ROLES = ("werewolf", "minion", "mason")
+# 化身幽灵复制后立即执行的角色
+_IMMEDIATE = ("seer", "robber", "troublemaker", "drunk")
+
+
+def _seats(indices: List[int]) -> str:
+    return "、".join(f"玩家{i + 1}" for i in indices)
+
+
+class NightActionError(ValueError):
+    """当前步骤不允许的夜晚操作。"""
+
+
+class NightController:
+    def __init__(self, dealer: WerewolfDealer):
+        if not getattr(dealer, "session", None):
+            raise RuntimeError("游戏尚未开始")
+        self.dealer = dealer
+        self.steps: List[Dict] = dealer.get_night_steps()
+        self.turns: List[Dict] = self._build_turns(self.steps)
+        self.index = -1
+        self.finished = False
+        self.log: List[Dict] = []
+        # 化身幽灵座位 -> 复制到的角色
+        self.dg_copies: Dict[int, str] = {}
+        self._st: Dict = {}
+
+    @staticmethod
+    def _build_turns(steps: List[Dict]) -> List[Dict]:
+        turns = []
+        for step in steps:
+            base = {"role": step["role"], "players": list(step["players"]), "in_center": step["in_center"]}
+            if step["role"] in GROUP_ROLES or not step["players"]:
+                # 群体回合的行动者在进入时确定（含复制了该角色的化身幽灵）
+                turns.append(dict(base, actor=None))
+            else:
+                turns.extend(dict(base, actor=p) for p in step["players"])
+        return turns
+
+    # --- 查询 ---
+    @property
+    def session(self) -> Dict:
+        return self.dealer.session
+
+    @property
+    def player_count(self) -> int:
+        return self.session["player_count"]
+
+    def current_step(self) -> Optional[Dict]:
+        """当前回合：{"role", "players", "in_center", "actor"}，化身幽灵追加的回合另带 "doppelganger": True。"""
+        if self.finished or not (0 <= self.index < len(self.turns)):
+            return None
+        return self.turns[self.index]
+
+    def view(self) -> Dict:
+        """当前步骤的只读描述，供界面渲染。"""
+        step = self.current_step()
+        if step is None:
+            return {"finished": self.finished, "index": self.index, "total": len(self.turns)}
+        st = self._st
+        acting = st["acting_role"]
+        actor = st["actor"]
+        view = {
+            "finished": False,
+            "index": self.index,
+            "total": len(self.turns),
+            "role": step["role"],
+            "acting_role": acting,
+            "players": list(step["players"]),
+            "in_center": step["in_center"],
+            "actor": actor,
+            "actors": list(st["actors"]),
+            "doppelganger": bool(step.get("doppelganger")),
+            "copied_role": st.get("copied_role"),
+            "revealed": list(st["revealed"]),
+            "done": bool(st.get("done")),
+            "swap_selection": list(st.get("tm_sel", [])),
+            "selectable_players": self._selectable_players(),
+            "selectable_centers": self._selectable_centers(),
+            "can_continue": self.can_continue(),
+            "prompt": self.prompt(),
+        }
+        if acting == "seer" and actor is not None:
+            view["seer_mode"] = st.get("seer_mode")
+        if "wolves" in st:
+            view["wolves"] = list(st["wolves"])
+        return view
+
+    def _selectable_players(self) -> List[int]:
+        st = self._st
+        actor = st.get("actor")
+        if actor is None or st.get("done"):
+            return []
+        acting = st["acting_role"]
+        others = [i for i in range(self.player_count) if i != actor]
+        if acting == "doppelganger" and st.get("copied_role") is None:
+            return others
+        if acting == "seer" and st.get("seer_mode") in (None, "player"):
+            return others
+        if acting == "robber":
+            return others
+        if acting == "troublemaker":
+            return [i for i in others if i not in st.get("tm_sel", [])]
+        return []
+
+    def _selectable_centers(self) -> List[int]:
+        st = self._st
+        actor = st.get("actor")
+        if actor is None or st.get("done"):
+            return []
+        acting = st["acting_role"]
+        centers = range(len(self.session["center_cards"]))
+        if acting == "werewolf" and st.get("lone_wolf"):
+            return list(centers)
+        if acting == "seer" and st.get("seer_mode") in (None, "center"):
+            seen = st.get("seer_centers", [])
+            return [j for j in centers if j not in seen]
+        if acting == "drunk":
+            return list(centers)
+        return []
+
+    def can_continue(self) -> bool:
+        if self.current_step() is None:
+            return False
+        st = self._st
+        if st.get("actor") is None:
+            return True
+        if st["acting_role"] == "werewolf" and st.get("lone_wolf"):
+            return bool(st.get("done"))
+        if st["acting_role"] in _REQUIRED:
+            return bool(st.get("done"))
+        return True
+
+    def prompt(self) -> str:
+        """当前步骤的中文提示。"""
+        step = self.current_step()
+        if step is None:
+            return "夜晚结束。" if self.finished else ""
+        st = self._st
+        role, acting, actor = step["role"], st["acting_role"], st["actor"]
+        cn = ROLE_NAMES_CN.get(role, role)
+        if step.get("doppelganger"):
+            prefix = f"{ROLE_NAMES_CN['doppelganger']}（{cn}）"
+        else:
+            prefix = cn if acting == role else f"{cn}（{ROLE_NAMES_CN.get(acting, acting)}）"
+        note = f"（中央牌中也有{cn}）" if step["in_center"] and actor is not None else ""
+        if actor is None:
+            if step["in_center"]:
+                return f"{cn}：仅中央牌出现该角色，请保持安静等待下一提示。"
+            return f"{cn}：本局没有{cn}行动。"
+        who = f"玩家{actor + 1}"
+        seats = _seats(st["actors"])
+        if acting == "doppelganger":
+            return f"{prefix}：{who}，请选择一名其他玩家查看并复制其角色。" + note
+        if acting == "werewolf":
+            if st.get("lone_wolf"):
+                return f"{prefix}：{who}，你为独狼，可查看中央任意一张牌。" + note
+            return f"{prefix}：{seats}，请互相确认身份。" + note
+        if acting == "minion":
+            wolves = f"狼人是{_seats(st['wolves'])}" if st["wolves"] else "场上没有狼人玩家"
+            return f"{prefix}：{seats}，{wolves}。" + note
+        if acting == "mason":
+            return f"{prefix}：{seats}，请互相确认身份。" + note
+        if acting == "seer":
+            return f"{prefix}：{who}，请查看两张中央牌或一名其他玩家的牌。" + note
+        if acting == "robber":
+            return f"{prefix}：{who}，请选择一名其他玩家交换，并查看你的新牌。" + note
+        if acting == "troublemaker":
+            return f"{prefix}：{who}，请选择两名其他玩家交换他们的牌。" + note
+        if acting == "drunk":
+            return f"{prefix}：{who}，请选择一张中央牌交换（不查看新牌）。" + note
+        if acting == "insomniac":
+            return f"{prefix}：{who}，请查看你当前的牌。" + note
+        return f"{prefix}：本角色夜晚无行动。"
+
+    # --- 流程 ---
+    def start(self) -> Dict:
+        if self.index >= 0:
+            raise NightActionError("夜晚已开始")
+        return self._enter(0)
+
+    def _copied_seats(self, role: str) -> List[int]:
+        return [i for i, r in self.dg_copies.items() if r == role]
+
+    def _enter(self, index: int) -> Dict:
+        self.index = index
+        if index >= len(self.turns):
+            self.finished = True
+            self._st = {}
+            return self.view()
+        turn = self.turns[index]
+        role = turn["role"]
+        if role in GROUP_ROLES:
+            actors = list(turn["players"]) + [i for i in self._copied_seats(role) if i not in turn["players"]]
+        else:
+            actors = [turn["actor"]] if turn["actor"] is not None else []
+        self._st = {
+            "acting_role": role,
+            "actor": actors[0] if actors else None,
+            "actors": actors,
+            "revealed": [],
+            "done": False,
+        }
+        if not actors:
+            return self.view()
+        if role == "werewolf":
+            if len(actors) == 1:
+                self._st["lone_wolf"] = True
+            else:
+                self._emit({"role": "werewolf", "wolves": list(actors)})
+        elif role == "minion":
+            wolves = self.dealer.get_role_indices("werewolf") + self._copied_seats("werewolf")
+            self._st["wolves"] = wolves
+            self._emit({"role": "minion", "minions": list(actors), "wolves_seen": list(wolves)})
+        elif role == "mason":
+            self._emit({"role": "mason", "masons": list(actors)})
+        return self.view()
+
+    def _emit(self, entry: Dict):
+        # 化身幽灵以复制角色行动（或追加回合）产生的日志带 "doppelganger": True，与 run_night_automation 一致
+        step = self.current_step()
+        if step is not None and (step.get("doppelganger") or
+                                 (step["role"] == "doppelganger" and entry["role"] != "doppelganger")):
+            entry["doppelganger"] = True
+        self.log.append(entry)
+
+    def advance(self) -> Dict:
+        """完成当前步骤进入下一步；要求的动作未完成时抛错。"""
+        if self.current_step() is None:
+            raise NightActionError("夜晚未开始或已结束")
+        if not self.can_continue():
+            raise NightActionError("请先完成当前角色的行动")
+        return self._enter(self.index + 1)
+
+    def timeout(self) -> Dict:
+        """倒计时结束：放弃未完成的动作，直接进入下一步。"""
+        if self.current_step() is None:
+            raise NightActionError("夜晚未开始或已结束")
+        self.log.append({"role": self.turns[self.index]["role"], "timeout": True})
+        return self._enter(self.index + 1)
+
+    # --- 动作 ---
+    def _require(self, *roles: str) -> Dict:
+        if self.current_step() is None:
+            raise NightActionError("夜晚未开始或已结束")
+        st = self._st
+        if st["acting_role"] not in roles:
+            raise NightActionError(f"当前为{ROLE_NAMES_CN.get(st['acting_role'], st['acting_role'])}行动，不能执行该操作")
+        if st["actor"] is None:
+            raise NightActionError("本局没有玩家执行该角色行动")
+        if st.get("done"):
+            raise NightActionError("该角色本轮行动已完成")
+        return st
+
+    def _check_player(self, idx: int, allow_actor: bool = False):
+        if not isinstance(idx, int) or not (0 <= idx < self.player_count):
+            raise NightActionError(f"玩家编号越界：{idx}")
+        if not allow_actor and idx == self._st["actor"]:
+            raise NightActionError("不能选择自己")
+
+    def _check_center(self, j: int):
+        if not isinstance(j, int) or not (0 <= j < len(self.session["center_cards"])):
+            raise NightActionError(f"中央牌编号越界：{j}")
+
+    def _reveal(self, kind: str, idx: int) -> str:
+        card = self.session["player_cards"][idx] if kind == "player" else self.session["center_cards"][idx]
+        self._st["revealed"].append((kind, idx, card))
+        return card
+
+    def copy(self, target: int) -> str:
+        """化身幽灵查看并复制 target 的当前牌，返回复制到的角色。"""
+        st = self._require("doppelganger")
+        self._check_player(target)
+        card = self._reveal("player", target)
+        copied = WerewolfDealer.normalize_role(card)
+        actor = st["actor"]
+        st["copied_role"] = copied
+        self.dg_copies[actor] = copied
+        # 写入会话（格式与 run_night_automation 一致），结算时据此确定化身幽灵牌的身份
+        first = next(iter(self.dg_copies))
+        self.session["doppelganger"] = {"players": list(self.turns[self.index]["players"]),
+                                        "copied_role": self.dg_copies[first], "copies": dict(self.dg_copies)}
+        self._emit({"role": "doppelganger", "player": actor, "copied_from": target, "copied_role": copied})
+        if copied in _IMMEDIATE:
+            # 复制到有即时行动的角色：继续以该角色行动
+            st["acting_role"] = copied
+        else:
+            st["done"] = True
+            if copied == "insomniac":
+                self._defer_insomniac(actor)
+        return copied
+
+    def _defer_insomniac(self, seat: int):
+        """化身幽灵复制到失眠者：在最后一个失眠者回合之后追加该座位的失眠者回合。"""
+        pos = len(self.turns)
+        for k in range(len(self.turns) - 1, self.index, -1):
+            if self.turns[k]["role"] == "insomniac":
+                pos = k + 1
+                break
+        base = next((t for t in self.turns if t["role"] == "insomniac"), None)
+        self.turns.insert(pos, {"role": "insomniac", "players": list(base["players"]) if base else [],
+                                "in_center": base["in_center"] if base else False,
+                                "actor": seat, "doppelganger": True})
+
+    def peek_center(self, j: int) -> str:
+        st = self._require("werewolf", "seer")
+        self._check_center(j)
+        if st["acting_role"] == "werewolf":
+            if not st.get("lone_wolf"):
+                raise NightActionError("多名狼人时不能查看中央牌")
+            card = self._reveal("center", j)
+            st["done"] = True
+            self._emit({"role": "werewolf", "wolves": [st["actor"]], "center_peek": j, "card": card})
+            return card
+        if st.get("seer_mode") == "player":
+            raise NightActionError("预言家已选择查看玩家")
+        seen = st.setdefault("seer_centers", [])
+        if j in seen:
+            raise NightActionError("这张中央牌已查看过")
+        st["seer_mode"] = "center"
+        seen.append(j)
+        card = self._reveal("center", j)
+        if len(seen) >= 2:
+            st["done"] = True
+            self._emit({"role": "seer", "seer": st["actor"], "peek_center": list(seen),
+                             "cards": [self.session["center_cards"][k] for k in seen]})
+        return card
+
+    def peek_player(self, target: int) -> str:
+        st = self._require("seer")
+        if st.get("seer_mode") == "center":
+            raise NightActionError("预言家已选择查看中央牌")
+        self._check_player(target)
+        st["seer_mode"] = "player"
+        card = self._reveal("player", target)
+        st["done"] = True
+        self._emit({"role": "seer", "seer": st["actor"], "peek_player": target, "card": card})
+        return card
+
+    def rob(self, target: int) -> str:
+        """强盗与 target 交换并查看新牌，返回新牌。"""
+        st = self._require("robber")
+        self._check_player(target)
+        actor = st["actor"]
+        self.dealer.swap_between_players(actor, target)
+        card = self._reveal("player", actor)
+        st["done"] = True
+        self._emit({"role": "robber", "robber": actor, "swapped_with": target, "new_card": card})
+        return card
+
+    def select_for_swap(self, target: int) -> List[int]:
+        """捣蛋鬼逐个选择目标（再次选择同一人则取消），返回当前已选列表。"""
+        st = self._require("troublemaker")
+        self._check_player(target)
+        sel = st.setdefault("tm_sel", [])
+        if target in sel:
+            sel.remove(target)
+        else:
+            sel.append(target)
+            if len(sel) > 2:
+                sel.pop(0)
+        return list(sel)
+
+    def swap_players(self, a: Optional[int] = None, b: Optional[int] = None):
+        """捣蛋鬼交换两名其他玩家；不传参数时使用 select_for_swap 的选择。"""
+        st = self._require("troublemaker")
+        if a is None and b is None:
+            sel = st.get("tm_sel", [])
+            if len(sel) != 2:
+                raise NightActionError("请先选择两名玩家")
+            a, b = sel
+        self._check_player(a)
+        self._check_player(b)
+        if a == b:
+            raise NightActionError("请选择两名不同的玩家")
+        self.dealer.swap_between_players(a, b)
+        st["done"] = True
+        self._emit({"role": "troublemaker", "troublemaker": st["actor"], "swapped": (a, b)})
+
+    def swap_center(self, j: int):
+        st = self._require("drunk")
+        self._check_center(j)
+        self.dealer.swap_with_center(st["actor"], j)
+        st["done"] = True
+        self._emit({"role": "drunk", "drunk": st["actor"], "center_index": j})
+
+    def view_own(self) -> str:
+        st = self._require("insomniac")
+        card = self._reveal("player", st["actor"])
+        st["done"] = True
+        self._emit({"role": "insomniac", "insomniac": st["actor"], "final_card": card})
+        return card
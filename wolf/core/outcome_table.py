@@ -0,0 +1,74 @@
+"""胜负查找表：把终局结算归约为 8 位签名 -> 胜负位的一次查表。
+
+胜负只取决于场上有哪些阵营角色、被处决者（含猎人连锁）是什么角色，与座位和人数无关，
+因此一张 256 项的表即可覆盖所有人数。签名位：
+    SIG_WOLF / SIG_MINION / SIG_TANNER     场上（玩家面前）有狼人 / 爪牙 / 皮匠
+    SIG_TIE                                平票，不死人
+    SIG_KILL_WOLF / SIG_KILL_MINION / SIG_KILL_TANNER / SIG_KILL_OTHER   被处决者中有对应角色
+表项为 game_record.VERDICT_GOOD / WOLF / TANNER 位组合。
+表在导入时由 reference_outcome 直接在内存中生成（256 项，耗时可忽略），不读写磁盘。
+"""
+import os
+from typing import Dict, Iterable
+
+from core.game_record import VERDICT_GOOD, VERDICT_TANNER, VERDICT_WOLF
+from core.game_rules import CACHE_DIR_NAME, DEFAULT_RULES_PATH
+
+SIG_WOLF = 0x01
+SIG_MINION = 0x02
+SIG_TANNER = 0x04
+SIG_TIE = 0x08
+SIG_KILL_WOLF = 0x10
+SIG_KILL_MINION = 0x20
+SIG_KILL_TANNER = 0x40
+SIG_KILL_OTHER = 0x80
+TABLE_SIZE = 256
+
+# 结算规则版本；reference_outcome 改动时递增，依赖结算结果的缓存（result_cache）随之失效
+RULES_VERSION = 1
+# 派生数据的缓存目录（result_cache 在其下存放模拟结果）
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(DEFAULT_RULES_PATH), CACHE_DIR_NAME)
+
+_PRESENCE = {"werewolf": SIG_WOLF, "minion": SIG_MINION, "tanner": SIG_TANNER}
+_KILLED = {"werewolf": SIG_KILL_WOLF, "minion": SIG_KILL_MINION, "tanner": SIG_KILL_TANNER}
+
+
+def reference_outcome(sig: int) -> int:
+    """按规则计算一个签名的胜负位（见 WerewolfDealer.evaluate_victory 的规则说明）。"""
+    # 无狼人但有爪牙时视为有狼人
+    wolf_present = bool(sig & (SIG_WOLF | SIG_MINION))
+    if sig & SIG_TIE:
+        return VERDICT_WOLF if wolf_present else VERDICT_GOOD
+    if sig & SIG_KILL_WOLF:
+        return VERDICT_GOOD
+    if sig & SIG_KILL_TANNER:
+        return VERDICT_TANNER
+    return VERDICT_WOLF
+
+
+def signature(final_roles: Iterable[str], dead_roles: Iterable[str], is_tie: bool = False) -> int:
+    """由终局角色（内部名）与死亡者角色计算签名；平票时忽略死亡者。"""
+    sig = SIG_TIE if is_tie else 0
+    for r in final_roles:
+        sig |= _PRESENCE.get(r, 0)
+    if not is_tie:
+        for r in dead_roles:
+            sig |= _KILLED.get(r, SIG_KILL_OTHER)
+    return sig
+
+
+def build_table() -> bytes:
+    return bytes(reference_outcome(sig) for sig in range(TABLE_SIZE))
+
+
+_TABLE = build_table()
+
+
+def table() -> bytes:
+    """进程内共享的查找表。"""
+    return _TABLE
+
+
+def lookup(sig: int) -> Dict[str, bool]:
+    bits = _TABLE[sig]
+    return {"good": bool(bits & VERDICT_GOOD), "wolf": bool(bits & VERDICT_WOLF), "tanner": bool(bits & VERDICT_TANNER)}
@@ -0,0 +1,123 @@
+"""多进程模拟：发牌矩阵与胜负结果放在 multiprocessing.shared_memory 中，工作进程直接写入。
+
+任务队列只传 (块序号, 起始局, 结束局) 三个整数；每局的发牌（角色 ID）与胜负位写入共享的 NumPy 数组，
+各阵营计数按块写入共享计数矩阵（每块一行，无需加锁），主进程最后汇总。
+结果与 core.simulation.simulate 逐局一致（同一种子得到同一局面）。
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core import game_record
+from core.game_record import DEAL_SLOTS
+from core.simulation import VOTE_POLICIES, play_game
+from core.werewolf_dealer import WerewolfDealer
+
+DEFAULT_CHUNK = 2048
+COUNTER_FIELDS = ("good", "wolf", "tanner", "tie")
+
+# 工作进程内的共享数组视图（由 _init_worker 建立）
+_worker = {}
+
+
+def _attach(name: str, shape, dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    # 子进程与主进程共用同一个 resource_tracker，只借用不释放，unlink 由主进程负责
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _setup(pool, seed, policy, arrays: Dict[str, np.ndarray], shms=()):
+    _worker.clear()
+    _worker.update(arrays, pool=list(pool), seed=seed, policy=policy, dealer=WerewolfDealer(), shm=list(shms))
+
+
+def _init_worker(pool, seed, policy, specs):
+    shms, arrays = [], {}
+    for key, (name, shape, dtype) in specs.items():
+        shm, arrays[key] = _attach(name, shape, dtype)
+        shms.append(shm)
+    _setup(pool, seed, policy, arrays, shms)
+
+
+def _run_chunk(task):
+    """模拟 [start, stop) 局，写入共享数组；返回完成局数。"""
+    block, start, stop = task
+    w = _worker
+    deals, verdicts, counters = w["deals"], w["verdicts"], w["counters"]
+    role_id = WerewolfDealer.role_id
+    counts = [0, 0, 0, 0]
+    for i in range(start, stop):
+        game = play_game(w["pool"], w["seed"] + i, w["policy"], w["dealer"])
+        row = deals[i]
+        row[:] = -1
+        n = len(game["players"])
+        row[:n] = [role_id(r) for r in game["players"]]
+        row[n:n + len(game["center"])] = [role_id(r) for r in game["center"]]
+        bits = game_record.verdict_bits(game["result"], game["is_tie"])
+        verdicts[i] = bits
+        counts[0] += bits & game_record.VERDICT_GOOD > 0
+        counts[1] += bits & game_record.VERDICT_WOLF > 0
+        counts[2] += bits & game_record.VERDICT_TANNER > 0
+        counts[3] += bits & game_record.VERDICT_TIE > 0
+    counters[block] = counts
+    return stop - start
+
+
+def simulate_parallel(pool: Sequence[str], games: int, seed: int = 0, policy: str = "random",
+                      workers: Optional[int] = None, chunk: int = DEFAULT_CHUNK) -> Dict:
+    """并行模拟 games 局（种子 seed..seed+games-1）。
+
+    返回 {"games", "counts": {good, wolf, tanner, tie}, "deals": (games, 15) int8, "verdicts": (games,) uint8}；
+    deals 为发牌时的角色 ID（前 n 个为玩家、随后 3 张中央，空位 -1），verdicts 为 game_record.VERDICT_* 位。
+    workers=1 时在当前进程内执行（同一套代码路径，便于调试）。
+    """
+    if policy not in VOTE_POLICIES:
+        raise ValueError(f"未知投票策略 '{policy}'，可用：{sorted(VOTE_POLICIES)}")
+    if games < 0 or chunk < 1:
+        raise ValueError("games 不能为负，chunk 至少为 1")
+    workers = workers or os.cpu_count() or 1
+    tasks = [(b, start, min(start + chunk, games)) for b, start in enumerate(range(0, games, chunk))]
+    layout = {
+        "deals": ((max(games, 1), DEAL_SLOTS), np.int8),
+        "verdicts": ((max(games, 1),), np.uint8),
+        "counters": ((max(len(tasks), 1), len(COUNTER_FIELDS)), np.int64),
+    }
+    blocks, arrays, specs = [], {}, {}
+    try:
+        for key, (shape, dtype) in layout.items():
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            blocks.append(shm)
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            arrays[key].fill(0)
+            specs[key] = (shm.name, shape, dtype)
+
+        if workers == 1 or len(tasks) <= 1:
+            _setup(pool, seed, policy, arrays)
+            try:
+                for task in tasks:
+                    _run_chunk(task)
+            finally:
+                _worker.clear()
+        else:
+            with multiprocessing.Pool(min(workers, len(tasks)), initializer=_init_worker,
+                                      initargs=(list(pool), seed, policy, specs)) as procs:
+                for _ in procs.imap_unordered(_run_chunk, tasks):
+                    pass
+
+        totals = arrays["counters"].sum(axis=0)
+        return {
+            "games": games,
+            "counts": {k: int(v) for k, v in zip(COUNTER_FIELDS, totals)},
+            "deals": np.array(arrays["deals"][:games]),
+            "verdicts": np.array(arrays["verdicts"][:games]),
+        }
+    finally:
+        arrays.clear()
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
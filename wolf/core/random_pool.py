@@ -0,0 +1,139 @@
+"""随机选角：在所有合法角色组合中均匀抽样。
+
+合法组合：狼人数量固定，其余角色每种最多选一次，守夜人计作两张，总牌数 = 玩家人数 + 3。
+先对候选角色做一次背包计数（ways[i][r] = 从第 i 个角色起凑出 r 张牌的组合数），
+之后每次抽样按计数比例逐个决定取舍，O(角色数) 且不会失败；无合法组合时抛出 ValueError。
+"""
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.werewolf_dealer import WerewolfDealer
+
+# 守夜人一选即两张
+ROLE_WEIGHTS = {"mason": 2}
+
+
+def role_weight(role: str) -> int:
+    return ROLE_WEIGHTS.get(role, 1)
+
+
+class RandomPoolSampler:
+    """针对固定的候选角色与剩余牌数预计算组合数，可重复抽样。"""
+
+    def __init__(self, candidates: Iterable[str], remaining: int, include: Iterable[str] = ()):
+        self.include = tuple(include)
+        self.roles = tuple(candidates)
+        self.weights = tuple(role_weight(r) for r in self.roles)
+        self.remaining = remaining
+        n = len(self.roles)
+        # ways[i][r]：从 roles[i:] 中选出总张数恰为 r 的组合数（Python 整数，不会溢出）
+        ways = [[0] * (remaining + 1) for _ in range(n + 1)]
+        ways[n][0] = 1
+        for i in range(n - 1, -1, -1):
+            w = self.weights[i]
+            nxt = ways[i + 1]
+            cur = ways[i]
+            for r in range(remaining + 1):
+                cur[r] = nxt[r] + (nxt[r - w] if r >= w else 0)
+        self._ways = ways
+
+    def count(self) -> int:
+        """合法组合总数。"""
+        return self._ways[0][self.remaining]
+
+    def sample(self, rng: Optional[random.Random] = None) -> List[str]:
+        total = self.count()
+        if total == 0:
+            raise ValueError("可选角色不足以组成完整牌堆，请调整狼人数量或玩家人数。")
+        rng = rng or random
+        ways = self._ways
+        picked = list(self.include)
+        r = self.remaining
+        for i, role in enumerate(self.roles):
+            if r == 0:
+                break
+            w = self.weights[i]
+            with_role = ways[i + 1][r - w] if r >= w else 0
+            # 在当前剩余组合中均匀取一个序号，落在“选中该角色”的区间内则选中
+            if with_role and rng.randrange(ways[i][r]) < with_role:
+                picked.append(role)
+                r -= w
+        return picked
+
+    def sample_many(self, n: int, rng: Optional[random.Random] = None) -> List[List[str]]:
+        """批量抽样，共用同一份计数表。"""
+        return [self.sample(rng) for _ in range(n)]
+
+
+_SAMPLER_CACHE: Dict[Tuple, RandomPoolSampler] = {}
+_SAMPLER_CACHE_LIMIT = 64
+
+
+def _resolve(player_count: int, wolf_count: int, constraints: Optional[Dict]) -> Tuple[Tuple[str, ...], int, Tuple[str, ...]]:
+    """整理约束，返回 (候选角色, 剩余张数, 必选角色)。"""
+    if player_count < 1:
+        raise ValueError("玩家人数必须至少为 1。")
+    total_needed = player_count + 3
+    if wolf_count < 0 or wolf_count > total_needed:
+        raise ValueError(f"狼人数量需在 0~{total_needed} 之间，当前 {wolf_count}")
+    constraints = constraints or {}
+    norm = WerewolfDealer.normalize_role
+    source = constraints.get("candidates")
+    if source is None:
+        source = WerewolfDealer.ROLE_ORDER
+    exclude = {norm(r) for r in constraints.get("exclude", ())}
+    include = []
+    for r in constraints.get("include", ()):
+        r = norm(r)
+        if r != "werewolf" and r not in include:
+            include.append(r)
+    if any(r in exclude for r in include):
+        raise ValueError("同一角色不能既必选又排除")
+    candidates = []
+    for r in source:
+        r = norm(r)
+        # 狼人由 wolf_count 单独决定；每种角色最多一次
+        if r == "werewolf" or r in exclude or r in include or r in candidates:
+            continue
+        candidates.append(r)
+    remaining = total_needed - wolf_count - sum(role_weight(r) for r in include)
+    if remaining < 0:
+        raise ValueError("必选角色超出牌堆张数，请调整狼人数量或玩家人数。")
+    return tuple(candidates), remaining, tuple(include)
+
+
+def get_sampler(player_count: int, wolf_count: int, constraints: Optional[Dict] = None) -> RandomPoolSampler:
+    """取得（并缓存）对应约束的抽样器，便于批量生成。"""
+    key = _resolve(player_count, wolf_count, constraints)
+    sampler = _SAMPLER_CACHE.get(key)
+    if sampler is None:
+        if len(_SAMPLER_CACHE) >= _SAMPLER_CACHE_LIMIT:
+            _SAMPLER_CACHE.clear()
+        candidates, remaining, include = key
+        sampler = RandomPoolSampler(candidates, remaining, include)
+        _SAMPLER_CACHE[key] = sampler
+    return sampler
+
+
+def random_pool(player_count: int, wolf_count: int, constraints: Optional[Dict] = None,
+                rng: Optional[random.Random] = None) -> List[str]:
+    """在所有合法组合中均匀抽取一组非狼人角色（守夜人出现一次代表两张）。
+
+    constraints 可选键：candidates（候选角色，默认全部角色）、include（必选）、exclude（排除）。
+    无合法组合时抛出 ValueError。
+    """
+    return get_sampler(player_count, wolf_count, constraints).sample(rng)
+
+
+def random_pools(n: int, player_count: int, wolf_count: int, constraints: Optional[Dict] = None,
+                 rng: Optional[random.Random] = None) -> List[List[str]]:
+    """批量版 random_pool。"""
+    return get_sampler(player_count, wolf_count, constraints).sample_many(n, rng)
+
+
+def expand_pool(picked: Iterable[str], wolf_count: int) -> List[str]:
+    """把选角结果展开成完整牌堆（含狼人，守夜人两张）。"""
+    cards = ["werewolf"] * wolf_count
+    for r in picked:
+        cards.extend([r] * role_weight(r))
+    return cards
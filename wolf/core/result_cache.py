@@ -0,0 +1,156 @@
+"""模拟结果的磁盘缓存：按内容寻址，重复查询直接返回。
+
+键为以下规范化内容的 sha256：
+    角色多重集（排序后的角色 ID）、玩家人数、投票策略、起始种子、局数、引擎版本
+（引擎版本 = simulation.ENGINE_VERSION 与 outcome_table.RULES_VERSION，规则变化后旧结果自动失效）。
+每个结果一个 JSON 文件，原子写入；命中时更新修改时间，总大小超过上限时按最久未用淘汰（LRU）。
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Sequence
+
+from core import outcome_table
+from core.simulation import ENGINE_VERSION, VOTE_POLICIES, tally
+from core.werewolf_dealer import WerewolfDealer
+
+DEFAULT_CACHE_DIR = os.path.join(outcome_table.DEFAULT_CACHE_DIR, "results")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(pool: Sequence[str], games: int, seed: int = 0, policy: str = "random") -> str:
+    spec = {
+        "roles": sorted(WerewolfDealer.role_id(r) for r in pool),
+        "players": len(pool) - 3,
+        "policy": policy,
+        "seed": seed,
+        "games": games,
+        "engine": [ENGINE_VERSION, outcome_table.RULES_VERSION],
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """磁盘上的结果缓存；可直接作为 Sweep / adaptive_sweep 的 runner（见 run_unit）。"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # 传给工作进程时只带配置
+        return {"cache_dir": self.cache_dir, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"], state["max_bytes"])
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict):
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except Exception:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            # 缓存只是加速手段（只读目录等情况下忽略）
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+            if self._size is None or self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for sub in os.listdir(self.cache_dir):
+            d = os.path.join(self.cache_dir, sub)
+            if not os.path.isdir(d):
+                continue
+            for fn in os.listdir(d):
+                if not fn.endswith(".json"):
+                    continue
+                p = os.path.join(d, fn)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _m, size, _p in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            # 淘汰到上限的 3/4，避免每次写入都重新扫描
+            target = self.max_bytes * 3 // 4
+            for _mtime, size, p in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(p)
+                except OSError:
+                    continue
+                total -= size
+        self._size = total
+
+    @property
+    def size(self) -> int:
+        return sum(size for _m, size, _p in self._entries())
+
+    def clear(self):
+        for _m, _s, p in self._entries():
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        self._size = 0
+
+    # ---- 查询 ----
+    def tally(self, pool: Sequence[str], games: int, seed: int = 0, policy: str = "random") -> Dict[str, int]:
+        """与 simulation.tally 相同，但先查缓存。"""
+        if policy not in VOTE_POLICIES:
+            raise ValueError(f"未知投票策略 '{policy}'，可用：{sorted(VOTE_POLICIES)}")
+        key = cache_key(pool, games, seed, policy)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        counts = tally(pool, games, seed, policy)
+        self.put(key, counts)
+        return counts
+
+    def run_unit(self, unit: Dict) -> Dict[str, int]:
+        """工作单元版本（core.distributed 的单元格式）。"""
+        return self.tally(unit["pool"], unit["games"], unit["seed"], unit["policy"])
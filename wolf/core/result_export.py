@@ -0,0 +1,197 @@
+"""模拟结果 / 对局记录的列式导出：Parquet（pyarrow，可选）或 .npz（纯 numpy 回退）。
+
+每局一行，列为：
+    pool_id(int64) seed(int64) player_count(uint8) deal(int8×15)
+    action_kind(uint8×24) action_a(int8×24) action_b(int8×24)   —— 夜晚行动展开，编码同 core.game_record
+    executed(uint16 座位位掩码) good / wolf / tanner / tie(bool)
+结果按批（batch_size 行）组装为 Arrow RecordBatch 流式写入，Parquet 行组大小可配，
+pool_id、player_count 等低基数列使用字典编码；离线分析无需再解析 JSON。
+.npz 回退同样逐批写出：每批每列一个 "<列名>/<批序号>.npy" 成员，读取时按列拼接，内存占用不随局数增长。
+"""
+import os
+import zipfile
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from core import game_record
+from core.game_record import DEAL_SLOTS, MAX_ACTIONS, RECORD_DTYPE, RECORD_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 为可选依赖，缺失时写 .npz
+    pa = pq = None
+
+DEFAULT_BATCH_SIZE = 65536
+DICTIONARY_COLUMNS = ["pool_id", "player_count", "executed"]
+
+
+def _columns(rec, pool_ids, seeds) -> Dict[str, np.ndarray]:
+    verdict = rec["verdict"]
+    return {
+        # 批缓冲区会被复用，各列都要复制
+        "pool_id": np.array(pool_ids, dtype=np.int64),
+        "seed": np.array(seeds, dtype=np.int64),
+        "player_count": rec["player_count"].copy(),
+        "deal": rec["deal"].copy(),
+        "action_kind": rec["actions"]["kind"].copy(),
+        "action_a": rec["actions"]["a"].copy(),
+        "action_b": rec["actions"]["b"].copy(),
+        "executed": rec["executed"].astype(np.uint16),
+        "good": (verdict & game_record.VERDICT_GOOD) > 0,
+        "wolf": (verdict & game_record.VERDICT_WOLF) > 0,
+        "tanner": (verdict & game_record.VERDICT_TANNER) > 0,
+        "tie": (verdict & game_record.VERDICT_TIE) > 0,
+    }
+
+
+def _record_batch(cols: Dict[str, np.ndarray]):
+    arrays, names = [], []
+    for name, col in cols.items():
+        if col.ndim == 2:
+            arr = pa.FixedSizeListArray.from_arrays(pa.array(col.reshape(-1)), col.shape[1])
+        else:
+            arr = pa.array(col)
+        arrays.append(arr)
+        names.append(name)
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+class ResultWriter:
+    """流式写出；use_arrow=None 时有 pyarrow 写 Parquet，否则写同名 .npz。"""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, row_group_size: Optional[int] = None,
+                 use_arrow: Optional[bool] = None, compression: str = "zstd"):
+        self.use_arrow = (pa is not None) if use_arrow is None else use_arrow
+        if self.use_arrow and pa is None:
+            raise RuntimeError("写 Parquet 需要 pyarrow")
+        if not self.use_arrow and path.endswith(".parquet"):
+            path = path[:-len(".parquet")] + ".npz"
+        self.path = path
+        self.batch_size = batch_size
+        self.row_group_size = row_group_size or batch_size
+        self.compression = compression
+        self.count = 0
+        self._rec = np.empty(batch_size, dtype=RECORD_DTYPE)
+        self._raw = self._rec.view(np.uint8).reshape(batch_size, RECORD_SIZE)
+        self._pool = np.empty(batch_size, dtype=np.int64)
+        self._seed = np.empty(batch_size, dtype=np.int64)
+        self._n = 0
+        self._pq_writer = None
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._chunk_index = 0
+
+    def add(self, pool_id: int, seed: int, record: bytes):
+        """追加一局（record 为 game_record 编码的一条记录）。"""
+        i = self._n
+        self._raw[i] = np.frombuffer(record, dtype=np.uint8)
+        self._pool[i] = pool_id
+        self._seed[i] = seed
+        self._n += 1
+        if self._n == self.batch_size:
+            self._flush_batch()
+
+    def add_game(self, game: Dict):
+        from core.simulation import encode_result
+        self.add(game.get("pool_id", 0), game["seed"], encode_result(game))
+
+    def add_records(self, records, pool_ids, seeds):
+        """批量追加 RECORD_DTYPE 结构化数组（如 GameRecordReader 的批次）。"""
+        self._flush_batch()
+        pool_ids = np.broadcast_to(np.asarray(pool_ids, dtype=np.int64), (len(records),))
+        seeds = np.broadcast_to(np.asarray(seeds, dtype=np.int64), (len(records),))
+        for start in range(0, len(records), self.batch_size):
+            stop = start + self.batch_size
+            self._emit(_columns(records[start:stop], pool_ids[start:stop], seeds[start:stop]))
+
+    def _flush_batch(self):
+        if not self._n:
+            return
+        n, self._n = self._n, 0
+        self._emit(_columns(self._rec[:n], self._pool[:n], self._seed[:n]))
+
+    def _emit(self, cols: Dict[str, np.ndarray]):
+        rows = len(cols["seed"])
+        if not rows:
+            return
+        self.count += rows
+        if not self.use_arrow:
+            self._write_npz_chunk(cols)
+            return
+        batch = _record_batch(cols)
+        if self._pq_writer is None:
+            self._pq_writer = pq.ParquetWriter(self.path, batch.schema, compression=self.compression,
+                                               use_dictionary=DICTIONARY_COLUMNS)
+        self._pq_writer.write_batch(batch, row_group_size=self.row_group_size)
+
+    def _write_npz_chunk(self, cols: Dict[str, np.ndarray]):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(f"{self.path}.tmp.npz", "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        for name, col in cols.items():
+            with self._zip.open(f"{name}/{self._chunk_index:08d}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.ascontiguousarray(col), allow_pickle=False)
+        self._chunk_index += 1
+
+    def close(self):
+        self._flush_batch()
+        if self.use_arrow:
+            if self._pq_writer is not None:
+                self._pq_writer.close()
+                self._pq_writer = None
+            return
+        if self._zip is None:
+            if self._chunk_index:
+                return
+            # 空结果也写出各列（零行），读取端得到正确的列名与类型
+            self._write_npz_chunk(_columns(np.empty(0, dtype=RECORD_DTYPE), [], []))
+        tmp = self._zip.filename
+        self._zip.close()
+        self._zip = None
+        os.replace(tmp, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_results(games: Iterable[Dict], path: str, **kwargs) -> str:
+    """把模拟结果流写入文件，返回实际路径（无 pyarrow 时为 .npz）。"""
+    with ResultWriter(path, **kwargs) as w:
+        for game in games:
+            w.add_game(game)
+    return w.path
+
+
+def export_journal(record_path: str, path: str, pool_id: int = 0, **kwargs) -> str:
+    """把 .onwr 对局记录导出为列式文件；seed 列记为记录序号。"""
+    with game_record.GameRecordReader(record_path) as reader, ResultWriter(path, **kwargs) as w:
+        offset = 0
+        for batch in reader.iter_batches(w.batch_size):
+            w.add_records(batch, pool_id, np.arange(offset, offset + len(batch)))
+            offset += len(batch)
+    return w.path
+
+
+def read_results(path: str) -> Dict[str, np.ndarray]:
+    """读回导出的列（Parquet 或 .npz），定长列表列还原为二维数组。"""
+    if path.endswith(".npz"):
+        chunks: Dict[str, list] = {}
+        with np.load(path) as data:
+            for key in sorted(data.files):
+                chunks.setdefault(key.split("/", 1)[0], []).append(data[key])
+        return {name: np.concatenate(parts) for name, parts in chunks.items()}
+    if pq is None:
+        raise RuntimeError("读取 Parquet 需要 pyarrow")
+    table = pq.read_table(path)
+    widths = {"deal": DEAL_SLOTS, "action_kind": MAX_ACTIONS, "action_a": MAX_ACTIONS, "action_b": MAX_ACTIONS}
+    cols = {}
+    for name in table.column_names:
+        col = table.column(name).combine_chunks()
+        if name in widths:
+            cols[name] = col.flatten().to_numpy().reshape(-1, widths[name])
+        else:
+            cols[name] = col.to_numpy(zero_copy_only=False)
+    return cols
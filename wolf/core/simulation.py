@@ -0,0 +1,138 @@
+"""无界面对局模拟：按种子复现地发牌、自动夜晚、投票并结算。
+
+每局使用独立的 random.Random(seed)，同一 (角色池, 种子, 投票策略) 总得到同一局面；
+洗牌前角色池先按角色 ID 排成规范顺序，因此结果与传入顺序无关（与 pool_id、结果缓存的键一致）；
+结果为字典，可直接编码为 .onwr 记录（core.game_record）或写入列式文件（core.result_export）。
+"""
+import hashlib
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core import game_record
+from core.werewolf_dealer import WerewolfDealer
+
+# 模拟引擎版本：夜晚规则、投票策略或随机数消费顺序变化（同一种子结果不同）时递增
+ENGINE_VERSION = 2
+
+
+def pool_id(pool: Sequence[str]) -> int:
+    """角色池的稳定 ID（与顺序、别名写法无关），取 sha1 前 8 字节为有符号 int64。"""
+    ids = sorted(WerewolfDealer.role_id(r) for r in pool)
+    digest = hashlib.sha1(bytes(i & 0xFF for i in ids)).digest()
+    return int.from_bytes(digest[:8], "little", signed=True)
+
+
+def _canonical_pool(pool: Sequence[str]) -> List[str]:
+    # 同 ID 的别名写法再按规范名排序，保证任意顺序的同一多重集得到同一列表
+    return sorted(pool, key=lambda r: (WerewolfDealer.role_id(r), WerewolfDealer.normalize_role(r)))
+
+
+Vote = Tuple[List[int], bool, Optional[List[int]]]
+
+
+# 投票策略：(dealer, rng) -> (被处决座位列表, 是否平票, 各玩家投票座位或 None)
+def _vote_random(dealer: WerewolfDealer, rng: random.Random) -> Vote:
+    return [rng.randrange(dealer.session["player_count"])], False, None
+
+
+def _vote_tie(dealer: WerewolfDealer, rng: random.Random) -> Vote:
+    return [], True, None
+
+
+def _vote_plurality(dealer: WerewolfDealer, rng: random.Random) -> Vote:
+    """每人随机投一名其他玩家；得票最多者（可并列）被处决，无人得票超过 1 时不死人。"""
+    n = dealer.session["player_count"]
+    votes = [(i + rng.randrange(1, n)) % n for i in range(n)]
+    counts = [0] * n
+    for v in votes:
+        counts[v] += 1
+    top = max(counts)
+    if top <= 1:
+        return [], True, votes
+    return [i for i in range(n) if counts[i] == top], False, votes
+
+
+VOTE_POLICIES: Dict[str, Callable[[WerewolfDealer, random.Random], Vote]] = {
+    "random": _vote_random,
+    "tie": _vote_tie,
+    "plurality": _vote_plurality,
+}
+
+
+def play_game(pool: Sequence[str], seed: int, policy: str = "random",
+              dealer: Optional[WerewolfDealer] = None, deal: Optional[Sequence[str]] = None) -> Dict:
+    """模拟一局，返回发牌、夜晚日志、处决与胜负。
+
+    deal 给出时按其顺序发牌（玩家在前、中央三张在后），不再洗牌；pool 此时仅用于校验。
+
+    executed 为全部死亡座位（含猎人连锁带走的玩家），据此即可重新结算，无需再看投票。
+    """
+    vote = VOTE_POLICIES.get(policy)
+    if vote is None:
+        raise ValueError(f"未知投票策略 '{policy}'，可用：{sorted(VOTE_POLICIES)}")
+    dealer = dealer or WerewolfDealer()
+    rng = random.Random(seed)
+    if deal is not None:
+        if sorted(map(WerewolfDealer.role_id, deal)) != sorted(map(WerewolfDealer.role_id, pool)):
+            raise ValueError("deal 与角色池不一致")
+        dealer.start_game_with_selection(list(deal), rng=rng, shuffle=False)
+    else:
+        dealer.start_game_with_selection(_canonical_pool(pool), rng=rng)
+    s = dealer.session
+    log = dealer.run_night_automation(rng=rng)
+    executed, is_tie, votes = vote(dealer, rng)
+    if not is_tie:
+        executed = dealer.resolve_executions(dealer.final_roles(), executed, votes)
+    result = dealer.evaluate_victory(executed, is_tie=is_tie)
+    return {
+        "seed": seed,
+        "players": list(s["initial_player_cards"]),
+        "center": list(s["initial_center_cards"]),
+        "final_players": list(s["player_cards"]),
+        "log": log,
+        "executed": executed,
+        "is_tie": is_tie,
+        "votes": votes,
+        "result": result,
+    }
+
+
+def simulate(pool: Sequence[str], games: int, seed: int = 0, policy: str = "random") -> Iterator[Dict]:
+    """依次模拟 games 局（种子为 seed, seed+1, ...），逐局产出结果，不在内存中累积。"""
+    dealer = WerewolfDealer()
+    pid = pool_id(pool)
+    for i in range(games):
+        game = play_game(pool, seed + i, policy, dealer)
+        game["pool_id"] = pid
+        yield game
+
+
+# 聚合计数的字段：局数与各阵营胜场、平票局数
+TALLY_FIELDS = ("games", "good", "wolf", "tanner", "tie")
+
+
+def tally(pool: Sequence[str], games: int, seed: int = 0, policy: str = "random") -> Dict[str, int]:
+    """模拟 games 局，只返回聚合计数（不保留逐局结果）。"""
+    counts = dict.fromkeys(TALLY_FIELDS, 0)
+    for game in simulate(pool, games, seed, policy):
+        result = game["result"]
+        counts["games"] += 1
+        counts["good"] += result["good"]
+        counts["wolf"] += result["wolf"]
+        counts["tanner"] += result["tanner"]
+        counts["tie"] += game["is_tie"]
+    return counts
+
+
+def merge_tally(into: Dict[str, int], other: Dict[str, int]) -> Dict[str, int]:
+    """把 other 的计数累加到 into（原地修改并返回 into）。"""
+    for key in TALLY_FIELDS:
+        into[key] = into.get(key, 0) + int(other.get(key, 0))
+    return into
+
+
+def encode_result(game: Dict) -> bytes:
+    """把 play_game 的结果编码为 .onwr 记录。"""
+    verdict = game_record.verdict_bits(game["result"], game["is_tie"])
+    return game_record.encode_game(game["players"], game["center"], game_record.actions_from_log(game["log"]),
+                                   game["executed"], verdict)
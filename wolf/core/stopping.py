@@ -0,0 +1,182 @@
+"""按批模拟、逐池自适应停止：各阵营胜率的置信区间都窄于给定容差即停止该角色池。
+
+区间可选：
+    wilson   Wilson 得分区间（频率学派，小样本与极端比例下仍表现良好）
+    beta     均匀先验下 Beta(k+1, n-k+1) 后验的等尾可信区间
+调度：始终保持 workers 个批次在运行；某个角色池停止后，空出的工作进程立即分给仍未确定的角色池
+（优先分给已模拟局数最少的）。每批为一段连续种子；并行时先完成的批次会暂存，
+各角色池严格按种子顺序合并并判定是否停止，判定停止后仍在运行的批次结果丢弃，
+因此停止点与统计结果和 workers=1 完全一致，可按种子复现。
+"""
+import math
+import multiprocessing
+from statistics import NormalDist
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.distributed import run_unit
+from core.simulation import VOTE_POLICIES, merge_tally, pool_id
+
+FACTIONS = ("good", "wolf", "tanner")
+DEFAULT_BATCH = 2000
+DEFAULT_MAX_GAMES = 1_000_000
+
+
+def wilson_interval(k: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    if n <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = k / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # 不完全 Beta 函数的连分式（修正 Lentz 法）
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c, d = 1.0, 1 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return h
+
+
+def beta_cdf(x: float, a: float, b: float) -> float:
+    """正则化不完全 Beta 函数 I_x(a, b)。"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    ln_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(ln_front) * _betacf(a, b, x) / a
+    return 1 - math.exp(ln_front) * _betacf(b, a, 1 - x) / b
+
+
+def beta_ppf(q: float, a: float, b: float) -> float:
+    lo, hi = 0.0, 1.0
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if beta_cdf(mid, a, b) < q:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def beta_interval(k: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    tail = (1 - confidence) / 2
+    a, b = k + 1, n - k + 1
+    return beta_ppf(tail, a, b), beta_ppf(1 - tail, a, b)
+
+
+INTERVALS: Dict[str, Callable[[int, int, float], Tuple[float, float]]] = {
+    "wilson": wilson_interval,
+    "beta": beta_interval,
+}
+
+
+def intervals(counts: Dict[str, int], method: str = "wilson", confidence: float = 0.95) -> Dict[str, Tuple[float, float]]:
+    fn = INTERVALS[method]
+    n = counts.get("games", 0)
+    return {f: fn(counts.get(f, 0), n, confidence) for f in FACTIONS}
+
+
+def is_decided(counts: Dict[str, int], tolerance: float, method: str = "wilson", confidence: float = 0.95) -> bool:
+    """各阵营胜率区间的宽度都不超过 tolerance。"""
+    return all(hi - lo <= tolerance for lo, hi in intervals(counts, method, confidence).values())
+
+
+def adaptive_sweep(pools: Sequence[Sequence[str]], tolerance: float, method: str = "wilson",
+                   confidence: float = 0.95, batch_games: int = DEFAULT_BATCH,
+                   max_games: int = DEFAULT_MAX_GAMES, seed: int = 0, policy: str = "random",
+                   workers: int = 1, runner: Callable[[Dict], Dict[str, int]] = run_unit) -> List[Dict]:
+    """逐池按批模拟直到区间足够窄（或达到 max_games），返回每个角色池的统计。
+
+    每项：{"pool", "pool_id", "counts", "intervals", "decided"}；decided=False 表示达到上限仍未收敛。
+    """
+    if method not in INTERVALS:
+        raise ValueError(f"未知区间方法 '{method}'，可用：{sorted(INTERVALS)}")
+    if policy not in VOTE_POLICIES:
+        raise ValueError(f"未知投票策略 '{policy}'，可用：{sorted(VOTE_POLICIES)}")
+    if not 0 < tolerance < 1 or not 0 < confidence < 1 or batch_games < 1:
+        raise ValueError("tolerance、confidence 需在 (0, 1) 内，batch_games 至少为 1")
+
+    states = [{"pool": list(p), "pool_id": pool_id(p), "counts": {}, "next_seed": seed,
+               "merged_seed": seed, "held": {}, "open": True, "decided": False} for p in pools]
+
+    def next_unit() -> Optional[Tuple[Dict, Dict]]:
+        # 仍在运行且尚有局数预算的角色池中，选已排期局数最少的
+        cands = [st for st in states if st["open"] and st["next_seed"] - seed < max_games]
+        if not cands:
+            return None
+        st = min(cands, key=lambda s: s["next_seed"])
+        games = min(batch_games, max_games - (st["next_seed"] - seed))
+        unit = {"unit_id": st["next_seed"], "pool": st["pool"], "pool_id": st["pool_id"],
+                "seed": st["next_seed"], "games": games, "policy": policy}
+        st["next_seed"] += games
+        return st, unit
+
+    def finish(st: Dict, unit: Dict, counts: Dict[str, int]):
+        if not st["open"]:
+            return
+        # 只按种子顺序合并：之前的批次未完成时先暂存
+        st["held"][unit["seed"]] = (unit["games"], counts)
+        while st["open"] and st["merged_seed"] in st["held"]:
+            games, batch = st["held"].pop(st["merged_seed"])
+            st["merged_seed"] += games
+            merge_tally(st["counts"], batch)
+            if is_decided(st["counts"], tolerance, method, confidence):
+                st["open"] = False
+                st["decided"] = True
+            elif st["merged_seed"] - seed >= max_games:
+                st["open"] = False
+        if not st["open"]:
+            st["held"].clear()
+
+    if workers <= 1:
+        while True:
+            job = next_unit()
+            if job is None:
+                break
+            finish(job[0], job[1], runner(job[1]))
+    else:
+        with multiprocessing.Pool(workers) as procs:
+            running = []
+            while True:
+                while len(running) < workers:
+                    job = next_unit()
+                    if job is None:
+                        break
+                    running.append((job[0], job[1], procs.apply_async(runner, (job[1],))))
+                if not running:
+                    break
+                # 任一批次完成即登记并立刻补充新批次
+                done = next((i for i, (_st, _unit, res) in enumerate(running) if res.ready()), None)
+                if done is None:
+                    running[0][2].wait(0.05)
+                    continue
+                st, unit, res = running.pop(done)
+                finish(st, unit, res.get())
+
+    return [{"pool": st["pool"], "pool_id": st["pool_id"], "counts": st["counts"],
+             "intervals": intervals(st["counts"], method, confidence), "decided": st["decided"]}
+            for st in states]
@@ -0,0 +1,146 @@
+"""长时间模拟扫描的运行器：按工作单元推进，定期把进度原子地写入检查点，中断后从断点继续。
+
+检查点（JSON）内容：
+    fingerprint   扫描参数（全部单元）的哈希，参数变化时拒绝续跑
+    done          已完成的单元 ID
+    totals        各角色池（pool_id）的聚合计数
+    streams       各角色池已连续完成到的种子位置（每局随机源为 Random(seed)，种子即流位置）
+写入采用「临时文件 + fsync + 重命名」，任意时刻崩溃都只会留下旧的或新的完整检查点。
+未完成的单元在续跑时从其起始种子整块重做，因此结果与不中断运行逐局一致、不引入偏差。
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from core.distributed import run_unit
+from core.simulation import merge_tally
+
+CHECKPOINT_FORMAT = 1
+DEFAULT_CHECKPOINT_EVERY = 5.0
+
+
+def sweep_fingerprint(units: Iterable[Dict]) -> str:
+    spec = [[u["unit_id"], u["pool_id"], u["seed"], u["games"], u["policy"]] for u in units]
+    return hashlib.sha256(json.dumps(spec, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def write_checkpoint(path: str, state: Dict):
+    """原子写入：同目录临时文件写完并 fsync 后重命名覆盖。"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".ckpt-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_checkpoint(path: str) -> Optional[Dict]:
+    """读取检查点；文件不存在返回 None，格式不对抛 ValueError。"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise ValueError(f"检查点解析失败：{e}")
+    if not isinstance(state, dict) or state.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError("不支持的检查点格式")
+    return state
+
+
+class Sweep:
+    """按顺序执行工作单元（core.distributed.make_units 生成），支持检查点续跑。"""
+
+    def __init__(self, units: Iterable[Dict], checkpoint: Optional[str] = None,
+                 every: float = DEFAULT_CHECKPOINT_EVERY, runner: Callable[[Dict], Dict[str, int]] = run_unit):
+        self.units = list(units)
+        self.checkpoint = checkpoint
+        self.every = every
+        self.runner = runner
+        self.fingerprint = sweep_fingerprint(self.units)
+        self.done = set()
+        self.totals: Dict[int, Dict[str, int]] = {}
+        self.streams: Dict[int, int] = {}
+        self.resumed = False
+        if checkpoint:
+            self._load(checkpoint)
+
+    def _load(self, path: str):
+        state = read_checkpoint(path)
+        if state is None:
+            return
+        if state.get("fingerprint") != self.fingerprint:
+            raise ValueError("检查点与当前扫描参数不一致，请更换检查点文件或删除旧文件")
+        self.done = set(state["done"])
+        self.totals = {int(k): v for k, v in state["totals"].items()}
+        self.streams = {int(k): v for k, v in state["streams"].items()}
+        self.resumed = True
+
+    def state(self) -> Dict:
+        return {
+            "format": CHECKPOINT_FORMAT,
+            "fingerprint": self.fingerprint,
+            "done": sorted(self.done),
+            "totals": {str(k): v for k, v in self.totals.items()},
+            "streams": {str(k): v for k, v in self.streams.items()},
+        }
+
+    def save(self):
+        if self.checkpoint:
+            self._advance_streams()
+            write_checkpoint(self.checkpoint, self.state())
+
+    def _advance_streams(self):
+        # 同一角色池的单元按种子递增排列；流位置为第一个未完成单元的起始种子
+        streams: Dict[int, int] = {}
+        blocked = set()
+        for u in self.units:
+            pid = u["pool_id"]
+            if pid in blocked:
+                continue
+            if u["unit_id"] in self.done:
+                streams[pid] = u["seed"] + u["games"]
+            else:
+                streams.setdefault(pid, u["seed"])
+                blocked.add(pid)
+        self.streams = streams
+
+    @property
+    def remaining(self) -> int:
+        return sum(1 for u in self.units if u["unit_id"] not in self.done)
+
+    def record(self, unit: Dict, counts: Dict[str, int]):
+        """登记一个单元的结果（重复登记忽略）。"""
+        if unit["unit_id"] in self.done:
+            return
+        self.done.add(unit["unit_id"])
+        merge_tally(self.totals.setdefault(unit["pool_id"], {}), counts)
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> Dict[int, Dict[str, int]]:
+        """执行剩余单元；Ctrl-C 或异常时先写检查点再抛出。返回各角色池的聚合计数。"""
+        last = time.monotonic()
+        try:
+            for unit in self.units:
+                if unit["unit_id"] in self.done:
+                    continue
+                self.record(unit, self.runner(unit))
+                if progress is not None:
+                    progress(len(self.done), len(self.units))
+                if self.checkpoint and time.monotonic() - last >= self.every:
+                    self.save()
+                    last = time.monotonic()
+        finally:
+            self.save()
+        return self.totals
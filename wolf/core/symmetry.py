@@ -0,0 +1,162 @@
+"""穷举分析用的发牌对称约化：把等价的发牌合并为规范代表，并给出轨道权重。
+
+一副牌（角色池）的有序发牌共 (玩家数+3)! 种，其中大量在结算意义上等价：
+    同名牌互换          角色池中重复的角色（两张狼人、三张村民……）交换位置得到同一局面
+    中央牌顺序          中央三张的排列不影响任何夜晚行动的可选范围与结果分布
+    座位重标号          默认策略（随机选目标、随机投票）对所有座位一视同仁，
+                        任意重排玩家座位得到的胜负分布相同
+规范代表：中央牌按角色 ID 排序；座位可交换时玩家牌也按角色 ID 排序。
+轨道权重 = 该代表覆盖的不同发牌数（同名牌视为相同），全部权重之和 = 多重排列数。
+seat_symmetric=False 时保留座位顺序，仅合并中央牌顺序（用于逐座位指定行动的脚本）。
+"""
+import collections
+import math
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+
+from core.simulation import TALLY_FIELDS, VOTE_POLICIES, play_game
+from core.werewolf_dealer import WerewolfDealer
+
+CENTER_SIZE = 3
+
+Deal = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def _role_counts(roles: Sequence[str]) -> collections.Counter:
+    return collections.Counter(WerewolfDealer.normalize_role(r) for r in roles)
+
+
+def _sorted_roles(counts: collections.Counter) -> Tuple[str, ...]:
+    return tuple(sorted(counts.elements(), key=WerewolfDealer.role_id))
+
+
+def arrangements(counts: collections.Counter) -> int:
+    """多重集的不同排列数：n! / ∏ 各角色张数!。"""
+    total = math.factorial(sum(counts.values()))
+    for c in counts.values():
+        total //= math.factorial(c)
+    return total
+
+
+def total_deals(pool: Sequence[str]) -> int:
+    """角色池的不同有序发牌数（同名牌视为相同）。"""
+    return arrangements(_role_counts(pool))
+
+
+def _sub_multisets(items: Sequence[Tuple[str, int]], k: int) -> Iterator[collections.Counter]:
+    # 从 (角色, 张数) 列表中取 k 张的全部子多重集
+    if k == 0:
+        yield collections.Counter()
+        return
+    if not items:
+        return
+    (role, count), rest = items[0], items[1:]
+    for take in range(min(count, k), -1, -1):
+        for sub in _sub_multisets(rest, k - take):
+            if take:
+                sub[role] = take
+            yield sub
+
+
+def _distinct_permutations(counts: collections.Counter) -> Iterator[Tuple[str, ...]]:
+    roles = sorted(counts, key=WerewolfDealer.role_id)
+    remaining = dict(counts)
+    size = sum(remaining.values())
+    prefix = []
+
+    def walk():
+        if len(prefix) == size:
+            yield tuple(prefix)
+            return
+        for role in roles:
+            if remaining[role]:
+                remaining[role] -= 1
+                prefix.append(role)
+                yield from walk()
+                prefix.pop()
+                remaining[role] += 1
+
+    yield from walk()
+
+
+def canonical_deal(players: Sequence[str], center: Sequence[str], seat_symmetric: bool = True) -> Deal:
+    """发牌的规范代表；同一轨道内的任意发牌得到同一结果。"""
+    if len(center) != CENTER_SIZE:
+        raise ValueError(f"中央牌须为 {CENTER_SIZE} 张")
+    key = WerewolfDealer.role_id
+    norm_players = tuple(WerewolfDealer.normalize_role(r) for r in players)
+    norm_center = tuple(sorted((WerewolfDealer.normalize_role(r) for r in center), key=key))
+    if seat_symmetric:
+        norm_players = tuple(sorted(norm_players, key=key))
+    return norm_players, norm_center
+
+
+def deal_orbits(pool: Sequence[str], seat_symmetric: bool = True) -> Iterator[Tuple[Deal, int]]:
+    """枚举角色池的全部规范发牌及其轨道权重 ((玩家牌, 中央牌), 权重)。
+
+    座位可交换时轨道数仅为「中央三张的子多重集数」，通常只有几十个。
+    """
+    counts = _role_counts(pool)
+    players = sum(counts.values()) - CENTER_SIZE
+    if players < 1:
+        raise ValueError(f"角色池至少需要 {CENTER_SIZE + 1} 张牌")
+    items = sorted(counts.items(), key=lambda kv: WerewolfDealer.role_id(kv[0]))
+    for center_counts in _sub_multisets(items, CENTER_SIZE):
+        player_counts = counts - center_counts
+        center = _sorted_roles(center_counts)
+        weight = arrangements(center_counts)
+        if seat_symmetric:
+            yield (_sorted_roles(player_counts), center), weight * arrangements(player_counts)
+        else:
+            for seats in _distinct_permutations(player_counts):
+                yield (seats, center), weight
+
+
+def orbit_count(pool: Sequence[str], seat_symmetric: bool = True) -> int:
+    return sum(1 for _ in deal_orbits(pool, seat_symmetric))
+
+
+def expectation(pool: Sequence[str], fn: Callable[[Tuple[str, ...], Tuple[str, ...]], float],
+                seat_symmetric: bool = True) -> float:
+    """对均匀随机发牌精确求 fn(玩家牌, 中央牌) 的期望，每个轨道只调用一次 fn。
+
+    fn 必须在轨道内取值不变（例如只依赖中央牌，或对座位对称）。
+    """
+    total = 0
+    acc = 0.0
+    for (players, center), weight in deal_orbits(pool, seat_symmetric):
+        acc += weight * fn(players, center)
+        total += weight
+    return acc / total
+
+
+def stratified_rates(pool: Sequence[str], games_per_orbit: int, seed: int = 0,
+                     policy: str = "random") -> Dict[str, float]:
+    """按轨道分层估计各阵营胜率：发牌部分精确加权，每个轨道内只对夜晚与投票的随机性抽样。
+
+    与直接模拟相比消除了发牌带来的方差；返回 {"good", "wolf", "tanner", "tie", "orbits", "games"}。
+    """
+    if policy not in VOTE_POLICIES:
+        raise ValueError(f"未知投票策略 '{policy}'，可用：{sorted(VOTE_POLICIES)}")
+    if games_per_orbit < 1:
+        raise ValueError("games_per_orbit 至少为 1")
+    dealer = WerewolfDealer()
+    rates = dict.fromkeys(TALLY_FIELDS[1:], 0.0)
+    total = orbits = 0
+    next_seed = seed
+    for (players, center), weight in deal_orbits(pool):
+        deal = players + center
+        wins = dict.fromkeys(rates, 0)
+        for i in range(games_per_orbit):
+            game = play_game(pool, next_seed + i, policy, dealer, deal=deal)
+            for faction in ("good", "wolf", "tanner"):
+                wins[faction] += game["result"][faction]
+            wins["tie"] += game["is_tie"]
+        next_seed += games_per_orbit
+        for key in rates:
+            rates[key] += weight * wins[key] / games_per_orbit
+        total += weight
+        orbits += 1
+    result = {key: value / total for key, value in rates.items()}
+    result["orbits"] = orbits
+    result["games"] = orbits * games_per_orbit
+    return result
@@ -1,8 +1,32 @@
 import random
 import json
+import sys
+from types import MappingProxyType
 from typing import List, Tuple, Dict
 
+from core import game_log
+
+
+def _compile_alias_table(aliases: Dict[str, str]):
+    """把别名表编译为只读映射：覆盖常见大小写写法（原样/小写/大写/首字母大写），
+    值统一 intern，使 normalize_role 在命中时只需一次字典查找、不产生新字符串。"""
+    table = {}
+    for alias, internal in aliases.items():
+        internal = sys.intern(internal)
+        for variant in (alias, alias.lower(), alias.upper(), alias.title(), alias.capitalize()):
+            table.setdefault(sys.intern(variant), internal)
+    return MappingProxyType(table)
+
+
+def _compile_role_id_table(alias_table, role_ids):
+    """别名 -> 紧凑角色 ID（未收录的内部名记为 -1）。"""
+    return MappingProxyType({alias: role_ids.get(internal, -1) for alias, internal in alias_table.items()})
+
+
 class WerewolfDealer:
+    # 夜晚唤醒顺序（仅包含有夜晚行动的角色）
+    NIGHT_ORDER = ("doppelganger", "werewolf", "minion", "mason", "seer", "robber", "troublemaker", "drunk", "insomniac")
+
     ROLE_ALIASES = {
         "狼人": "werewolf",
         "werewolf": "werewolf",
@@ -28,8 +52,29 @@ class WerewolfDealer:
         "bodyguard": "bodyguard",
         "化身幽灵": "doppelganger",
         "doppelganger": "doppelganger",
+        "猎人": "hunter",
+        "hunter": "hunter",
     }
 
+    # 角色内部名顺序即紧凑角色 ID（int8 编码使用）；新增角色只能追加在末尾
+    ROLE_ORDER = (
+        "werewolf", "minion", "mason", "seer", "robber", "troublemaker", "drunk",
+        "insomniac", "villager", "tanner", "bodyguard", "doppelganger", "hunter",
+    )
+    ROLE_IDS = MappingProxyType({r: i for i, r in enumerate(ROLE_ORDER)})
+
+    # 导入时编译的别名表：别名（含各 GUI 的中文显示名与大小写变体）-> 内部名 / 角色 ID
+    _ALIAS_TABLE = _compile_alias_table(ROLE_ALIASES)
+    _ROLE_ID_TABLE = _compile_role_id_table(_ALIAS_TABLE, ROLE_IDS)
+    # 未收录写法的归一化结果（首次走慢路径后缓存，数量有上限）
+    _NORMALIZE_MISS_CACHE: Dict[str, str] = {}
+    _NORMALIZE_MISS_CACHE_MAX = 1024
+    # 命中统计：hits = 单次字典命中；misses = 需要 lower() 的慢路径
+    _normalize_hits = 0
+    _normalize_misses = 0
+    # 设置了日志 sink 时 session["history"] 只保留最近这么多条（完整记录已流式写出）
+    HISTORY_LIMIT = 256
+
     """核心发牌引擎。
 
     功能：
@@ -39,14 +84,33 @@ class WerewolfDealer:
     """
 
     def __init__(self, config_path: str = "resources/roles_config.json"):
-        self.config_path = config_path
+        # 延迟导入，避免与 game_rules 循环引用
+        from core import game_rules
+        self.config_path = game_rules.resolve_rules_path(config_path)
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                self.rules = json.load(f)
+            # 编译结果按配置文件哈希缓存；非法配置在此直接抛出 ValueError
+            self.compiled_rules = game_rules.load_compiled_rules(self.config_path)
+            self.rules = self.compiled_rules.raw
         except FileNotFoundError:
             # 不再使用内置默认规则，若缺少配置则置为空字典（当前 GUI 随机发牌不依赖该配置）
+            self.compiled_rules = None
             self.rules = {}
+        # 操作历史的流式输出（见 set_log_sink）
+        self.log_sink = None
+
 
+    def set_log_sink(self, sink):
+        """设置操作历史的 sink（可调用对象或生成器，如 core.game_log.JsonlSink）；传 None 取消。"""
+        self.log_sink = game_log.as_callback(sink)
+
+    def _record_history(self, entry: Dict):
+        hist = self.session["history"]
+        hist.append(entry)
+        if self.log_sink is not None:
+            self.log_sink(entry)
+            if len(hist) > self.HISTORY_LIMIT:
+                # 成批丢弃最旧的一半，均摊 O(1)
+                del hist[:self.HISTORY_LIMIT // 2]
 
     def get_available_modes(self, player_count: int) -> List[str]:
         key = str(player_count)
@@ -104,12 +168,14 @@ class WerewolfDealer:
         return results
 
     # ---- 新增：基于玩家自选卡牌的会话管理 ----
-    def start_game_with_selection(self, chosen_roles: List[str]):
+    def start_game_with_selection(self, chosen_roles: List[str], rng: random.Random = None, shuffle: bool = True):
         """
         基于外部（比如开始界面）传入的角色列表启动一局游戏。
 
         - chosen_roles: 长度必须 = players + 3（其中 players 会由函数根据长度自动推断）
         - 随机分配给玩家（每人一张）并留下三张中央牌
+        - rng: 可选的随机源（模拟器按种子复现用），默认使用全局 random
+        - shuffle: False 时不洗牌，按给定顺序发牌（前 players 张给玩家，最后三张为中央，穷举分析用）
         初始化会话状态以便后续查看/交换/回合推进调用。
         """
         # 根据 chosen_roles 推断玩家人数
@@ -127,12 +193,13 @@ class WerewolfDealer:
 
         # 深拷贝并随机分配
         pool = chosen_roles.copy()
-        random.shuffle(pool)
+        if shuffle:
+            (rng or random).shuffle(pool)
 
         player_cards = pool[:player_count]
         center_cards = pool[player_count:]
 
-        # 初始化会话状态
+        # 初始化会话状态（夜晚计划仅在发牌时计算一次）
         self.session = {
             "player_count": player_count,
             "player_cards": player_cards,
@@ -147,7 +214,9 @@ class WerewolfDealer:
             # 记录是否处于行动阶段（允许 swap），外部可根据具体技能与阶段控制
             "action_phase": True,
             # 简单的交换/操作历史，用于调试或回放
-            "history": []
+            "history": [],
+            # 夜晚计划：角色 -> 初始座位、唤醒步骤（基于初始身份，发牌后不再变化）
+            "night_plan": self._build_night_plan(player_cards, center_cards),
         }
         return {
             "player_cards": player_cards.copy(),
@@ -174,8 +243,49 @@ class WerewolfDealer:
     def normalize_role(cls, role: str) -> str:
         if not role:
             return ""
+        res = cls._ALIAS_TABLE.get(role) if isinstance(role, str) else None
+        if res is None and isinstance(role, str):
+            res = cls._NORMALIZE_MISS_CACHE.get(role)
+        if res is not None:
+            cls._normalize_hits += 1
+            return res
+        cls._normalize_misses += 1
         key = role.lower() if isinstance(role, str) else role
-        return cls.ROLE_ALIASES.get(key, key)
+        res = cls._ALIAS_TABLE.get(key, key)
+        if isinstance(role, str) and len(cls._NORMALIZE_MISS_CACHE) < cls._NORMALIZE_MISS_CACHE_MAX:
+            cls._NORMALIZE_MISS_CACHE[role] = sys.intern(res)
+        return res
+
+    @classmethod
+    def role_id(cls, role: str) -> int:
+        """返回角色的紧凑 ID（见 ROLE_ORDER），未知角色返回 -1。"""
+        rid = cls._ROLE_ID_TABLE.get(role) if isinstance(role, str) else None
+        if rid is not None:
+            cls._normalize_hits += 1
+            return rid
+        return cls.ROLE_IDS.get(cls.normalize_role(role), -1)
+
+    @classmethod
+    def role_name(cls, role_id: int) -> str:
+        """role_id 的逆映射；越界时返回空字符串。"""
+        if 0 <= role_id < len(cls.ROLE_ORDER):
+            return cls.ROLE_ORDER[role_id]
+        return ""
+
+    @classmethod
+    def normalize_stats(cls) -> Dict[str, float]:
+        """返回 normalize_role / role_id 的命中统计。"""
+        total = cls._normalize_hits + cls._normalize_misses
+        return {
+            "hits": cls._normalize_hits,
+            "misses": cls._normalize_misses,
+            "hit_rate": (cls._normalize_hits / total) if total else 0.0,
+        }
+
+    @classmethod
+    def reset_normalize_stats(cls):
+        cls._normalize_hits = 0
+        cls._normalize_misses = 0
 
     def view_card(self, player_index: int) -> str:
         """
@@ -192,7 +302,7 @@ class WerewolfDealer:
 
         s["viewed"][player_index] = True
         card = s["player_cards"][player_index]
-        s["history"].append({"action": "view", "player": player_index, "card": card})
+        self._record_history({"action": "view", "player": player_index, "card": card})
         return card
 
     def swap_with_player(self, player_index: int, other_player_index: int):
@@ -205,7 +315,7 @@ class WerewolfDealer:
         if not (0 <= player_index < n and 0 <= other_player_index < n):
             raise IndexError("player_index 越界")
         pc[player_index], pc[other_player_index] = pc[other_player_index], pc[player_index]
-        s["history"].append({"action": "swap_player", "by": player_index, "with": other_player_index})
+        self._record_history({"action": "swap_player", "by": player_index, "with": other_player_index})
         return True
 
     def swap_with_center(self, player_index: int, center_index: int):
@@ -221,7 +331,7 @@ class WerewolfDealer:
         if not (0 <= center_index < len(cc)):
             raise IndexError("center_index 越界")
         pc[player_index], cc[center_index] = cc[center_index], pc[player_index]
-        s["history"].append({"action": "swap_center", "by": player_index, "center_index": center_index})
+        self._record_history({"action": "swap_center", "by": player_index, "center_index": center_index})
         return True
 
     def next_turn(self):
@@ -239,9 +349,51 @@ class WerewolfDealer:
         self.session["action_phase"] = False
 
     # ---- 夜晚流程与角色辅助 ----
+    @classmethod
+    def _build_night_plan(cls, player_cards: List[str], center_cards: List[str]) -> Dict:
+        """单次遍历初始牌面，生成夜晚计划：
+        - role_indices: 角色 -> 初始持有该角色的玩家索引列表
+        - center_roles: 中央牌中出现的角色集合
+        - steps: 按唤醒顺序排列的夜晚步骤（与 get_night_steps 的返回格式一致）
+        """
+        role_indices: Dict[str, List[int]] = {}
+        for i, r in enumerate(player_cards or []):
+            role_indices.setdefault(cls.normalize_role(r), []).append(i)
+        center_roles = frozenset(cls.normalize_role(c) for c in center_cards or [])
+
+        steps = []
+        for role in cls.NIGHT_ORDER:
+            players = role_indices.get(role, [])
+            if role == "mason" and len(players) not in (0, 2):
+                # 守夜人必须成对出现，否则忽略以防配置问题
+                players = []
+            in_center = role in center_roles
+            if players or in_center:
+                steps.append({"role": role, "players": list(players), "in_center": in_center})
+        return {"role_indices": role_indices, "center_roles": center_roles, "steps": steps}
+
+    def get_night_plan(self) -> Dict:
+        """返回当前会话的夜晚计划（发牌时计算并缓存）。
+
+        外部直接构造的会话（例如 GUI 的最小会话）没有缓存计划时，按当前初始牌面补算一次并写回会话。
+        """
+        s = getattr(self, "session", None)
+        if not s:
+            return {"role_indices": {}, "center_roles": frozenset(), "steps": []}
+        plan = s.get("night_plan")
+        if plan is None:
+            players = s.get("initial_player_cards") or s.get("player_cards") or []
+            centers = s.get("initial_center_cards") or s.get("center_cards") or []
+            plan = self._build_night_plan(players, centers)
+            s["night_plan"] = plan
+        return plan
+
     def get_role_indices(self, role_name: str, use_initial: bool = True) -> List[int]:
         if not hasattr(self, "session"):
             return []
+        if use_initial and self.session:
+            # 初始身份不会变化，直接查缓存的夜晚计划
+            return list(self.get_night_plan()["role_indices"].get(self.normalize_role(role_name), []))
         cards = self.session.get("initial_player_cards") if use_initial else self.session.get("player_cards")
         res = []
         if not cards:
@@ -253,24 +405,17 @@ class WerewolfDealer:
         return res
 
     def get_night_steps(self) -> List[Dict]:
-        """返回夜晚步骤列表，包含出现的角色及相关玩家（基于初始身份）。"""
-        order = ["doppelganger", "werewolf", "minion", "mason", "seer", "robber", "troublemaker", "drunk", "insomniac"]
-        steps = []
-        center_cards = []
-        if hasattr(self, "session"):
-            center_cards = self.session.get("initial_center_cards") or self.session.get("center_cards") or []
-        for role in order:
-            players = self.get_role_indices(role, use_initial=True)
-            if role == "mason" and len(players) not in (0, 2):
-                # 守夜人必须成对出现，否则忽略以防配置问题
-                players = []
-            in_center = any(self.normalize_role(c) == role for c in center_cards)
-            if players or in_center:
-                steps.append({"role": role, "players": players, "in_center": in_center})
-        return steps
+        """返回夜晚步骤列表，包含出现的角色及相关玩家（基于初始身份）。
+
+        步骤取自发牌时缓存的夜晚计划；返回副本，调用方修改不会影响缓存。
+        """
+        return [
+            {"role": st["role"], "players": list(st["players"]), "in_center": st["in_center"]}
+            for st in self.get_night_plan()["steps"]
+        ]
 
     # ---- 一键夜晚自动流程（默认策略，必要时可传入 choices 指定目标） ----
-    def run_night_automation(self, choices: Dict = None) -> List[Dict]:
+    def run_night_automation(self, choices: Dict = None, rng: random.Random = None, sink=None) -> List[Dict]:
         """
         按顺序自动执行夜晚行动；不要求用户逐步操作，使用默认/随机策略。
         可通过 choices 指定目标，例如：
@@ -278,17 +423,22 @@ class WerewolfDealer:
               "robber": {robber_index: target_index},
               "troublemaker": {tm_index: (a_index, b_index)},
               "drunk": {drunk_index: center_index},
-              "seer": {seer_index: {"type": "player", "target": idx} 或 {"type": "center", "targets": [i,j]}}
+              "seer": {seer_index: {"type": "player", "target": idx} 或 {"type": "center", "targets": [i,j]}},
+              "doppelganger": {doppelganger_index: target_index}
             }
-        返回：行动日志列表。
-        说明：化身幽灵（doppelganger）暂未实现具体复制规则，仅记录占位日志。
+        化身幽灵复制后的行动沿用被复制角色的 choices，键为化身幽灵的座位。
+        rng: 可选的随机源，用于按种子复现默认策略的选择。
+        sink: 可选的日志 sink（可调用对象或生成器）；给出时日志逐条交给 sink，不在内存中累积。
+        返回：行动日志列表（给出 sink 时为空列表）。
+        化身幽灵复制产生的行动日志带 "doppelganger": True；复制结果写入 s["doppelganger"]。
         """
         if not hasattr(self, "session"):
             raise RuntimeError("游戏尚未开始")
         s = self.session
         n = s["player_count"]
         log: List[Dict] = []
-        rnd = random.Random()
+        emit = game_log.as_callback(sink) or log.append
+        rnd = rng or random.Random()
         if choices is None:
             choices = {}
 
@@ -306,97 +456,125 @@ class WerewolfDealer:
             return a, b
 
         # 以初始身份确定出手人；卡牌交换在 s["player_cards"] 上进行
+        # 化身幽灵最先行动：复制某名玩家的角色；复制到即时行动角色（预言家/强盗/捣蛋鬼/酒鬼）立即执行，
+        # 复制到狼人/爪牙/守夜人则随该角色一同醒来，复制到失眠者则在失眠者之后再次醒来
+        dg_copies: Dict[int, str] = {}
+
+        def copied_seats(target_role: str) -> List[int]:
+            return [i for i, r in dg_copies.items() if r == target_role]
+
+        def tag(entry: Dict, dg: bool) -> Dict:
+            if dg:
+                entry["doppelganger"] = True
+            return entry
+
+        def act_seer(si: int, dg: bool = False):
+            choice = (choices.get("seer", {}) or {}).get(si)
+            if choice and choice.get("type") == "player":
+                tgt = choice.get("target")
+                card = s["player_cards"][tgt] if 0 <= tgt < n else None
+                emit(tag({"role": "seer", "seer": si, "peek_player": tgt, "card": card}, dg))
+            elif choice and choice.get("type") == "center":
+                idxs = choice.get("targets", [])[:2]
+                cards = [s["center_cards"][k] for k in idxs if 0 <= k < len(s["center_cards"])][:2]
+                emit(tag({"role": "seer", "seer": si, "peek_center": idxs, "cards": cards}, dg))
+            else:
+                # 默认：查看两张中央
+                idxs = list(range(len(s["center_cards"])))
+                rnd.shuffle(idxs)
+                idxs = idxs[:2]
+                cards = [s["center_cards"][k] for k in idxs]
+                emit(tag({"role": "seer", "seer": si, "peek_center": idxs, "cards": cards}, dg))
+
+        def act_robber(ri: int, dg: bool = False):
+            # 与一名其他玩家交换；然后查看新牌（这里仅记录日志）
+            tgt = (choices.get("robber", {}) or {}).get(ri)
+            if tgt is None:
+                tgt = rand_other(ri)
+            if tgt is None or not (0 <= tgt < n) or tgt == ri:
+                emit(tag({"role": "robber", "robber": ri, "note": "未找到可交换目标"}, dg))
+                return
+            s["player_cards"][ri], s["player_cards"][tgt] = s["player_cards"][tgt], s["player_cards"][ri]
+            emit(tag({"role": "robber", "robber": ri, "swapped_with": tgt, "new_card": s["player_cards"][ri]}, dg))
+
+        def act_troublemaker(ti: int, dg: bool = False):
+            pair = (choices.get("troublemaker", {}) or {}).get(ti)
+            if not pair:
+                pair = rand_two_excl([ti])
+            if not pair:
+                emit(tag({"role": "troublemaker", "troublemaker": ti, "note": "可交换目标不足"}, dg))
+                return
+            a, b = pair
+            s["player_cards"][a], s["player_cards"][b] = s["player_cards"][b], s["player_cards"][a]
+            emit(tag({"role": "troublemaker", "troublemaker": ti, "swapped": (a, b)}, dg))
+
+        def act_drunk(di: int, dg: bool = False):
+            ci = (choices.get("drunk", {}) or {}).get(di)
+            if ci is None:
+                ci = rnd.randrange(0, len(s["center_cards"])) if s["center_cards"] else None
+            if ci is None or not (0 <= ci < len(s["center_cards"])):
+                emit(tag({"role": "drunk", "drunk": di, "note": "中央牌不存在"}, dg))
+                return
+            s["player_cards"][di], s["center_cards"][ci] = s["center_cards"][ci], s["player_cards"][di]
+            emit(tag({"role": "drunk", "drunk": di, "center_index": ci}, dg))
+
+        immediate = {"seer": act_seer, "robber": act_robber, "troublemaker": act_troublemaker, "drunk": act_drunk}
+
         steps = self.get_night_steps()
         for step in steps:
             role = step["role"]
             players = step["players"]
             if role == "doppelganger":
-                #  需要确认化身幽灵的复制与后续行动规则
-                log.append({"role": role, "players": players, "note": "未实现，需规则确认"})
+                for gi in players:
+                    tgt = (choices.get("doppelganger", {}) or {}).get(gi)
+                    if tgt is None:
+                        tgt = rand_other(gi)
+                    if tgt is None or not (0 <= tgt < n) or tgt == gi:
+                        emit({"role": role, "player": gi, "note": "未找到可复制目标"})
+                        continue
+                    copied = self.normalize_role(s["player_cards"][tgt])
+                    dg_copies[gi] = copied
+                    emit({"role": role, "player": gi, "copied_from": tgt, "copied_role": copied})
+                    if copied in immediate:
+                        immediate[copied](gi, dg=True)
+                if dg_copies:
+                    # 与 GUI 写入的格式一致，结算时据此确定化身幽灵牌的身份
+                    first = next(iter(dg_copies))
+                    s["doppelganger"] = {"players": list(players), "copied_role": dg_copies[first],
+                                         "copies": dict(dg_copies)}
                 continue
 
             if role == "werewolf":
                 # 多狼互相确认；若仅 1 狼，则可查看一张中央牌
-                wolves = players
+                wolves = players + copied_seats("werewolf")
                 if len(wolves) == 1 and s["center_cards"]:
                     ci = rnd.randrange(0, len(s["center_cards"]))
                     seen = s["center_cards"][ci]
-                    log.append({"role": role, "wolves": wolves, "center_peek": ci, "card": seen})
+                    emit(tag({"role": role, "wolves": wolves, "center_peek": ci, "card": seen}, not players))
                 else:
-                    log.append({"role": role, "wolves": wolves})
+                    emit({"role": role, "wolves": wolves})
                 continue
 
             if role == "minion":
-                wolves_now = self.get_role_indices("werewolf", use_initial=True)
-                log.append({"role": role, "minions": players, "wolves_seen": wolves_now})
+                wolves_now = self.get_role_indices("werewolf", use_initial=True) + copied_seats("werewolf")
+                emit({"role": role, "minions": players + copied_seats("minion"), "wolves_seen": wolves_now})
                 continue
 
             if role == "mason":
-                # 两位守夜人互认
-                log.append({"role": role, "masons": players})
-                continue
-
-            if role == "seer":
-                for si in players:
-                    choice = (choices.get("seer", {}) or {}).get(si)
-                    if choice and choice.get("type") == "player":
-                        tgt = choice.get("target")
-                        card = s["player_cards"][tgt] if 0 <= tgt < n else None
-                        log.append({"role": role, "seer": si, "peek_player": tgt, "card": card})
-                    elif choice and choice.get("type") == "center":
-                        idxs = choice.get("targets", [])[:2]
-                        cards = [s["center_cards"][k] for k in idxs if 0 <= k < len(s["center_cards"])][:2]
-                        log.append({"role": role, "seer": si, "peek_center": idxs, "cards": cards})
-                    else:
-                        # 默认：查看两张中央
-                        idxs = list(range(len(s["center_cards"])));
-                        rnd.shuffle(idxs)
-                        idxs = idxs[:2]
-                        cards = [s["center_cards"][k] for k in idxs]
-                        log.append({"role": role, "seer": si, "peek_center": idxs, "cards": cards})
+                # 两位守夜人互认（复制了守夜人的化身幽灵一同醒来）
+                emit({"role": role, "masons": players + copied_seats("mason")})
                 continue
 
-            if role == "robber":
-                # 与一名其他玩家交换；然后查看新牌（这里仅记录日志）
-                for ri in players:
-                    tgt = (choices.get("robber", {}) or {}).get(ri)
-                    if tgt is None:
-                        tgt = rand_other(ri)
-                    if tgt is None or not (0 <= tgt < n) or tgt == ri:
-                        log.append({"role": role, "robber": ri, "note": "未找到可交换目标"})
-                        continue
-                    s["player_cards"][ri], s["player_cards"][tgt] = s["player_cards"][tgt], s["player_cards"][ri]
-                    log.append({"role": role, "robber": ri, "swapped_with": tgt, "new_card": s["player_cards"][ri]})
-                continue
-
-            if role == "troublemaker":
-                for ti in players:
-                    pair = (choices.get("troublemaker", {}) or {}).get(ti)
-                    if not pair:
-                        pair = rand_two_excl([ti])
-                    if not pair:
-                        log.append({"role": role, "troublemaker": ti, "note": "可交换目标不足"})
-                        continue
-                    a, b = pair
-                    s["player_cards"][a], s["player_cards"][b] = s["player_cards"][b], s["player_cards"][a]
-                    log.append({"role": role, "troublemaker": ti, "swapped": (a, b)})
-                continue
-
-            if role == "drunk":
-                for di in players:
-                    ci = (choices.get("drunk", {}) or {}).get(di)
-                    if ci is None:
-                        ci = rnd.randrange(0, len(s["center_cards"])) if s["center_cards"] else None
-                    if ci is None or not (0 <= ci < len(s["center_cards"])):
-                        log.append({"role": role, "drunk": di, "note": "中央牌不存在"})
-                        continue
-                    s["player_cards"][di], s["center_cards"][ci] = s["center_cards"][ci], s["player_cards"][di]
-                    log.append({"role": role, "drunk": di, "center_index": ci})
+            if role in immediate:
+                for pi in players:
+                    immediate[role](pi)
                 continue
 
             if role == "insomniac":
                 for ii in players:
-                    log.append({"role": role, "insomniac": ii, "final_card": s["player_cards"][ii]})
+                    emit({"role": role, "insomniac": ii, "final_card": s["player_cards"][ii]})
+                for ii in copied_seats("insomniac"):
+                    emit({"role": role, "insomniac": ii, "final_card": s["player_cards"][ii], "doppelganger": True})
                 continue
 
         return log
@@ -429,7 +607,7 @@ class WerewolfDealer:
         if not (0 <= i < n and 0 <= j < n):
             raise IndexError("player_index 越界")
         s["player_cards"][i], s["player_cards"][j] = s["player_cards"][j], s["player_cards"][i]
-        s["history"].append({"action": "swap_between", "i": i, "j": j})
+        self._record_history({"action": "swap_between", "i": i, "j": j})
         return True
 
     def get_current_player_card(self, player_index: int) -> str:
@@ -440,7 +618,45 @@ class WerewolfDealer:
             raise IndexError("player_index 越界")
         return s["player_cards"][player_index]
 
-    def evaluate_victory(self, executed_indices: List[int], is_tie: bool = False) -> Dict[str, bool]:
+    def final_roles(self) -> List[str]:
+        """夜晚结束时玩家面前的角色内部名；化身幽灵牌按其复制到的角色计（牌被换走后由新持有者继承）。"""
+        if not hasattr(self, "session"):
+            raise RuntimeError("游戏尚未开始")
+        s = self.session
+        final_norm = [self.normalize_role(r) for r in s["player_cards"]]
+        copied = (s.get("doppelganger") or {}).get("copied_role")
+        if copied:
+            copied = self.normalize_role(copied)
+            final_norm = [copied if r == "doppelganger" else r for r in final_norm]
+        return final_norm
+
+    @staticmethod
+    def resolve_executions(final_roles: List[str], executed_indices: List[int], votes: List[int] = None) -> List[int]:
+        """猎人连锁处决：被处决的猎人带走其投票对象，被带走的猎人继续连锁。
+
+        - votes: votes[i] 为玩家 i 投票的座位（-1/None 表示未投票）；不给出时不连锁
+        固定深度（不超过人数轮）在座位数组上迭代，某轮无新增即停止。返回按座位排序的全部死亡座位。
+        """
+        n = len(final_roles)
+        dead = [False] * n
+        for idx in executed_indices:
+            if 0 <= idx < n:
+                dead[idx] = True
+        if votes:
+            hunters = [i for i, r in enumerate(final_roles) if r == "hunter"]
+            for _ in range(n):
+                changed = False
+                for h in hunters:
+                    tgt = votes[h] if h < len(votes) else None
+                    if dead[h] and tgt is not None and 0 <= tgt < n and not dead[tgt]:
+                        dead[tgt] = True
+                        changed = True
+                if not changed:
+                    break
+        return [i for i in range(n) if dead[i]]
+
+    def evaluate_victory(self, executed_indices: List[int], is_tie: bool = False,
+                         votes: List[int] = None) -> Dict[str, bool]:
         """
         根据最终玩家面前身份（不含中央）与处决结果计算胜负。
         规则简化实现：
@@ -448,43 +664,15 @@ class WerewolfDealer:
         b. 若被处决的是皮匠，且没有狼人死去，则皮匠单独获胜；
         c. 若被处决的不是狼人或皮匠，则狼人阵营胜利；
         d. 平票：不死人；若场上有狼人（或无狼人但有爪牙按狼人算），狼人胜；否则好人胜。
+        e. 猎人被处决时带走其投票对象（需给出 votes，见 resolve_executions），被带走者一并参与以上判断。
         另外：若无狼人且有爪牙，则视为有狼人存在（用于以上判断）。
+        判定本身为一次查表（core.outcome_table），规则实现见 outcome_table.reference_outcome。
         返回：{"good": bool, "wolf": bool, "tanner": bool}
         """
-        if not hasattr(self, "session"):
-            raise RuntimeError("游戏尚未开始")
-        s = self.session
-        final_cards = s["player_cards"]
-        final_norm = [self.normalize_role(r) for r in final_cards]
-        wolf_present = any(r == "werewolf" for r in final_norm)
-        minion_present = any(r == "minion" for r in final_norm)
-        if not wolf_present and minion_present:
-            wolf_present = True  # 爪牙视为狼人
-
-        result = {"good": False, "wolf": False, "tanner": False}
-
-        if is_tie:
-            if wolf_present:
-                result["wolf"] = True
-            else:
-                result["good"] = True
-            return result
-
-        # 非平票，检查被处决者身份
-        executed_roles = []
-        for idx in executed_indices:
-            if 0 <= idx < len(final_norm):
-                executed_roles.append(final_norm[idx])
-
-        if any(r == "werewolf" for r in executed_roles):
-            result["good"] = True
-            return result
-        if any(r == "tanner" for r in executed_roles):
-            # 皮匠单独胜，若没有狼人死去（上面已经 return 了狼被处决的情况）
-            result["tanner"] = True
-            return result
-
-        # 否则狼人阵营胜（狼或爪牙）
-        result["wolf"] = True
-        return result
+        # 延迟导入，避免与 game_record 循环引用
+        from core import outcome_table
+        final_norm = self.final_roles()
+        dead = [] if is_tie else self.resolve_executions(final_norm, executed_indices, votes)
+        sig = outcome_table.signature(final_norm, [final_norm[i] for i in dead], is_tie)
+        return outcome_table.lookup(sig)
 
@@ -0,0 +1,542 @@
+"""无显示环境下驱动 Tk 版夜晚流程的压测工具。
+
+以桩模块替换 tkinter / ttk / messagebox / simpledialog / ImageTk，单独加载一份 main_window，
+WerewolfApp 本身不做任何修改；root.after 使用虚拟时钟排队，倒计时可瞬间快进。
+脚本按界面上可见的按钮与可点击卡片逐次“点击”，记录每次点击（含其触发的 0 延时回调）的耗时。
+图片仍由 PIL 真实解码与缩放，因此测得的耗时包含图片加载开销。
+"""
+import heapq
+import importlib.util
+import os
+import random
+import sys
+import time
+import types
+from typing import Callable, Dict, List, Optional
+
+from gui.latency import HistogramSet
+
+_MAIN_WINDOW_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main_window.py')
+
+
+# ---------------------------------------------------------------------------
+# 桩控件
+# ---------------------------------------------------------------------------
+class FakeWidget:
+    """记录配置、布局、绑定与子控件的最小控件实现。"""
+
+    def __init__(self, master=None, **kw):
+        self.master = master
+        self.children: List["FakeWidget"] = []
+        self.options: Dict = {}
+        self.bindings: Dict[str, Callable] = {}
+        self._states = set()
+        self._manager = ''
+        self._alive = True
+        if master is not None:
+            master.children.append(self)
+        self.configure(**kw)
+
+    # 配置
+    def configure(self, cnf=None, **kw):
+        if cnf:
+            kw.update(cnf)
+        self.options.update(kw)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def __getitem__(self, key):
+        return self.options.get(key)
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    # 布局
+    def pack(self, **kw):
+        self._manager = 'pack'
+
+    def grid(self, **kw):
+        self._manager = 'grid'
+
+    def place(self, **kw):
+        self._manager = 'place'
+
+    def pack_forget(self):
+        self._manager = ''
+
+    grid_forget = place_forget = pack_forget
+
+    def columnconfigure(self, *a, **kw):
+        pass
+
+    rowconfigure = columnconfigure
+
+    def winfo_manager(self):
+        return self._manager
+
+    def winfo_ismapped(self):
+        return bool(self._manager) and self._alive
+
+    def winfo_exists(self):
+        return self._alive
+
+    def winfo_children(self):
+        return [c for c in self.children if c._alive]
+
+    def winfo_width(self):
+        return 1000
+
+    def winfo_height(self):
+        return 720
+
+    def destroy(self):
+        self._alive = False
+        for c in list(self.children):
+            c.destroy()
+        if self.master is not None:
+            try:
+                self.master.children.remove(self)
+            except ValueError:
+                pass
+
+    # 事件
+    def bind(self, sequence=None, func=None, add=None):
+        if func is not None:
+            self.bindings[sequence] = func
+
+    def fire(self, sequence='<Button-1>'):
+        handler = self.bindings.get(sequence)
+        if handler is not None:
+            handler(None)
+
+    # ttk 状态
+    def state(self, spec=None):
+        for s in spec or ():
+            if s.startswith('!'):
+                self._states.discard(s[1:])
+            else:
+                self._states.add(s)
+        return tuple(self._states)
+
+    def instate(self, spec):
+        return all((s[1:] not in self._states) if s.startswith('!') else (s in self._states) for s in spec)
+
+    def invoke(self):
+        cmd = self.options.get('command')
+        if callable(cmd) and 'disabled' not in self._states:
+            return cmd()
+
+    def set(self, value):
+        self.options['value'] = value
+
+    def get(self):
+        return self.options.get('value', '')
+
+    # 其它无副作用方法
+    def _noop(self, *a, **kw):
+        return None
+
+    lift = lower = focus_set = focus_force = deiconify = title = transient = resizable = _noop
+
+
+class FakeVariable:
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+        self._traces = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for cb in list(self._traces):
+            cb('', '', 'write')
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+        return str(len(self._traces))
+
+
+class FakeStringVar(FakeVariable):
+    def __init__(self, master=None, value='', name=None):
+        super().__init__(master, value, name)
+
+
+class FakeBooleanVar(FakeVariable):
+    def __init__(self, master=None, value=False, name=None):
+        super().__init__(master, bool(value), name)
+
+    def get(self):
+        return bool(self._value)
+
+
+class FakeIntVar(FakeVariable):
+    def __init__(self, master=None, value=0, name=None):
+        super().__init__(master, value, name)
+
+    def get(self):
+        return int(self._value)
+
+
+class FakeSpinbox(FakeWidget):
+    def get(self):
+        var = self.options.get('textvariable')
+        if var is not None:
+            return var.get()
+        return str(self.options.get('value', ''))
+
+
+class FakeRoot(FakeWidget):
+    """带虚拟时钟的根窗口：after 按到期时间排队，由驱动方显式推进。"""
+
+    def __init__(self):
+        super().__init__(None)
+        self.now_ms = 0
+        self._queue = []
+        self._seq = 0
+        self._cancelled = set()
+        # 可选钩子：每次执行回调时调用 hook(callback, args)，用于计时
+        self.callback_hook: Optional[Callable] = None
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return None
+        self._seq += 1
+        aid = f"after#{self._seq}"
+        heapq.heappush(self._queue, (self.now_ms + max(0, int(ms)), self._seq, aid, func, args))
+        return aid
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, aid):
+        if aid:
+            self._cancelled.add(aid)
+
+    def _pop_due(self, deadline):
+        while self._queue and self._queue[0][0] <= deadline:
+            due, _, aid, func, args = heapq.heappop(self._queue)
+            if aid in self._cancelled:
+                self._cancelled.discard(aid)
+                continue
+            return due, func, args
+        return None
+
+    def _call(self, func, args):
+        if self.callback_hook is not None:
+            self.callback_hook(func, args)
+        else:
+            func(*args)
+
+    def run_pending(self, max_callbacks: int = 10000) -> int:
+        """执行所有已到期（不推进时间）的回调，包括回调中新排入的 0 延时回调。"""
+        n = 0
+        while n < max_callbacks:
+            item = self._pop_due(self.now_ms)
+            if item is None:
+                break
+            self._call(item[1], item[2])
+            n += 1
+        return n
+
+    def advance(self, ms: int) -> int:
+        """推进虚拟时间 ms 毫秒，按到期顺序执行期间的回调。"""
+        deadline = self.now_ms + max(0, int(ms))
+        n = 0
+        while True:
+            item = self._pop_due(deadline)
+            if item is None:
+                break
+            self.now_ms = max(self.now_ms, item[0])
+            self._call(item[1], item[2])
+            n += 1
+        self.now_ms = deadline
+        return n
+
+    def pending(self) -> int:
+        return sum(1 for item in self._queue if item[2] not in self._cancelled)
+
+    def mainloop(self):
+        pass
+
+
+class FakePhotoImage:
+    """替代 ImageTk.PhotoImage：保留尺寸，不创建 Tk 图像。"""
+
+    def __init__(self, image=None, **kw):
+        self.size = getattr(image, 'size', (kw.get('width', 0), kw.get('height', 0)))
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+class DialogRecorder:
+    """messagebox / simpledialog 桩：记录弹窗并按预设返回。"""
+
+    def __init__(self):
+        self.calls = []
+        self.askyesno_result = True
+        self.askstring_result = None
+
+    def _record(self, kind, title, message):
+        self.calls.append((kind, title, message))
+
+    def showinfo(self, title=None, message=None, **kw):
+        self._record('info', title, message)
+
+    def showerror(self, title=None, message=None, **kw):
+        self._record('error', title, message)
+
+    def showwarning(self, title=None, message=None, **kw):
+        self._record('warning', title, message)
+
+    def askyesno(self, title=None, message=None, **kw):
+        self._record('askyesno', title, message)
+        return self.askyesno_result
+
+    def askstring(self, title=None, prompt=None, **kw):
+        self._record('askstring', title, prompt)
+        return self.askstring_result
+
+    def errors(self):
+        return [c for c in self.calls if c[0] == 'error']
+
+
+_TK_CONSTANTS = {
+    'BOTH': 'both', 'X': 'x', 'Y': 'y', 'LEFT': 'left', 'RIGHT': 'right', 'TOP': 'top', 'BOTTOM': 'bottom',
+    'W': 'w', 'E': 'e', 'N': 'n', 'S': 's', 'NW': 'nw', 'NE': 'ne', 'CENTER': 'center',
+    'RIDGE': 'ridge', 'SOLID': 'solid', 'GROOVE': 'groove', 'FLAT': 'flat', 'RAISED': 'raised', 'SUNKEN': 'sunken',
+    'HORIZONTAL': 'horizontal', 'VERTICAL': 'vertical', 'END': 'end', 'NORMAL': 'normal', 'DISABLED': 'disabled',
+}
+
+
+def _make_stub_modules(dialogs: DialogRecorder) -> Dict[str, types.ModuleType]:
+    tk_mod = types.ModuleType('tkinter')
+    tk_mod.__dict__.update(_TK_CONSTANTS)
+    for name in ('Frame', 'Label', 'Button', 'Canvas', 'Toplevel', 'Checkbutton', 'Scale', 'Entry'):
+        setattr(tk_mod, name, type(name, (FakeWidget,), {}))
+    tk_mod.Spinbox = FakeSpinbox
+    tk_mod.Tk = FakeRoot
+    tk_mod.StringVar = FakeStringVar
+    tk_mod.BooleanVar = FakeBooleanVar
+    tk_mod.IntVar = FakeIntVar
+    tk_mod.TclError = RuntimeError
+
+    ttk_mod = types.ModuleType('tkinter.ttk')
+    for name in ('Frame', 'Label', 'Button', 'Checkbutton', 'Scale', 'Entry', 'LabelFrame'):
+        setattr(ttk_mod, name, type(name, (FakeWidget,), {}))
+    ttk_mod.Labelframe = ttk_mod.LabelFrame
+    ttk_mod.Spinbox = FakeSpinbox
+
+    mb_mod = types.ModuleType('tkinter.messagebox')
+    sd_mod = types.ModuleType('tkinter.simpledialog')
+    for name in ('showinfo', 'showerror', 'showwarning', 'askyesno'):
+        setattr(mb_mod, name, getattr(dialogs, name))
+    sd_mod.askstring = dialogs.askstring
+    tk_mod.ttk, tk_mod.messagebox, tk_mod.simpledialog = ttk_mod, mb_mod, sd_mod
+
+    imagetk_mod = types.ModuleType('PIL.ImageTk')
+    imagetk_mod.PhotoImage = FakePhotoImage
+    return {
+        'tkinter': tk_mod,
+        'tkinter.ttk': ttk_mod,
+        'tkinter.messagebox': mb_mod,
+        'tkinter.simpledialog': sd_mod,
+        'PIL.ImageTk': imagetk_mod,
+    }
+
+
+def load_headless_app_module(dialogs: DialogRecorder):
+    """以桩模块加载一份独立的 main_window（不影响已导入的真实 gui.main_window）。"""
+    stubs = _make_stub_modules(dialogs)
+    saved = {name: sys.modules.get(name) for name in stubs}
+    import PIL
+    saved_attr = getattr(PIL, 'ImageTk', None)
+    try:
+        sys.modules.update(stubs)
+        PIL.ImageTk = stubs['PIL.ImageTk']
+        spec = importlib.util.spec_from_file_location('gui._headless_main_window', _MAIN_WINDOW_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, mod in saved.items():
+            if mod is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = mod
+        if saved_attr is None:
+            try:
+                delattr(PIL, 'ImageTk')
+            except AttributeError:
+                pass
+        else:
+            PIL.ImageTk = saved_attr
+    return module
+
+
+# ---------------------------------------------------------------------------
+# 驱动
+# ---------------------------------------------------------------------------
+class HeadlessNightDriver:
+    """创建无头 WerewolfApp，并按脚本点击完成整局（选角 → 查看 → 夜晚 → 翻牌）。"""
+
+    ACTION_BUTTONS = ("确认复制", "确认交换")
+    SEER_BUTTONS = ("查看两张中央", "查看一名玩家")
+    # 单步点击上限，防止脚本与界面状态不一致时死循环
+    MAX_CLICKS_PER_NIGHT = 500
+
+    def __init__(self, seed: Optional[int] = None, timeout_rate: float = 0.0, audio: bool = False):
+        self.rng = random.Random(seed)
+        self.timeout_rate = timeout_rate
+        self.dialogs = DialogRecorder()
+        self.module = load_headless_app_module(self.dialogs)
+        self.root = FakeRoot()
+        self.app = self.module.WerewolfApp(self.root)
+        if not audio:
+            # 压测不播放音频：无音频文件时流程以 after(0) 直接回调
+            self.app.sounds_dir = None
+        self.root.run_pending()
+        self.histograms = HistogramSet()
+        self.games = 0
+        self.timeouts = 0
+        self._clicked = set()
+        self._focus_key = None
+
+    # --- 计时 ---
+    def _timed(self, name: str, func: Callable, *args):
+        """执行一次“点击”并清空由此产生的 0 延时回调，整段耗时计入 name。"""
+        t0 = time.perf_counter()
+        result = func(*args)
+        self.root.run_pending()
+        dt = time.perf_counter() - t0
+        self.histograms.record_seconds(name, dt)
+        self.histograms.record_seconds('all', dt)
+        return result
+
+    # --- 界面查询 ---
+    def _buttons(self) -> Dict[str, FakeWidget]:
+        frame = getattr(self.app, 'night_buttons_frame', None)
+        if frame is None or not frame.winfo_exists():
+            return {}
+        return {w.cget('text'): w for w in frame.winfo_children() if w.instate(['!disabled'])}
+
+    def _clickable_cards(self) -> List[Dict]:
+        return [w for w in getattr(self.app, 'focus_widgets', []) or []
+                if w.get('label') is not None and '<Button-1>' in w['label'].bindings]
+
+    def _step_name(self) -> str:
+        return f"night:{getattr(self.app, 'night_current_role', None) or 'end'}"
+
+    # --- 一局 ---
+    def play_game(self, player_count: int, wolf_count: int):
+        app = self.app
+        app.spin.set(player_count)
+        app.werewolf_count_var.set(str(wolf_count))
+        self._timed('deal', app.deal_btn.invoke)
+        if self.dialogs.errors():
+            raise RuntimeError(f"随机选角失败：{self.dialogs.errors()[-1]}")
+        self._timed('start_game', app.start_btn.invoke)
+        if self.dialogs.errors():
+            raise RuntimeError(f"开始失败：{self.dialogs.errors()[-1]}")
+        # 按序查看：每名玩家点两次（翻开、下一位）
+        for _ in range(app.player_count * 2):
+            self._timed('view', app.viewer_img_lbl.fire)
+        self._timed('start_night', app.start_night_btn.invoke)
+        self._run_night()
+        # 投票：随机翻开一名玩家
+        target = self.rng.randrange(len(app.board_player_widgets))
+        self._timed('vote', app.board_player_widgets[target]['label'].fire)
+        self._timed('restart', app.start_btn.invoke)
+        self.dialogs.calls.clear()
+        self.games += 1
+
+    def _run_night(self):
+        app = self.app
+        clicks = 0
+        last_step = None
+        while not getattr(app, 'night_finished', False):
+            if clicks > self.MAX_CLICKS_PER_NIGHT:
+                raise RuntimeError(f"夜晚流程未能结束（停在 {self._step_name()}）")
+            step = getattr(app, 'night_step_idx', None)
+            focus = getattr(app, 'focus_frame', None)
+            key = (step, id(focus))
+            if key != self._focus_key:
+                self._focus_key = key
+                self._clicked = set()
+            # 每步开头按概率模拟“无人操作”，等待倒计时自动推进
+            if step != last_step:
+                last_step = step
+                if step < len(app.night_steps) and self.rng.random() < self.timeout_rate:
+                    self.timeouts += 1
+                    self._timed('timeout:' + self._step_name()[6:], self._wait_for_timeout, step)
+                    clicks += 1
+                    continue
+            if not self._click_once():
+                # 界面无可点击项：推进虚拟时间，等待音频/计时回调
+                self._timed(self._step_name() + ':wait', self.root.advance, 1000)
+            clicks += 1
+
+    def _wait_for_timeout(self, step):
+        # 每次推进 1 秒，直到倒计时把流程推进到下一步
+        for _ in range(60):
+            if self.app.night_step_idx != step or getattr(self.app, 'night_finished', False):
+                return
+            self.root.advance(1000)
+        raise RuntimeError(f"倒计时未能推进（停在 {self._step_name()}）")
+
+    def _click_once(self) -> bool:
+        name = self._step_name()
+        buttons = self._buttons()
+        for text in self.ACTION_BUTTONS:
+            if text in buttons:
+                self._timed(name + ':confirm', buttons[text].invoke)
+                return True
+        seer = [t for t in self.SEER_BUTTONS if t in buttons]
+        if seer:
+            self._timed(name + ':mode', buttons[self.rng.choice(seer)].invoke)
+            return True
+        if self._card_action_pending():
+            cards = [w for w in self._clickable_cards() if (w['type'], w['index']) not in self._clicked]
+            if cards:
+                w = self.rng.choice(cards)
+                self._clicked.add((w['type'], w['index']))
+                self._timed(name + ':card', w['label'].fire)
+                return True
+        if '继续' in buttons:
+            self._timed(name + ':continue', buttons['继续'].invoke)
+            return True
+        if '结束夜晚' in buttons:
+            self._timed('night:end', buttons['结束夜晚'].invoke)
+            return True
+        return False
+
+    def _card_action_pending(self) -> bool:
+        # 界面本地的选择（酒鬼选牌、化身幽灵选目标）优先，其余以夜晚控制器的状态为准
+        st = getattr(self.app, 'night_action_state', {}) or {}
+        if 'center_sel' in st:
+            return st['center_sel'] is None
+        if 'dg_target' in st:
+            return st['dg_target'] is None
+        ctl = getattr(self.app, 'night_ctl', None)
+        view = ctl.view() if ctl is not None else {}
+        if view.get('acting_role') == 'troublemaker':
+            return len(view['swap_selection']) < 2
+        return not view.get('done', True)
+
+    def run(self, games: int, players=(4, 12), wolves=(1, 3), progress: Optional[Callable[[int], None]] = None):
+        # 非狼人角色最多能凑出的张数（守夜人两张），人数多时需相应提高狼人下限
+        capacity = sum(2 if r['internal'] == 'mason' else 1 for r in self.app.available_roles)
+        for i in range(games):
+            n = self.rng.randint(players[0], players[1])
+            low = max(wolves[0], n + 3 - capacity)
+            w = self.rng.randint(low, max(low, wolves[1]))
+            self.play_game(n, w)
+            if progress is not None:
+                progress(i + 1)
+        return self.histograms
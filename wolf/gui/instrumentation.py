@@ -0,0 +1,200 @@
+"""Tk 版界面的帧耗时与事件循环延迟统计（按需开启）。
+
+install(app) 之后：
+- 所有 Tk 回调（after / 按钮 command / bind 事件）经 tkinter.CallWrapper 计时；
+  无头模式下的 FakeRoot 则通过其 callback_hook 计时；
+- WerewolfApp 的主要方法（图片加载、牌桌刷新、夜晚步骤等）在实例上包一层计时；
+- 耗时记录到 HDR 风格直方图，超过阈值（默认 16ms，即一帧）的调用连同调用栈另行记录；
+- 可导出 Chrome trace-event JSON（chrome://tracing 或 Perfetto 打开），查看整局的时间线。
+
+启动时设置环境变量 WOLF_TRACE=<输出路径> 即可在 main.py 的 Tk 模式下开启。
+"""
+import json
+import os
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from gui.latency import HistogramSet
+
+# 默认包装的 WerewolfApp 方法
+DEFAULT_METHODS = (
+    'deal', 'start_game', '_restart_game',
+    'start_sequential_viewing', '_on_view_click', '_load_placeholder_images',
+    '_setup_board_area', '_populate_board_widgets', '_refresh_board_images', '_load_role_photo',
+    '_start_guided_night', '_run_night_step', '_next_night_step', '_end_guided_night', '_night_tick',
+    '_enter_focus_mode', '_leave_focus_mode', '_focus_show_players', '_focus_show_centers',
+    '_focus_show_single_role', '_complete_role_and_advance', '_evaluate_and_display_result',
+)
+
+SLOW_THRESHOLD_MS = 16.0
+
+
+class Instrumentation:
+    def __init__(self, slow_threshold_ms: float = SLOW_THRESHOLD_MS, trace: bool = True,
+                 max_trace_events: int = 200000, max_slow_events: int = 500, stack_limit: int = 12):
+        self.slow_threshold_us = int(slow_threshold_ms * 1000)
+        self.trace_enabled = trace
+        self.max_trace_events = max_trace_events
+        self.max_slow_events = max_slow_events
+        self.stack_limit = stack_limit
+        self.histograms = HistogramSet()
+        self.slow_events: List[Dict] = []
+        self.trace_events: List[Dict] = []
+        self.dropped_trace_events = 0
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._undo: List[Callable[[], None]] = []
+
+    # --- 记录 ---
+    def _record(self, name: str, cat: str, start: float, end: float, stack: Optional[List[str]] = None):
+        dur_us = int((end - start) * 1_000_000)
+        with self._lock:
+            self.histograms.get(f"{cat}:{name}").record(dur_us)
+            self.histograms.get(cat).record(dur_us)
+            if self.trace_enabled:
+                if len(self.trace_events) < self.max_trace_events:
+                    self.trace_events.append({
+                        "name": name,
+                        "cat": cat,
+                        "ph": "X",
+                        "ts": int((start - self._t0) * 1_000_000),
+                        "dur": dur_us,
+                        "pid": self._pid,
+                        "tid": threading.get_ident(),
+                    })
+                else:
+                    self.dropped_trace_events += 1
+            if dur_us > self.slow_threshold_us and len(self.slow_events) < self.max_slow_events:
+                if stack is None:
+                    # 慢调用时才取栈：结束点的调用链即说明由谁触发
+                    stack = traceback.format_stack(limit=self.stack_limit)[:-2]
+                self.slow_events.append({
+                    "name": name,
+                    "cat": cat,
+                    "dur_ms": round(dur_us / 1000, 3),
+                    "ts_ms": round((start - self._t0) * 1000, 3),
+                    "stack": [line.rstrip() for line in stack],
+                })
+
+    def measure(self, name: str, func: Callable, *args, cat: str = "call", **kwargs):
+        """计时执行一次 func。"""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._record(name, cat, start, time.perf_counter())
+
+    def wrap(self, name: str, func: Callable, cat: str = "method") -> Callable:
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(name, cat, start, time.perf_counter())
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    # --- 安装 ---
+    def install(self, app, methods=DEFAULT_METHODS):
+        """为 app 的主要方法与其 root 的回调挂上计时，可用 uninstall() 还原。"""
+        for name in methods:
+            bound = getattr(app, name, None)
+            if not callable(bound):
+                continue
+            setattr(app, name, self.wrap(name, bound))
+            self._undo.append(lambda n=name: app.__dict__.pop(n, None))
+        root = getattr(app, 'root', None)
+        if root is not None and hasattr(root, 'callback_hook'):
+            self._install_fake_root(root)
+        else:
+            self._install_tk_callwrapper()
+        return self
+
+    def _install_fake_root(self, root):
+        prev = root.callback_hook
+
+        def hook(func, args):
+            name = getattr(func, '__name__', None) or repr(func)
+            if prev is not None:
+                self.measure(name, prev, func, args, cat="after")
+            else:
+                self.measure(name, func, *args, cat="after")
+        root.callback_hook = hook
+
+        def undo():
+            root.callback_hook = prev
+        self._undo.append(undo)
+
+    def _install_tk_callwrapper(self):
+        import tkinter
+        original = tkinter.CallWrapper.__call__
+        inst = self
+
+        def __call__(cw, *args):
+            func = cw.func
+            qual = getattr(func, '__qualname__', '')
+            # tkinter.after 把回调包成 callit，并把 __name__ 设为原函数名
+            cat = "after" if qual.endswith('after.<locals>.callit') else "tk"
+            name = getattr(func, '__name__', None) or repr(func)
+            start = time.perf_counter()
+            try:
+                return original(cw, *args)
+            finally:
+                inst._record(name, cat, start, time.perf_counter())
+
+        tkinter.CallWrapper.__call__ = __call__
+
+        def undo():
+            tkinter.CallWrapper.__call__ = original
+        self._undo.append(undo)
+
+    def uninstall(self):
+        while self._undo:
+            self._undo.pop()()
+
+    # --- 输出 ---
+    def summary(self) -> Dict:
+        return {
+            "histograms": self.histograms.summary(),
+            "slow_threshold_ms": self.slow_threshold_us / 1000,
+            "slow_events": len(self.slow_events),
+            "trace_events": len(self.trace_events),
+            "dropped_trace_events": self.dropped_trace_events,
+        }
+
+    def format_report(self, top: int = 10) -> str:
+        lines = [self.histograms.format_table()]
+        if self.slow_events:
+            lines.append(f"\n超过 {self.slow_threshold_us / 1000:.0f}ms 的调用（共 {len(self.slow_events)} 次，按耗时列出前 {top} 个）：")
+            for ev in sorted(self.slow_events, key=lambda e: -e["dur_ms"])[:top]:
+                lines.append(f"  {ev['cat']}:{ev['name']}  {ev['dur_ms']:.2f}ms @ {ev['ts_ms']:.0f}ms")
+                lines.extend("    " + s.replace("\n", "\n    ") for s in ev["stack"][-4:])
+        return "\n".join(lines)
+
+    def trace_document(self) -> Dict:
+        events = list(self.trace_events)
+        for ev in self.slow_events:
+            # 慢调用额外打一个瞬时标记，时间线上易于定位
+            events.append({
+                "name": f"slow:{ev['name']}",
+                "cat": "slow",
+                "ph": "i",
+                "s": "t",
+                "ts": int(ev["ts_ms"] * 1000),
+                "pid": self._pid,
+                "tid": 0,
+                "args": {"dur_ms": ev["dur_ms"], "stack": "".join(ev["stack"])},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_trace(self, path: str):
+        """写出 Chrome trace-event JSON（先写临时文件再替换）。"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.trace_document(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
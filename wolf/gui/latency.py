@@ -0,0 +1,161 @@
+"""HDR 风格的延迟直方图（对数-线性分桶，固定有效位数）。
+
+数值以微秒为单位记录：小于 sub_count 的值精确计数，更大的值按 2 的幂分段，
+每段内再线性细分为 half 个桶，相对误差不超过 10^-significant_figures。
+桶以稀疏字典保存，记录 O(1)，可合并，适合长时间压测。
+"""
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    def __init__(self, significant_figures: int = 3):
+        if significant_figures < 1 or significant_figures > 5:
+            raise ValueError("有效位数需在 1~5 之间")
+        self.significant_figures = significant_figures
+        self._sub_bits = int(math.ceil(math.log2(2 * 10 ** significant_figures)))
+        self._sub_count = 1 << self._sub_bits
+        self._half = self._sub_count >> 1
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    # --- 分桶 ---
+    def _index(self, value: int) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self._sub_bits
+        return self._sub_count + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _highest_equivalent(self, index: int) -> int:
+        """桶内可表示的最大值（与 HdrHistogram 一致，百分位按此值报告）。"""
+        if index < self._sub_count:
+            return index
+        offset = index - self._sub_count
+        shift = offset // self._half + 1
+        sub = offset % self._half + self._half
+        return ((sub + 1) << shift) - 1
+
+    # --- 记录 ---
+    def record(self, value_us: int, count: int = 1):
+        value_us = max(0, int(value_us))
+        idx = self._index(value_us)
+        self._counts[idx] = self._counts.get(idx, 0) + count
+        self.count += count
+        self.total += value_us * count
+        if self.min is None or value_us < self.min:
+            self.min = value_us
+        if self.max is None or value_us > self.max:
+            self.max = value_us
+
+    def record_seconds(self, seconds: float):
+        self.record(int(round(seconds * 1_000_000)))
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("有效位数不同的直方图不能合并")
+        for idx, cnt in other._counts.items():
+            self._counts[idx] = self._counts.get(idx, 0) + cnt
+        self.count += other.count
+        self.total += other.total
+        for v in (other.min, other.max):
+            if v is None:
+                continue
+            if self.min is None or v < self.min:
+                self.min = v
+            if self.max is None or v > self.max:
+                self.max = v
+
+    # --- 查询 ---
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """返回第 p 百分位（0~100）的值（微秒）。"""
+        if not self.count:
+            return 0
+        target = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for idx in sorted(self._counts):
+            seen += self._counts[idx]
+            if seen >= target:
+                return min(self._highest_equivalent(idx), self.max)
+        return self.max
+
+    def percentiles(self, ps: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[float, int]:
+        return {p: self.percentile(p) for p in ps}
+
+    def count_above(self, threshold_us: int) -> int:
+        """超过阈值的记录数（按桶计，误差同分桶精度）。"""
+        idx = self._index(int(threshold_us))
+        return sum(cnt for i, cnt in self._counts.items() if i > idx)
+
+    def summary(self, ps: Iterable[float] = (50, 90, 99, 99.9)) -> Dict:
+        return {
+            "count": self.count,
+            "min_us": self.min or 0,
+            "mean_us": round(self.mean, 1),
+            "max_us": self.max or 0,
+            "percentiles_us": {str(p): v for p, v in self.percentiles(ps).items()},
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "significant_figures": self.significant_figures,
+            "counts": {str(k): v for k, v in self._counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        h = cls(int(data.get("significant_figures", 3)))
+        h._counts = {int(k): int(v) for k, v in (data.get("counts") or {}).items()}
+        h.count = int(data.get("count", 0))
+        h.total = int(data.get("total", 0))
+        h.min = data.get("min")
+        h.max = data.get("max")
+        return h
+
+
+class HistogramSet:
+    """按名称分组的直方图集合。"""
+
+    def __init__(self, significant_figures: int = 3):
+        self.significant_figures = significant_figures
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def get(self, name: str) -> LatencyHistogram:
+        h = self.histograms.get(name)
+        if h is None:
+            h = LatencyHistogram(self.significant_figures)
+            self.histograms[name] = h
+        return h
+
+    def record_seconds(self, name: str, seconds: float):
+        self.get(name).record_seconds(seconds)
+
+    def merge(self, other: "HistogramSet"):
+        for name, h in other.histograms.items():
+            self.get(name).merge(h)
+
+    def summary(self, ps: Optional[Iterable[float]] = None) -> Dict[str, Dict]:
+        ps = ps or (50, 90, 99, 99.9)
+        return {name: self.histograms[name].summary(ps) for name in sorted(self.histograms)}
+
+    def format_table(self, ps: Iterable[float] = (50, 90, 99, 99.9)) -> str:
+        ps = tuple(ps)
+        head = f"{'名称':<28}{'次数':>8}" + "".join(f"{'p' + str(p):>10}" for p in ps) + f"{'max':>10}"
+        lines = [head]
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            row = f"{name:<28}{h.count:>8}"
+            row += "".join(f"{h.percentile(p) / 1000:>8.2f}ms" for p in ps)
+            row += f"{(h.max or 0) / 1000:>8.2f}ms"
+            lines.append(row)
+        return "\n".join(lines)
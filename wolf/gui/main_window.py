@@ -1,7 +1,6 @@
 import os
 import sys
 import math
-import random
 import threading
 import importlib
 import time
@@ -19,6 +18,8 @@ if proj_wolf_dir not in sys.path:
     sys.path.insert(0, proj_wolf_dir)
 
 from core.werewolf_dealer import WerewolfDealer
+from core.night_controller import NightActionError, NightController
+from core.random_pool import random_pool
 
 ROLE_DISPLAY_NAMES = {
     "werewolf": "狼人",
@@ -528,13 +529,10 @@ class WerewolfApp:
         """根据唤醒音状态与步骤约束判断是否可继续。"""
         if self._wake_in_progress:
             return False
-        st = getattr(self, 'night_action_state', {}) or {}
-        # 独狼必须先看一张中央
-        if st.get('require_wolf_peek') and not st.get('wolf_peeked'):
-            return False
-        # 强盗必须先完成一次交换
-        if st.get('require_robber_swap') and not st.get('robber_swapped'):
-            return False
+        # 独狼须先看一张中央、强盗须先完成交换等约束由夜晚控制器判定
+        ctl = getattr(self, 'night_ctl', None)
+        if ctl is not None and ctl.current_step() is not None:
+            return ctl.can_continue()
         return True
 
     def _refresh_continue_buttons(self):
@@ -845,24 +843,13 @@ class WerewolfApp:
             wolf_cnt = 0
         if wolf_cnt > total_needed:
             wolf_cnt = total_needed
-        # 其余牌数量
-        remaining = total_needed - wolf_cnt
-
-        # 构建可选角色池（不含狼人）
-        candidates = [r['internal'] for r in self.available_roles if r['internal'] != 'werewolf']
-        random.shuffle(candidates)
-
-        picked = []
-        for role in candidates:
-            weight = 2 if role == 'mason' else 1
-            if weight <= remaining:
-                picked.append(role)
-                remaining -= weight
-            if remaining == 0:
-                break
 
-        if remaining != 0:
-            messagebox.showerror("随机失败", "可选角色不足以组成完整牌堆，请调整狼人数量或玩家人数。")
+        # 在可选角色（不含狼人）的所有合法组合中均匀抽取
+        candidates = [r['internal'] for r in self.available_roles]
+        try:
+            picked = random_pool(player_cnt, wolf_cnt, {'candidates': candidates})
+        except ValueError as e:
+            messagebox.showerror("随机失败", str(e))
             return
 
         # 先清空所有 tile 的选中高亮
@@ -1711,7 +1698,7 @@ class WerewolfApp:
             summaries.append("本夜无牌面变化（或仅查看类行动）")
         messagebox.showinfo("夜晚完成", "\n".join(summaries))
 
-    # === 引导式夜晚 ===
+    # === 引导式夜晚（流程由 core.night_controller.NightController 驱动） ===
     def _start_guided_night(self):
         self.night_mode = True
         self.night_started = True
@@ -1727,8 +1714,11 @@ class WerewolfApp:
             self._render_night_controls()
         except Exception:
             pass
-        self.night_steps = self.dealer.get_night_steps()
-        self.night_step_idx = 0
+        self.night_ctl = NightController(self.dealer)
+        self.night_ctl.start()
+        # 回合列表（化身幽灵复制失眠者时会追加回合，与控制器共用同一列表）
+        self.night_steps = self.night_ctl.turns
+        self.night_step_idx = self.night_ctl.index
         self._auto_advancing_role = False
         # 构建夜晚面板
         if hasattr(self, 'night_panel') and self.night_panel and self.night_panel.winfo_exists():
@@ -1753,12 +1743,14 @@ class WerewolfApp:
         except Exception:
             self._run_night_step()
 
-    def _run_night_step(self):
-        # 清理上一轮的动态按钮
+    def _reset_night_buttons(self):
         for w in self.night_buttons_frame.winfo_children():
             w.destroy()
-        self.night_click_mode = None
         self.night_action_state = {}
+
+    def _run_night_step(self):
+        # 清理上一轮的动态按钮
+        self._reset_night_buttons()
         self._auto_advancing_role = False
         # 倒计时 20 秒（重置并取消旧的计时器）
         try:
@@ -1770,7 +1762,10 @@ class WerewolfApp:
         self.night_remaining = 20
         self._night_tick()
 
-        if self.night_step_idx >= len(self.night_steps):
+        ctl = self.night_ctl
+        self.night_step_idx = ctl.index
+        if ctl.finished:
+            self.night_current_role = None
             self.night_text.config(text="夜晚结束。")
             end_btn = ttk.Button(self.night_buttons_frame, text="结束夜晚", command=self._end_guided_night)
             try:
@@ -1795,13 +1790,10 @@ class WerewolfApp:
                 _enable_end()
             return
 
-        step = self.night_steps[self.night_step_idx]
-        role = step.get('role')
-        players = step.get('players', [])
-        in_center = step.get('in_center', False)
-        self.night_current_role = role
+        view = ctl.view()
+        self.night_current_role = view['role']
         # 当前活动角色用于声音播报
-        self.night_active_sound_role = role
+        self.night_active_sound_role = view['role']
 
         # 进入聚焦模式，仅呈现与该角色相关的卡片
         self._enter_focus_mode()
@@ -1810,176 +1802,78 @@ class WerewolfApp:
             self._play_role_wake(self.night_active_sound_role)
         except Exception:
             pass
-
-        if role == 'doppelganger':
-            # 化身幽灵：选择一名其他玩家，查看并复制其角色
-            if not players:
-                if in_center:
-                    self.night_text.config(text="化身幽灵：仅中央牌出现该角色，请保持闭眼等待下一提示。")
-                else:
-                    self.night_text.config(text="化身幽灵：本局没有化身幽灵行动。")
-                self._create_continue_button()
-                return
-            dg_indices = players  # 可能有多个化身幽灵，通常为1
-            selectable_players = [i for i in range(len(self.player_roles)) if i not in dg_indices]
-            note = "（中央牌中也有化身幽灵）" if in_center else ""
-            self.night_text.config(text="化身幽灵：请选择一名其他玩家查看并复制其角色。选择后点击‘确认复制’。" + note)
-            self._focus_show_players(selectable_players, on_click=lambda i: self._dg_select_target(i))
+        self._render_night_action(view)
+
+    def _render_night_action(self, view):
+        """按控制器当前视图渲染提示、可点击卡片与按钮（化身幽灵复制后以新角色再次调用）。"""
+        self.night_text.config(text=view['prompt'])
+        acting = view['acting_role']
+        actor = view['actor']
+        initial = self.dealer.session.get('initial_player_cards') or self.player_roles
+        if actor is None or view['done']:
+            self._create_continue_button()
+            return
+        if acting == 'doppelganger':
+            # 点击即查看并复制（只能选一次），再点击‘确认复制’
+            self._focus_show_players(view['selectable_players'], on_click=self._dg_select_target)
             btn = ttk.Button(self.night_buttons_frame, text="确认复制", command=self._dg_confirm_copy)
             btn.state(["disabled"])  # 未选择前禁用
             self.night_action_state['dg_confirm_btn'] = btn
-            self.night_action_state['dg_player_indices'] = dg_indices
             self.night_action_state['dg_target'] = None
-            self.night_action_state['dg_copied_role'] = None
             btn.pack(side=tk.LEFT)
-        elif role == 'werewolf':
-            note = "（中央牌中也有狼人）" if in_center else ""
-            if not players:
-                if in_center:
-                    self.night_text.config(text="狼人：仅中央牌出现狼人，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="狼人：本局没有狼人行动。")
-                self._create_continue_button()
-                return
-            if len(players) == 1:
-                text = "狼人：你为独狼，可查看中央任意一张牌。点击一张中央牌后仅展示该牌，随后点击继续。" + note
-                self.night_text.config(text=text)
-                # 独狼需要先查看一张中央
-                self.night_action_state['require_wolf_peek'] = True
-                self.night_action_state['wolf_peeked'] = False
-                # 只显示中央三张（点击后标记已查看并刷新继续按钮）
-                self._focus_show_centers([0,1,2], on_click=lambda j: self._werewolf_single_peek(j))
-                self._create_continue_button()
-            else:
-                self.night_text.config(text="狼人：请互相确认身份（提示模式）。" + note)
-                self._create_continue_button()
-        elif role == 'minion':
-            if not players:
-                if in_center:
-                    self.night_text.config(text="爪牙：仅中央牌出现爪牙，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="爪牙：本局没有爪牙行动。")
-                self._create_continue_button()
-                return
-            text = "爪牙：请确认场上有哪些狼人（提示模式）。"
-            if in_center:
-                text += "（中央牌中也有爪牙）"
-            self.night_text.config(text=text)
+        elif acting == 'werewolf' and view['selectable_centers']:
+            # 独狼需要先查看一张中央
+            self._focus_show_centers(view['selectable_centers'], on_click=self._werewolf_single_peek)
             self._create_continue_button()
-        elif role == 'mason':
-            if not players:
-                if in_center:
-                    self.night_text.config(text="守夜人：仅中央牌出现守夜人，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="守夜人：本局没有守夜人行动。")
-                self._create_continue_button()
-                return
-            text = "守夜人：两位守夜人请互相确认身份。"
-            if in_center:
-                text += "（中央牌中也有守夜人）"
-            self.night_text.config(text=text)
+        elif acting in ('werewolf', 'mason'):
+            # 同伴互相确认：展示本回合醒来的全部玩家
+            self._focus_clear()
+            for i in view['actors']:
+                self._focus_add_player_card(i, reveal_role=initial[i])
             self._create_continue_button()
-        elif role == 'seer':
-            if not players:
-                if in_center:
-                    self.night_text.config(text="预言家：仅中央牌出现预言家，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="预言家：本局没有预言家行动。")
-                self._create_continue_button()
-                return
-            # 记录当前预言家玩家索引，用于后续禁止选择自己
-            try:
-                self.night_action_state['seer_players'] = list(players)
-                # 默认禁止所有预言家本人选择自己的牌（通常只有1名）
-                self.night_action_state['seer_forbidden_indices'] = list(players)
-            except Exception:
-                self.night_action_state['seer_players'] = list(players) if players else []
-                self.night_action_state['seer_forbidden_indices'] = list(players) if players else []
-
-            text = "预言家：请选择‘查看两张中央’或‘查看一名玩家’，完成操作后将出现‘继续’按钮（不可查看自己）。"
-            if in_center:
-                text += "（中央牌中也有预言家）"
-            self.night_text.config(text=text)
+        elif acting == 'minion':
+            self._focus_clear()
+            for i in view.get('wolves', []):
+                self._focus_add_player_card(i, reveal_role='werewolf')
+            self._create_continue_button()
+        elif acting == 'seer':
             # 先仅显示两种行动按钮，不显示“继续”；选择后隐藏行动按钮
             btn_center = ttk.Button(self.night_buttons_frame, text="查看两张中央", command=self._seer_mode_center)
             btn_center.pack(side=tk.LEFT)
             btn_player = ttk.Button(self.night_buttons_frame, text="查看一名玩家", command=self._seer_mode_player)
             btn_player.pack(side=tk.LEFT)
             self.night_action_state['seer_btns'] = [btn_center, btn_player]
-        elif role == 'robber':
-            r_idx = players[0] if players else None
-            if r_idx is not None:
-                self.night_action_state['robber'] = r_idx
-                # 强盗必须先完成一次交换
-                self.night_action_state['require_robber_swap'] = True
-                self.night_action_state['robber_swapped'] = False
-                note = "（中央牌中也有强盗）" if in_center else ""
-                self.night_text.config(text=f"强盗：玩家{r_idx+1}，请选择一名其他玩家交换。单击目标后，仅展示其牌面，然后点击继续。" + note)
-                # 展示除强盗本人外的玩家卡
-                other_indices = [i for i in range(len(self.player_roles)) if i != r_idx]
-                self._focus_show_players(other_indices, on_click=lambda i: self._robber_choose_target_and_show(i))
-                self._create_continue_button()
-            else:
-                if in_center:
-                    self.night_text.config(text="强盗：仅中央牌出现强盗，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="强盗：本局没有强盗行动。")
-                self._create_continue_button()
-        elif role == 'troublemaker':
-            t_idx = players[0] if players else None
-            if t_idx is not None:
-                self.night_action_state['tm'] = t_idx
-                self.night_action_state['sel'] = []
-                note = "（中央牌中也有捣蛋鬼）" if in_center else ""
-                self.night_text.config(text=f"捣蛋鬼：玩家{t_idx+1}，请选择两名其他玩家交换。再次点击已选卡可取消选择。点击‘确认交换’生效。" + note)
-                # 不能选择自己
-                other_indices = [i for i in range(len(self.player_roles)) if i != t_idx]
-                self._focus_show_players(other_indices, on_click=lambda i: self._tm_toggle_select(i), allow_self=False)
-                btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._tm_confirm_swap)
-                btn.state(["disabled"])  # 至少两张才启用
-                self.night_action_state['tm_confirm_btn'] = btn
-                btn.pack(side=tk.LEFT)
-            else:
-                if in_center:
-                    self.night_text.config(text="捣蛋鬼：仅中央牌出现捣蛋鬼，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="捣蛋鬼：本局没有捣蛋鬼行动。")
-                self._create_continue_button()
-        elif role == 'drunk':
-            d_idx = players[0] if players else None
-            if d_idx is not None:
-                self.night_action_state['drunk'] = d_idx
-                self.night_action_state['center_sel'] = None
-                note = "（中央牌中也有酒鬼）" if in_center else ""
-                self.night_text.config(text=f"酒鬼：玩家{d_idx+1}，请选择一张中央牌交换（不展示新牌）。选择后点击‘确认交换’。" + note)
-                self._focus_show_centers([0,1,2], on_click=lambda j: self._drunk_select_center(j))
-                btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._drunk_confirm_swap)
-                btn.state(["disabled"])  # 未选择中心牌前禁用
-                self.night_action_state['drunk_confirm_btn'] = btn
-                btn.pack(side=tk.LEFT)
-            else:
-                if in_center:
-                    self.night_text.config(text="酒鬼：仅中央牌出现酒鬼，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="酒鬼：本局没有酒鬼行动。")
-                self._create_continue_button()
-        elif role == 'insomniac':
-            i_idx = players[0] if players else None
-            if i_idx is not None:
-                note = "（中央牌中也有失眠者）" if in_center else ""
-                self.night_text.config(text=f"失眠者：玩家{i_idx+1}，查看你当前的牌，然后点击继续。" + note)
-                # 仅展示该玩家当前牌
-                self._focus_show_single_role(self.player_roles[i_idx], title=f"玩家{i_idx+1}")
-                self._create_continue_button()
-            else:
-                if in_center:
-                    self.night_text.config(text="失眠者：仅中央牌出现失眠者，请保持安静等待下一提示。")
-                else:
-                    self.night_text.config(text="失眠者：本局没有失眠者行动。")
-                self._create_continue_button()
+        elif acting == 'robber':
+            self._focus_show_players(view['selectable_players'], on_click=self._robber_choose_target_and_show)
+            self._create_continue_button()
+        elif acting == 'troublemaker':
+            self._focus_show_players(view['selectable_players'], on_click=self._tm_toggle_select)
+            btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._tm_confirm_swap)
+            btn.state(["disabled"])  # 至少两张才启用
+            self.night_action_state['tm_confirm_btn'] = btn
+            btn.pack(side=tk.LEFT)
+        elif acting == 'drunk':
+            self.night_action_state['center_sel'] = None
+            self._focus_show_centers(view['selectable_centers'], on_click=self._drunk_select_center)
+            btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._drunk_confirm_swap)
+            btn.state(["disabled"])  # 未选择中心牌前禁用
+            self.night_action_state['drunk_confirm_btn'] = btn
+            btn.pack(side=tk.LEFT)
+        elif acting == 'insomniac':
+            # 仅展示该玩家当前牌
+            card = self._night_try(self.night_ctl.view_own)
+            if card:
+                self._focus_show_single_role(card, title=f"玩家{actor+1}")
+            self._create_continue_button()
+        else:
+            self._create_continue_button()
 
-    def _night_set_mode(self, mode: str):
-        self.night_click_mode = mode
+    def _night_try(self, func, *args):
+        """执行一次控制器动作；不允许的操作（重复点击等）忽略并返回 None。"""
+        try:
+            return func(*args)
+        except NightActionError:
+            return None
 
     def _night_tick(self):
         if not getattr(self, 'night_mode', False):
@@ -2016,7 +1910,13 @@ class WerewolfApp:
             self._refresh_board_images()
         except Exception:
             pass
-        self.night_step_idx += 1
+        ctl = self.night_ctl
+        if ctl.current_step() is not None:
+            # 要求的动作未完成（倒计时结束）时放弃该动作
+            if ctl.can_continue():
+                ctl.advance()
+            else:
+                ctl.timeout()
         self._run_night_step()
 
     def _end_guided_night(self):
@@ -2155,36 +2055,21 @@ class WerewolfApp:
         self.focus_widgets.append({'frame': frame, 'label': lbl})
 
     # === 各角色聚焦交互的具体处理 ===
-    def _focus_reveal_center_and_single(self, j):
-        # 展示所点中央牌的正面，随后仅保留该牌
-        role = self.center_roles[j]
-        self._focus_show_single_role(role, title=f"中央{j+1}")
-
     def _werewolf_single_peek(self, j):
         """独狼点击一张中央进行查看，并允许继续。"""
-        try:
-            self._focus_reveal_center_and_single(j)
-        except Exception:
-            pass
-        try:
-            self.night_action_state['wolf_peeked'] = True
-        except Exception:
-            pass
-        try:
-            self._refresh_continue_buttons()
-        except Exception:
-            pass
+        card = self._night_try(self.night_ctl.peek_center, j)
+        if card is None:
+            return
+        self._focus_show_single_role(card, title=f"中央{j+1}")
+        self._refresh_continue_buttons()
 
-    # 化身幽灵：选择并展示目标玩家角色
+    # 化身幽灵：查看并复制目标玩家角色
     def _dg_select_target(self, target_idx):
-        try:
-            role = self.player_roles[target_idx]
-        except Exception:
-            role = None
-        if role:
-            self._focus_show_single_role(role, title=f"玩家{target_idx+1}")
+        role = self._night_try(self.night_ctl.copy, target_idx)
+        if role is None:
+            return
+        self._focus_show_single_role(self.player_roles[target_idx], title=f"玩家{target_idx+1}")
         self.night_action_state['dg_target'] = target_idx
-        self.night_action_state['dg_copied_role'] = role
         # 启用确认按钮
         btn = self.night_action_state.get('dg_confirm_btn')
         if btn:
@@ -2194,218 +2079,63 @@ class WerewolfApp:
                 pass
 
     def _dg_confirm_copy(self):
-        # 确认复制后，若复制角色有夜晚行动，立即执行对应行动模块
+        # 确认复制后，若复制角色有即时行动，立即执行对应行动模块
         try:
             btn = self.night_action_state.get('dg_confirm_btn')
             if btn:
                 btn.state(["disabled"])  # 防止重复点击
         except Exception:
             pass
-        copied = self.night_action_state.get('dg_copied_role')
-        dg_indices = self.night_action_state.get('dg_player_indices') or []
-        if not copied or not dg_indices:
-            # 未选择目标则直接进入下一步
+        if self.night_ctl.view()['done']:
+            # 复制到无即时行动的角色（狼人/爪牙/守夜人随该角色醒来，失眠者在失眠者之后再醒来）
             self._complete_role_and_advance()
             return
-        # 可选：将复制信息写入引擎会话，供后续参考
-        try:
-            s = self.dealer.get_session() or {}
-            s['doppelganger'] = { 'players': dg_indices, 'copied_role': copied }
-            self.dealer.session = s
-        except Exception:
-            pass
         # 先播放化身幽灵闭眼，再进入复制角色的行动
-        self._finish_role_and_then(lambda: self._run_dg_copied_role_action(copied, dg_indices))
+        self._finish_role_and_then(self._run_dg_copied_role_action)
 
-    def _run_dg_copied_role_action(self, copied_role, dg_indices):
-        """化身幽灵在复制后，立即执行所复制角色的夜晚行动（复用对应模块）。"""
-        try:
-            role = WerewolfDealer.normalize_role(copied_role)
-        except Exception:
-            role = str(copied_role) if copied_role else None
-        if not role:
-            self._complete_role_and_advance()
-            return
-        # 进入聚焦模式，渲染与该角色一致的 UI
+    def _run_dg_copied_role_action(self):
+        """化身幽灵在复制后，以所复制角色继续本回合（复用对应模块）。"""
+        view = self.night_ctl.view()
+        self._reset_night_buttons()
         self._enter_focus_mode()
-        # 文本提示
         try:
-            cn = self._get_role_display_name(role)
+            self.night_active_sound_role = view['acting_role']
+            self._play_role_wake(view['acting_role'])
         except Exception:
-            cn = role
-        idx = dg_indices[0] if dg_indices else None
-
-        if role == 'seer':
-            try:
-                self.night_active_sound_role = role
-                self._play_role_wake(role)
-            except Exception:
-                pass
-            # 化身幽灵复制为预言家时，也不可查看自己（此时的自己是 dg_indices[0]）
-            try:
-                self.night_action_state['seer_players'] = list(dg_indices)
-                self.night_action_state['seer_forbidden_indices'] = list(dg_indices)
-            except Exception:
-                self.night_action_state['seer_players'] = list(dg_indices) if dg_indices else []
-                self.night_action_state['seer_forbidden_indices'] = list(dg_indices) if dg_indices else []
-            self.night_text.config(text=f"化身幽灵（{cn}）：请选择‘查看两张中央’或‘查看一名玩家’，完成操作后将出现‘继续’按钮（不可查看自己）。")
-            btn_center = ttk.Button(self.night_buttons_frame, text="查看两张中央", command=self._seer_mode_center)
-            btn_center.pack(side=tk.LEFT)
-            btn_player = ttk.Button(self.night_buttons_frame, text="查看一名玩家", command=self._seer_mode_player)
-            btn_player.pack(side=tk.LEFT)
-            self.night_action_state['seer_btns'] = [btn_center, btn_player]
-            return
-        if role == 'robber' and idx is not None:
-            try:
-                self.night_active_sound_role = role
-                self._play_role_wake(role)
-            except Exception:
-                pass
-            self.night_action_state['robber'] = idx
-            self.night_text.config(text=f"化身幽灵（强盗）：玩家{idx+1}，请选择一名其他玩家交换。单击目标后，仅展示其牌面，然后点击继续。")
-            other_indices = [i for i in range(len(self.player_roles)) if i != idx]
-            self._focus_show_players(other_indices, on_click=lambda i: self._robber_choose_target_and_show(i))
-            self._create_continue_button()
-            return
-        if role == 'troublemaker' and idx is not None:
-            try:
-                self.night_active_sound_role = role
-                self._play_role_wake(role)
-            except Exception:
-                pass
-            self.night_action_state['tm'] = idx
-            self.night_action_state['sel'] = []
-            self.night_text.config(text=f"化身幽灵（捣蛋鬼）：玩家{idx+1}，请选择两名玩家交换。再次点击已选卡可取消选择。点击‘确认交换’生效。")
-            self._focus_show_players(list(range(len(self.player_roles))), on_click=lambda i: self._tm_toggle_select(i), allow_self=True)
-            btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._tm_confirm_swap)
-            btn.state(["disabled"])  # 至少两张才启用
-            self.night_action_state['tm_confirm_btn'] = btn
-            btn.pack(side=tk.LEFT)
-            return
-        if role == 'drunk' and idx is not None:
-            try:
-                self.night_active_sound_role = role
-                self._play_role_wake(role)
-            except Exception:
-                pass
-            self.night_action_state['drunk'] = idx
-            self.night_action_state['center_sel'] = None
-            self.night_text.config(text=f"化身幽灵（酒鬼）：玩家{idx+1}，请选择一张中央牌进行交换（不展示新牌）。选择后点击‘确认交换’。")
-            self._focus_show_centers([0,1,2], on_click=lambda j: self._drunk_select_center(j))
-            btn = ttk.Button(self.night_buttons_frame, text="确认交换", command=self._drunk_confirm_swap)
-            btn.state(["disabled"])  # 未选择中心牌前禁用
-            self.night_action_state['drunk_confirm_btn'] = btn
-            btn.pack(side=tk.LEFT)
-            return
-        if role == 'insomniac' and idx is not None:
-            try:
-                self.night_active_sound_role = role
-                self._play_role_wake(role)
-            except Exception:
-                pass
-            self.night_text.config(text=f"化身幽灵（失眠者）：玩家{idx+1}，查看你当前的牌，然后点击继续。")
-            self._focus_show_single_role(self.player_roles[idx], title=f"玩家{idx+1}")
-            self._create_continue_button()
-            return
-        if role == 'werewolf':
-            # 按需求：化身幽灵复制为狼人时不执行狼人操作，直接进入下一步
-            self._complete_role_and_advance()
-            return
-        if role == 'minion':
-            # 按需求：化身幽灵复制为爪牙时不执行爪牙操作，直接进入下一步
-            self._complete_role_and_advance()
-            return
-        if role == 'mason':
-            # 按需求：化身幽灵复制为守夜人时不执行守夜人操作，直接进入下一步
-            self._complete_role_and_advance()
-            return
-        # 其它无夜晚行动或未覆盖的角色：直接进入下一步
-        self._complete_role_and_advance()
+            pass
+        self._render_night_action(view)
 
     def _robber_choose_target_and_show(self, target_idx):
-        r_idx = self.night_action_state.get('robber')
-        if r_idx is None or target_idx == r_idx:
+        card = self._night_try(self.night_ctl.rob, target_idx)
+        if card is None:
             return
-        # 先记录目标当下牌面用于展示
-        try:
-            role_before = self.player_roles[target_idx]
-        except Exception:
-            role_before = None
-        # 执行交换
-        try:
-            self.dealer.swap_between_players(r_idx, target_idx)
-        except Exception:
-            pass
         self._sync_from_session()
-        # 仅展示目标牌（按需求展示其角色）
-        if role_before:
-            self._focus_show_single_role(role_before, title=f"玩家{target_idx+1}")
-        else:
-            self._focus_clear()
-        # 标记强盗动作已完成，允许继续
-        try:
-            self.night_action_state['robber_swapped'] = True
-            self._refresh_continue_buttons()
-        except Exception:
-            pass
+        # 仅展示换来的新牌
+        self._focus_show_single_role(card, title="你的新牌")
+        self._refresh_continue_buttons()
 
     def _tm_toggle_select(self, idx):
-        sel = self.night_action_state.get('sel', [])
-        # 查找对应focus部件
-        widget = None
-        for w in self.focus_widgets:
-            if w.get('type') == 'player' and w.get('index') == idx:
-                widget = w
-                break
-        if not widget:
+        sel = self._night_try(self.night_ctl.select_for_swap, idx)
+        if sel is None:
             return
-        if idx in sel:
-            sel.remove(idx)
-            try:
-                widget['frame'].config(bg="#222")
-            except Exception:
-                pass
-        else:
-            sel.append(idx)
-            try:
-                widget['frame'].config(bg="#2e7d32")  # 选中高亮
-            except Exception:
-                pass
-        # 最多保留两个
-        if len(sel) > 2:
-            # 移除最早的一个选中并还原其颜色
-            drop = sel.pop(0)
-            for w in self.focus_widgets:
-                if w.get('type') == 'player' and w.get('index') == drop:
-                    try:
-                        w['frame'].config(bg="#222")
-                    except Exception:
-                        pass
-                    break
-        self.night_action_state['sel'] = sel
-        # 更新确认按钮可用性
-        btn = self.night_action_state.get('tm_confirm_btn')
-        if btn:
-            if len(sel) == 2:
-                try:
-                    btn.state(["!disabled"])  # 启用
-                except Exception:
-                    pass
-            else:
+        # 选中高亮（最多两名，超出时控制器丢弃最早的一个）
+        for w in self.focus_widgets:
+            if w.get('type') == 'player':
                 try:
-                    btn.state(["disabled"])  # 禁用
+                    w['frame'].config(bg="#2e7d32" if w.get('index') in sel else "#222")
                 except Exception:
                     pass
+        # 更新确认按钮可用性
+        btn = self.night_action_state.get('tm_confirm_btn')
+        if btn:
+            try:
+                btn.state(["!disabled"] if len(sel) == 2 else ["disabled"])
+            except Exception:
+                pass
 
     def _tm_confirm_swap(self):
-        sel = self.night_action_state.get('sel', [])
-        if len(sel) != 2:
+        if self._night_try(self.night_ctl.swap_players) is None and not self.night_ctl.view()['done']:
             return
-        a, b = sel[0], sel[1]
-        try:
-            self.dealer.swap_between_players(a, b)
-        except Exception:
-            pass
         self._sync_from_session()
         # 交换完成后立即结束该角色回合
         try:
@@ -2422,16 +2152,9 @@ class WerewolfApp:
         for w in self.focus_widgets:
             if w.get('type') == 'center':
                 try:
-                    w['frame'].config(bg="#222")
-                except Exception:
-                    pass
-        for w in self.focus_widgets:
-            if w.get('type') == 'center' and w.get('index') == j:
-                try:
-                    w['frame'].config(bg="#2e7d32")
+                    w['frame'].config(bg="#2e7d32" if w.get('index') == j else "#222")
                 except Exception:
                     pass
-                break
         btn = self.night_action_state.get('drunk_confirm_btn')
         if btn:
             try:
@@ -2440,14 +2163,12 @@ class WerewolfApp:
                 pass
 
     def _drunk_confirm_swap(self):
-        d_idx = self.night_action_state.get('drunk')
         j = self.night_action_state.get('center_sel')
-        if d_idx is None or j is None:
+        if j is None:
+            return
+        self._night_try(self.night_ctl.swap_center, j)
+        if not self.night_ctl.view()['done']:
             return
-        try:
-            self.dealer.swap_with_center(d_idx, j)
-        except Exception:
-            pass
         self._sync_from_session()
         # 交换完成后立即结束该角色回合
         try:
@@ -2459,33 +2180,25 @@ class WerewolfApp:
         self._complete_role_and_advance()
 
     # 预言家子模式
-    def _seer_mode_center(self):
-        # 隐藏行动按钮
+    def _seer_hide_mode_buttons(self):
         for b in self.night_action_state.get('seer_btns', []) or []:
             try:
                 b.destroy()
             except Exception:
                 pass
-        # 移除可能残留的继续按钮
-        btnc = self.night_action_state.get('seer_continue_btn')
-        if btnc:
-            try:
-                btnc.destroy()
-            except Exception:
-                pass
-            self.night_action_state['seer_continue_btn'] = None
+        self.night_action_state['seer_btns'] = []
 
-        self.night_action_state['seer_center_remaining'] = 2
-        self._focus_show_centers([0,1,2], on_click=self._seer_reveal_center)
+    def _seer_mode_center(self):
+        self._seer_hide_mode_buttons()
+        self._focus_show_centers(self.night_ctl.view()['selectable_centers'], on_click=self._seer_reveal_center)
 
     def _seer_reveal_center(self, j):
-        remain = self.night_action_state.get('seer_center_remaining', 0)
-        if remain <= 0:
+        role = self._night_try(self.night_ctl.peek_center, j)
+        if role is None:
             return
         # 将该中心牌翻为正面
         for w in self.focus_widgets:
             if w.get('type') == 'center' and w.get('index') == j:
-                role = self.center_roles[j]
                 front = self._load_role_photo(role, (160, 240), f"focus_center_{j}")
                 if front:
                     w['label'].config(image=front)
@@ -2499,129 +2212,23 @@ class WerewolfApp:
                     except Exception:
                         pass
                 break
-        remain -= 1
-        self.night_action_state['seer_center_remaining'] = remain
-        # 当完成两张中央的查看后，才出现“继续”按钮
-        if remain <= 0 and not self.night_action_state.get('seer_continue_btn'):
-            btnc = self._create_continue_button()
-            self.night_action_state['seer_continue_btn'] = btnc
+        # 完成两张中央的查看后，才出现“继续”按钮
+        if self.night_ctl.view()['done'] and not self.night_action_state.get('seer_continue_btn'):
+            self.night_action_state['seer_continue_btn'] = self._create_continue_button()
 
     def _seer_mode_player(self):
-        # 隐藏行动按钮
-        for b in self.night_action_state.get('seer_btns', []) or []:
-            try:
-                b.destroy()
-            except Exception:
-                pass
-        # 移除可能残留的继续按钮
-        btnc = self.night_action_state.get('seer_continue_btn')
-        if btnc:
-            try:
-                btnc.destroy()
-            except Exception:
-                pass
-            self.night_action_state['seer_continue_btn'] = None
-
-        self.night_action_state['seer_player_done'] = False
-        # 禁止选择自己：从可选列表中排除当前预言家玩家索引
-        forbidden = set(self.night_action_state.get('seer_forbidden_indices') or [])
-        selectable = [i for i in range(len(self.player_roles)) if i not in forbidden]
-        self._focus_show_players(selectable, on_click=self._seer_reveal_player)
+        self._seer_hide_mode_buttons()
+        # 控制器给出的可选玩家已排除预言家本人
+        self._focus_show_players(self.night_ctl.view()['selectable_players'], on_click=self._seer_reveal_player)
 
     def _seer_reveal_player(self, i):
-        # 仅允许查看一次
-        if self.night_action_state.get('seer_player_done'):
+        role = self._night_try(self.night_ctl.peek_player, i)
+        if role is None:
             return
-        role = self.player_roles[i]
         self._focus_show_single_role(role, title=f"玩家{i+1}")
-        self.night_action_state['seer_player_done'] = True
         # 完成查看后，出现“继续”按钮
         if not self.night_action_state.get('seer_continue_btn'):
-            btnc = self._create_continue_button()
-            self.night_action_state['seer_continue_btn'] = btnc
-
-    # --- 夜晚点击处理 ---
-    def _night_handle_player_click(self, idx):
-        mode = getattr(self, 'night_click_mode', None)
-        if mode == 'seer_player':
-            # 临时翻开该玩家牌
-            self._reveal_player_front(idx)
-            # 看完允许继续点其它吗？按规则只看一名玩家，这里看一次即可
-            self.night_click_mode = None
-        elif mode == 'robber_target':
-            r_idx = self.night_action_state.get('robber')
-            if r_idx is None or idx == r_idx:
-                return
-            try:
-                self.dealer.swap_between_players(r_idx, idx)
-            except Exception:
-                return
-            self._refresh_board_images()
-            # 可提示强盗新牌
-            self._reveal_player_front(r_idx)
-            self.night_click_mode = None
-        elif mode == 'troublemaker':
-            sel = self.night_action_state.get('sel', [])
-            if idx not in sel:
-                sel.append(idx)
-            if len(sel) >= 2:
-                a, b = sel[0], sel[1]
-                try:
-                    self.dealer.swap_between_players(a, b)
-                except Exception:
-                    pass
-                self._refresh_board_images()
-                self.night_click_mode = None
-            self.night_action_state['sel'] = sel
-
-    def _night_handle_center_click(self, idx):
-        mode = getattr(self, 'night_click_mode', None)
-        if mode == 'werewolf_center':
-            # 独狼看一张中央
-            self._reveal_center_front(idx)
-            self.night_action_state['peeked'] = True
-            self.night_click_mode = None
-        elif mode == 'seer_center':
-            remain = self.night_action_state.get('seer_center_remaining', 0)
-            if remain <= 0:
-                return
-            self._reveal_center_front(idx)
-            remain -= 1
-            self.night_action_state['seer_center_remaining'] = remain
-            if remain <= 0:
-                self.night_click_mode = None
-        elif mode == 'drunk_center':
-            d_idx = self.night_action_state.get('drunk')
-            if d_idx is None:
-                return
-            try:
-                self.dealer.swap_with_center(d_idx, idx)
-            except Exception:
-                return
-            self._sync_from_session()
-            self._refresh_board_images()
-            self.night_click_mode = None
-
-    # 辅助：直接把某玩家牌面显示为正面
-    def _reveal_player_front(self, idx):
-        if not (0 <= idx < len(self.board_player_widgets)):
-            return
-        widget = self.board_player_widgets[idx]
-        if not widget.get('front'):
-            widget['front'] = self._load_role_photo(self.player_roles[idx], (140, 210), f"board_player_{idx}")
-        if widget['front']:
-            widget['label'].config(image=widget['front'])
-            widget['revealed'] = True
-
-    def _reveal_center_front(self, idx):
-        if not (0 <= idx < len(self.center_widgets)):
-            return
-        widget = self.center_widgets[idx]
-        if not widget.get('front'):
-            widget['front'] = self._load_role_photo(self.center_roles[idx], (160, 240), f"center_{idx}")
-        if widget['front']:
-            widget['label'].config(image=widget['front'])
-            widget['revealed'] = True
+            self.night_action_state['seer_continue_btn'] = self._create_continue_button()
 
     def export(self):
         if not self._last_result:
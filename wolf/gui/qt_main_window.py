@@ -5,6 +5,11 @@ from typing import List, Dict
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from core.werewolf_dealer import WerewolfDealer
+from gui.qt_night import QtNightView
+from gui.qt_pixmaps import BackgroundScaler, PixmapService, size_bucket
+
+# 角色卡图目标尺寸
+TILE_IMAGE_SIZE = (140, 210)
 
 ROLE_DISPLAY_NAMES = {
     "werewolf": "狼人",
@@ -72,12 +77,13 @@ class RoleTile(QtWidgets.QFrame):
         self.badge.setStyleSheet("background:#22C55E;color:white;font-weight:bold;padding:2px 6px;border-radius:4px;")
         self.badge.hide()
 
-        # 加载图片
+        # 加载图片（记录当前档位，尺寸档与选中态未变时不重复设置）
+        self._pix_key = None
         self._set_pixmap_for(internal)
 
     def resizeEvent(self, e: QtGui.QResizeEvent) -> None:
         super().resizeEvent(e)
-        # 重新缩放图片以匹配更清晰尺寸
+        # 高分屏切换等导致的缩放比变化才会真正换图
         self._set_pixmap_for(self.internal)
 
     def mousePressEvent(self, e: QtGui.QMouseEvent) -> None:
@@ -99,17 +105,19 @@ class RoleTile(QtWidgets.QFrame):
             self.setFrameShadow(QtWidgets.QFrame.Raised)
             self.setLineWidth(2)
             self.badge.hide()
+        self._set_pixmap_for(self.internal)
         self.toggled.emit(self.internal, self.selected)
 
     def _set_pixmap_for(self, internal: str):
-        path = find_image_file(internal) or find_image_file('background')
-        if not path:
+        ratio = self.devicePixelRatioF()
+        key = (internal, size_bucket(*TILE_IMAGE_SIZE), self.selected, ratio)
+        if key == self._pix_key:
+            return
+        self._pix_key = key
+        pm = PixmapService.instance().pixmap(internal, *TILE_IMAGE_SIZE, selected=self.selected, device_ratio=ratio)
+        if pm is None:
             self.img_lbl.clear()
             return
-        pm = QtGui.QPixmap(path)
-        # 目标尺寸更清晰
-        target = QtCore.QSize(140, 210)
-        pm = pm.scaled(target, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
         self.img_lbl.setPixmap(pm)
 
 
@@ -151,12 +159,9 @@ class WerewolfTile(QtWidgets.QFrame):
         self.spin.setValue(v)
 
     def _set_pixmap(self):
-        path = find_image_file('werewolf') or find_image_file('background')
-        if not path:
+        pm = PixmapService.instance().pixmap('werewolf', *TILE_IMAGE_SIZE, device_ratio=self.devicePixelRatioF())
+        if pm is None:
             self.img_lbl.clear(); return
-        pm = QtGui.QPixmap(path)
-        target = QtCore.QSize(140, 210)
-        pm = pm.scaled(target, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
         self.img_lbl.setPixmap(pm)
 
     def value(self) -> int:
@@ -172,7 +177,7 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
         # 背景图层
         self._bg_lbl = QtWidgets.QLabel(self)
         self._bg_lbl.setScaledContents(True)
-        self._bg_pix: QtGui.QPixmap | None = None
+        self._bg_scaler: BackgroundScaler | None = None
         self._load_background()
 
         central = QtWidgets.QWidget(self)
@@ -233,13 +238,8 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
         self.summary_lbl = QtWidgets.QLabel("已选择 0 张")
         sel_lay.addWidget(self.summary_lbl)
 
-        # 结果展示占位
-        self.result_area = QtWidgets.QTextEdit()
-        self.result_area.setReadOnly(True)
-        self.result_area.setVisible(False)
-        self.main_lay.addWidget(self.result_area)
-
         self._last_result: tuple[list[str], list[str]] | None = None
+        self._night_view: QtNightView | None = None
         self._update_summary()
 
     # 背景
@@ -251,29 +251,30 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
         for name in ("background.jpg", "background.png"):
             p = os.path.join(roles_dir(), name)
             if os.path.exists(p):
-                self._bg_pix = QtGui.QPixmap(p)
+                image = QtGui.QImage(p)
+                if not image.isNull():
+                    # 缩放在线程池中进行，结果经信号回到 GUI 线程
+                    self._bg_scaler = BackgroundScaler(image, self)
+                    self._bg_scaler.ready.connect(self._on_background_scaled)
                 break
         self._place_background()
 
     def _place_background(self):
-        if not self._bg_pix:
+        if not self._bg_scaler:
             self._bg_lbl.hide(); return
         self._bg_lbl.show()
         self._bg_lbl.lower()
         self._bg_lbl.setGeometry(self.rect())
-        # cover 效果
-        w, h = self.width(), self.height()
-        ow, oh = self._bg_pix.width(), self._bg_pix.height()
-        if ow == 0 or oh == 0:
-            return
-        scale = max(w / ow, h / oh)
-        nw, nh = int(ow * scale), int(oh * scale)
-        scaled = self._bg_pix.scaled(nw, nh, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-        # 居中裁剪
-        x = max(0, (scaled.width() - w) // 2)
-        y = max(0, (scaled.height() - h) // 2)
-        cropped = scaled.copy(x, y, min(w, scaled.width()), min(h, scaled.height()))
-        self._bg_lbl.setPixmap(cropped)
+        # 新尺寸的图就绪前，沿用旧图由 QLabel 拉伸显示
+        self._bg_scaler.request(self.width(), self.height())
+
+    def _on_background_scaled(self, image: QtGui.QImage):
+        self._bg_lbl.setPixmap(QtGui.QPixmap.fromImage(image))
+
+    def closeEvent(self, e: QtGui.QCloseEvent) -> None:
+        if self._bg_scaler:
+            self._bg_scaler.shutdown()
+        super().closeEvent(e)
 
     # 角色加载与网格
     def _load_available_roles(self):
@@ -372,6 +373,8 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
             "player_count": count,
             "player_cards": player_roles.copy(),
             "center_cards": center.copy(),
+            "initial_player_cards": player_roles.copy(),
+            "initial_center_cards": center.copy(),
             "viewed": [False] * count,
             "turn_index": 0,
             "action_phase": True,
@@ -379,9 +382,13 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
         }
         self._last_result = (player_roles, center)
         self.export_btn.setEnabled(True)
-        self._show_result_text(player_roles, center)
+        self._show_night_view()
 
     def start_game(self):
+        if self._night_view is not None:
+            # 夜晚进行中：按钮为“重新开始”，回到角色选择
+            self._close_night_view()
+            return
         sel = self._compute_selection()
         expected = self._expected_card_count()
         if len(sel) != expected:
@@ -392,17 +399,25 @@ class QtWerewolfApp(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "开始失败", str(e)); return
         self._last_result = (res['player_cards'], res['center_cards'])
         self.export_btn.setEnabled(True)
-        self._show_result_text(res['player_cards'], res['center_cards'])
-
-    def _show_result_text(self, player_roles: List[str], center: List[str]):
-        # 简单文本展示，后续可以迁移顺序查看/桌面展示到 Qt
-        self.result_area.setVisible(True)
-        lines = []
-        for i, r in enumerate(player_roles, start=1):
-            lines.append(f"玩家{i}: {r}")
-        for j, r in enumerate(center, start=1):
-            lines.append(f"中央{j}: {r}")
-        self.result_area.setPlainText("\n".join(lines))
+        self._show_night_view()
+
+    def _show_night_view(self):
+        """隐藏选择区，进入引导式夜晚（流程由 core.night_controller 驱动）。"""
+        self._close_night_view(show_selection=False)
+        self.selection_group.setVisible(False)
+        self._night_view = QtNightView(self.dealer, self)
+        self.main_lay.addWidget(self._night_view, 1)
+        self.start_btn.setText("重新开始")
+
+    def _close_night_view(self, show_selection: bool = True):
+        if self._night_view is not None:
+            self._night_view.stop()
+            self.main_lay.removeWidget(self._night_view)
+            self._night_view.deleteLater()
+            self._night_view = None
+        if show_selection:
+            self.selection_group.setVisible(True)
+            self.start_btn.setText("开始局")
 
     def export_result(self):
         if not self._last_result:
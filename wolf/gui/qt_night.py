@@ -0,0 +1,279 @@
+"""Qt 版引导式夜晚：在 core.night_controller.NightController 之上的薄界面层。
+
+夜晚开始前先逐一查看身份：设备在玩家间传递，每次点击只翻开一名玩家的初始牌，再次点击盖回并轮到下一位。
+夜晚中界面只做三件事：渲染 controller.view()、把卡片点击翻译成对应动作、倒计时结束时调用 timeout()。
+夜晚结束后点击一名玩家即处决并结算。
+"""
+from typing import List, Optional
+
+from PySide6 import QtCore, QtWidgets
+
+from core.night_controller import NightActionError, NightController, ROLE_NAMES_CN
+from gui.qt_pixmaps import PixmapService
+
+STEP_SECONDS = 20
+PLAYER_CARD_SIZE = (100, 150)
+CENTER_CARD_SIZE = (110, 165)
+PLAYER_COLUMNS = 6
+
+
+class CardButton(QtWidgets.QToolButton):
+    """一张牌：显示卡背或正面，可点击时高亮。"""
+
+    def __init__(self, title: str, size, parent=None):
+        super().__init__(parent)
+        self._size = size
+        self.setToolButtonStyle(QtCore.Qt.ToolButtonTextUnderIcon)
+        self.setIconSize(QtCore.QSize(*size))
+        self.setAutoRaise(True)
+        self.setText(title)
+        self._face: Optional[str] = None
+        self._selected = False
+        self.show_back()
+
+    def _apply(self, role: str):
+        pm = PixmapService.instance().pixmap(role, *self._size, selected=self._selected,
+                                             device_ratio=self.devicePixelRatioF())
+        if pm is not None:
+            self.setIcon(pm)
+
+    def show_back(self):
+        self._face = None
+        self._apply('background')
+
+    def show_face(self, role: str):
+        self._face = role
+        self._apply(role)
+
+    def set_selected(self, selected: bool):
+        if selected != self._selected:
+            self._selected = selected
+            self._apply(self._face or 'background')
+
+
+class QtNightView(QtWidgets.QWidget):
+    finished = QtCore.Signal(dict)  # 结算结果
+
+    def __init__(self, dealer, parent=None):
+        super().__init__(parent)
+        self.dealer = dealer
+        self.controller = NightController(dealer)
+        self._voted = False
+        # 查看身份阶段：当前轮到的座位，以及其牌面是否正在显示
+        self._reveal_seat = 0
+        self._reveal_shown = False
+
+        lay = QtWidgets.QVBoxLayout(self)
+        head = QtWidgets.QHBoxLayout()
+        self.prompt_lbl = QtWidgets.QLabel("")
+        self.prompt_lbl.setWordWrap(True)
+        self.countdown_lbl = QtWidgets.QLabel("")
+        head.addWidget(self.prompt_lbl, 1)
+        head.addWidget(self.countdown_lbl)
+        lay.addLayout(head)
+
+        grid_box = QtWidgets.QWidget()
+        self.player_grid = QtWidgets.QGridLayout(grid_box)
+        lay.addWidget(grid_box)
+        center_box = QtWidgets.QWidget()
+        self.center_row = QtWidgets.QHBoxLayout(center_box)
+        lay.addWidget(center_box)
+
+        self.player_cards: List[CardButton] = []
+        for i in range(self.controller.player_count):
+            btn = CardButton(f"玩家{i + 1}", PLAYER_CARD_SIZE)
+            btn.clicked.connect(lambda _=False, i=i: self._on_player_clicked(i))
+            self.player_grid.addWidget(btn, i // PLAYER_COLUMNS, i % PLAYER_COLUMNS)
+            self.player_cards.append(btn)
+        self.center_cards: List[CardButton] = []
+        for j in range(len(dealer.session["center_cards"])):
+            btn = CardButton(f"中央{j + 1}", CENTER_CARD_SIZE)
+            btn.clicked.connect(lambda _=False, j=j: self._on_center_clicked(j))
+            self.center_row.addWidget(btn)
+            self.center_cards.append(btn)
+
+        buttons = QtWidgets.QHBoxLayout()
+        self.reveal_btn = QtWidgets.QPushButton("查看身份")
+        self.reveal_btn.clicked.connect(self._reveal_next)
+        self.start_btn = QtWidgets.QPushButton("开始夜晚")
+        self.start_btn.clicked.connect(self._start)
+        self.start_btn.hide()
+        self.swap_btn = QtWidgets.QPushButton("确认交换")
+        self.swap_btn.clicked.connect(self._confirm_swap)
+        self.continue_btn = QtWidgets.QPushButton("继续")
+        self.continue_btn.clicked.connect(self._continue)
+        buttons.addWidget(self.reveal_btn)
+        buttons.addWidget(self.start_btn)
+        buttons.addStretch(1)
+        buttons.addWidget(self.swap_btn)
+        buttons.addWidget(self.continue_btn)
+        lay.addLayout(buttons)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._tick)
+        self._remaining = STEP_SECONDS
+        self._update_reveal_prompt()
+        self._render()
+
+    # --- 查看身份 ---
+    def _update_reveal_prompt(self):
+        seat = self._reveal_seat
+        if seat >= self.controller.player_count:
+            self.prompt_lbl.setText("所有玩家已确认身份，点击“开始夜晚”。")
+        elif self._reveal_shown:
+            card = self.dealer.session["initial_player_cards"][seat]
+            self.prompt_lbl.setText(f"玩家{seat + 1}：你的身份是{ROLE_NAMES_CN.get(card, card)}。记住后点击“盖牌并传给下一位”。")
+        else:
+            self.prompt_lbl.setText(f"请把设备交给玩家{seat + 1}，由其本人点击“查看身份”。")
+
+    def _reveal_next(self):
+        """一次点击翻开当前玩家的牌，下一次点击盖回并轮到下一位；全部看完后才能开始夜晚。"""
+        if self._reveal_shown:
+            self._reveal_shown = False
+            self._reveal_seat += 1
+        else:
+            self._reveal_shown = True
+        done = self._reveal_seat >= self.controller.player_count
+        self.reveal_btn.setText("盖牌并传给下一位" if self._reveal_shown else "查看身份")
+        self.reveal_btn.setVisible(not done)
+        self.start_btn.setVisible(done)
+        self._update_reveal_prompt()
+        self._render()
+
+    # --- 流程 ---
+    def _start(self):
+        self.start_btn.hide()
+        self.controller.start()
+        self._enter_step()
+
+    def _enter_step(self):
+        view = self.controller.view()
+        if not view["finished"] and view.get("acting_role") == "insomniac" and view.get("actor") is not None \
+                and not view.get("done"):
+            # 失眠者自动查看自己的牌
+            self.controller.view_own()
+        self._remaining = STEP_SECONDS
+        if view["finished"]:
+            self._timer.stop()
+        else:
+            self._timer.start()
+        self._render()
+
+    def _tick(self):
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self.controller.timeout()
+            self._enter_step()
+            return
+        self.countdown_lbl.setText(str(self._remaining))
+
+    def _continue(self):
+        try:
+            self.controller.advance()
+        except NightActionError as e:
+            self.prompt_lbl.setText(str(e))
+            return
+        self._enter_step()
+
+    def _act(self, func, *args):
+        try:
+            func(*args)
+        except NightActionError as e:
+            self.prompt_lbl.setText(str(e))
+            return
+        self._render()
+
+    # --- 点击 ---
+    def _on_player_clicked(self, i: int):
+        ctl = self.controller
+        if ctl.finished:
+            self._vote(i)
+            return
+        view = ctl.view()
+        if view.get("finished"):
+            return
+        if i not in view.get("selectable_players", []) and i not in view.get("swap_selection", []):
+            return
+        acting = view["acting_role"]
+        if acting == "doppelganger":
+            self._act(ctl.copy, i)
+        elif acting == "seer":
+            self._act(ctl.peek_player, i)
+        elif acting == "robber":
+            self._act(ctl.rob, i)
+        elif acting == "troublemaker":
+            self._act(ctl.select_for_swap, i)
+
+    def _on_center_clicked(self, j: int):
+        view = self.controller.view()
+        if view.get("finished") or j not in view.get("selectable_centers", []):
+            return
+        acting = view["acting_role"]
+        if acting in ("werewolf", "seer"):
+            self._act(self.controller.peek_center, j)
+        elif acting == "drunk":
+            self._act(self.controller.swap_center, j)
+
+    def _confirm_swap(self):
+        self._act(self.controller.swap_players)
+
+    def _vote(self, i: int):
+        if self._voted:
+            return
+        self._voted = True
+        result = self.dealer.evaluate_victory([i])
+        card = self.dealer.session["player_cards"][i]
+        self.player_cards[i].show_face(card)
+        winners = [name for key, name in (("good", "好人阵营"), ("wolf", "狼人阵营"), ("tanner", "皮匠")) if result.get(key)]
+        self.prompt_lbl.setText(f"处决 玩家{i + 1}（{ROLE_NAMES_CN.get(card, card)}）。本局结果：{'、'.join(winners)}胜利。")
+        self.finished.emit(result)
+
+    # --- 渲染 ---
+    def _render(self):
+        ctl = self.controller
+        view = ctl.view()
+        started = ctl.index >= 0
+        revealed = {(k, idx): card for k, idx, card in view.get("revealed", [])}
+        if not started and self._reveal_shown:
+            seat = self._reveal_seat
+            revealed[("player", seat)] = self.dealer.session["initial_player_cards"][seat]
+        sel_players = set(view.get("selectable_players", []))
+        sel_centers = set(view.get("selectable_centers", []))
+        tm_sel = set(view.get("swap_selection", []))
+        for i, btn in enumerate(self.player_cards):
+            if ("player", i) in revealed:
+                btn.show_face(revealed[("player", i)])
+            elif not self._voted:
+                btn.show_back()
+            btn.set_selected(i in tm_sel)
+            btn.setEnabled(i in sel_players or i in tm_sel or (view.get("finished") and not self._voted))
+        for j, btn in enumerate(self.center_cards):
+            if ("center", j) in revealed:
+                btn.show_face(revealed[("center", j)])
+            else:
+                btn.show_back()
+            btn.setEnabled(j in sel_centers)
+        if view.get("finished"):
+            self.countdown_lbl.setText("")
+            self.swap_btn.hide()
+            self.continue_btn.hide()
+            if not self._voted:
+                self.prompt_lbl.setText("夜晚结束：点击一名玩家处决并判定胜负。")
+            return
+        if not started:
+            self.swap_btn.hide()
+            self.continue_btn.hide()
+            for btn in self.player_cards + self.center_cards:
+                btn.setEnabled(False)
+            return
+        self.prompt_lbl.setText(view["prompt"])
+        self.countdown_lbl.setText(str(self._remaining))
+        is_tm = view["acting_role"] == "troublemaker" and view["actor"] is not None and not view["can_continue"]
+        self.swap_btn.setVisible(is_tm)
+        self.swap_btn.setEnabled(is_tm and len(tm_sel) == 2)
+        self.continue_btn.show()
+        self.continue_btn.setEnabled(view["can_continue"])
+
+    def stop(self):
+        self._timer.stop()
@@ -0,0 +1,179 @@
+"""Qt 版角色卡图片服务：按 (角色, 尺寸档, 选中状态) 缓存预缩放好的 QPixmap。
+
+原图每个角色只解码一次；缩放结果放入 QPixmapCache，尺寸按 SIZE_STEP 取整到档位，
+窗口拖动引起的细微尺寸变化不会触发重新缩放，多个 tile 共享同一份像素数据。
+背景图较大，缩放交给 BackgroundScaler 在线程池中完成，不阻塞事件循环。
+"""
+import os
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+# 尺寸档位步长（像素）
+SIZE_STEP = 20
+# QPixmapCache 上限（KB）；默认 10MB 放不下高分屏下整套卡图
+CACHE_LIMIT_KB = 64 * 1024
+SELECTED_BORDER = QtGui.QColor("#22C55E")
+
+
+def size_bucket(width: int, height: int) -> Tuple[int, int]:
+    """向下取整到档位，且不小于一个档位。"""
+    return (max(SIZE_STEP, width // SIZE_STEP * SIZE_STEP),
+            max(SIZE_STEP, height // SIZE_STEP * SIZE_STEP))
+
+
+def _cache_find(key: str) -> Optional[QtGui.QPixmap]:
+    pm = QtGui.QPixmapCache.find(key)
+    if pm is None or pm.isNull():
+        return None
+    return pm
+
+
+class PixmapService:
+    _instance: Optional["PixmapService"] = None
+
+    @classmethod
+    def instance(cls) -> "PixmapService":
+        if cls._instance is None:
+            from gui.qt_main_window import find_image_file
+            cls._instance = cls(find_image_file)
+        return cls._instance
+
+    def __init__(self, resolve_path: Callable[[str], Optional[str]]):
+        self._resolve_path = resolve_path
+        if QtGui.QPixmapCache.cacheLimit() < CACHE_LIMIT_KB:
+            QtGui.QPixmapCache.setCacheLimit(CACHE_LIMIT_KB)
+
+    def _source(self, role: str) -> Optional[QtGui.QPixmap]:
+        key = f"wolf:src:{role}"
+        pm = _cache_find(key)
+        if pm is not None:
+            return pm
+        path = self._resolve_path(role) or self._resolve_path('background')
+        if not path or not os.path.exists(path):
+            return None
+        pm = QtGui.QPixmap(path)
+        if pm.isNull():
+            return None
+        QtGui.QPixmapCache.insert(key, pm)
+        return pm
+
+    def pixmap(self, role: str, width: int, height: int, selected: bool = False,
+               device_ratio: float = 1.0) -> Optional[QtGui.QPixmap]:
+        """返回按档位预缩放（保持比例、平滑缩放）的卡图；无图片时返回 None。"""
+        bw, bh = size_bucket(width, height)
+        ratio = max(1.0, float(device_ratio))
+        key = f"wolf:tile:{role}:{bw}x{bh}@{ratio:g}:{int(bool(selected))}"
+        pm = _cache_find(key)
+        if pm is not None:
+            return pm
+        src = self._source(role)
+        if src is None:
+            return None
+        target = QtCore.QSize(int(bw * ratio), int(bh * ratio))
+        pm = src.scaled(target, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        if selected:
+            # 选中态描边烘焙进像素，切换选中时无需再绘制
+            pm = QtGui.QPixmap(pm)
+            painter = QtGui.QPainter(pm)
+            pen = QtGui.QPen(SELECTED_BORDER)
+            pen.setWidthF(3 * ratio)
+            painter.setPen(pen)
+            painter.drawRect(pm.rect().adjusted(1, 1, -2, -2))
+            painter.end()
+        pm.setDevicePixelRatio(ratio)
+        QtGui.QPixmapCache.insert(key, pm)
+        return pm
+
+
+class _ScaleSignals(QtCore.QObject):
+    finished = QtCore.Signal(int, QtGui.QImage)
+
+
+class _BackgroundScaleJob(QtCore.QRunnable):
+    """在线程池中把背景按 cover 方式缩放并居中裁剪（只用 QImage，可在非 GUI 线程使用）。"""
+
+    def __init__(self, scaler: "BackgroundScaler", generation: int, image: QtGui.QImage, width: int, height: int):
+        super().__init__()
+        # 生命周期由 BackgroundScaler 管理：结束后 C++ 对象仍有效，tryTake 不会碰到已删除的任务
+        self.setAutoDelete(False)
+        self._scaler = scaler
+        self._generation = generation
+        self._image = image
+        self._size = (width, height)
+        self._signals = scaler._signals
+
+    def run(self):
+        # 无论是否作废都发出 finished（作废时为空图），GUI 线程据此释放任务
+        self._signals.finished.emit(self._generation, self._scale())
+
+    def _scale(self) -> QtGui.QImage:
+        # 已有更新的请求则直接放弃
+        if self._generation != self._scaler.generation:
+            return QtGui.QImage()
+        w, h = self._size
+        ow, oh = self._image.width(), self._image.height()
+        if ow == 0 or oh == 0:
+            return QtGui.QImage()
+        scale = max(w / ow, h / oh)
+        nw, nh = max(1, int(ow * scale)), max(1, int(oh * scale))
+        scaled = self._image.scaled(nw, nh, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        if self._generation != self._scaler.generation:
+            return QtGui.QImage()
+        x = max(0, (scaled.width() - w) // 2)
+        y = max(0, (scaled.height() - h) // 2)
+        return scaled.copy(x, y, min(w, scaled.width()), min(h, scaled.height()))
+
+
+class BackgroundScaler(QtCore.QObject):
+    """背景缩放服务：请求在单线程池中执行，只保留最新请求，结果通过 ready 信号回到 GUI 线程。"""
+
+    ready = QtCore.Signal(QtGui.QImage)
+
+    def __init__(self, image: QtGui.QImage, parent=None):
+        super().__init__(parent)
+        self._image = image
+        self.generation = 0
+        self._pending: Optional[_BackgroundScaleJob] = None
+        # 已提交且尚未结束的任务（generation -> job），保持 Python 引用直到 finished 回到 GUI 线程
+        self._jobs: Dict[int, _BackgroundScaleJob] = {}
+        self._last_size: Optional[Tuple[int, int]] = None
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        # 信号对象属于 GUI 线程，工作线程 emit 后以队列方式回到主线程
+        self._signals = _ScaleSignals(self)
+        self._signals.finished.connect(self._on_finished)
+
+    def request(self, width: int, height: int):
+        if width <= 0 or height <= 0 or self._image.isNull():
+            return
+        if self._last_size == (width, height):
+            return
+        self._last_size = (width, height)
+        self.generation += 1
+        # 尚未开始的旧任务直接从队列取出；正在执行的由 generation 判定作废
+        self._take_pending()
+        job = _BackgroundScaleJob(self, self.generation, self._image, width, height)
+        self._pending = job
+        self._jobs[self.generation] = job
+        self._pool.start(job)
+
+    def _take_pending(self):
+        job, self._pending = self._pending, None
+        if job is not None and self._pool.tryTake(job):
+            # 从未运行，不会再有 finished
+            self._jobs.pop(job._generation, None)
+
+    def _on_finished(self, generation: int, image: QtGui.QImage):
+        job = self._jobs.pop(generation, None)
+        if self._pending is job:
+            self._pending = None
+        if generation != self.generation or image.isNull():
+            return
+        self.ready.emit(image)
+
+    def shutdown(self):
+        self.generation += 1
+        self._take_pending()
+        self._pool.waitForDone()
+        self._jobs.clear()
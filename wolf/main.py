@@ -21,9 +21,24 @@ def _run_qt():
 
 
 def _run_tk():
+    import os
     import tkinter as tk
     from gui.main_window import WerewolfApp
     root = tk.Tk()
+    # 设置 WOLF_TRACE=<路径> 时开启耗时统计，退出后写出 Chrome trace 并打印摘要
+    trace_path = os.environ.get('WOLF_TRACE')
+    if trace_path:
+        from gui.instrumentation import Instrumentation
+        inst = Instrumentation()
+        app = inst.measure('WerewolfApp.__init__', WerewolfApp, root)
+        inst.install(app)
+        try:
+            root.mainloop()
+        finally:
+            inst.uninstall()
+            inst.dump_trace(trace_path)
+            print(inst.format_report())
+        return
     app = WerewolfApp(root)
     root.mainloop()
 
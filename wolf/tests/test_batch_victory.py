@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import numpy as np
+
+from core.batch_victory import encode_cards, encode_executed, evaluate_victory_batch
+from core.simulation import play_game
+from core.werewolf_dealer import WerewolfDealer
+
+POOLS = [
+    ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"],
+    ["doppelganger", "werewolf", "minion", "tanner", "robber", "troublemaker", "drunk", "villager", "seer"],
+    ["minion", "tanner", "seer", "robber", "villager", "villager", "drunk"],
+]
+HUNTER_POOL = ["hunter", "hunter", "werewolf", "tanner", "villager", "doppelganger", "seer", "robber", "drunk"]
+
+
+class TestBatchVictory(unittest.TestCase):
+    def test_matches_scalar(self):
+        dealer = WerewolfDealer()
+        rng = random.Random(0)
+        finals, executed, ties, copied, expected = [], [], [], [], []
+        for i in range(600):
+            game = play_game(POOLS[i % len(POOLS)], i, policy="tie" if i % 7 == 0 else "random", dealer=dealer)
+            # 额外构造多人处决，覆盖狼人与皮匠同时被处决的情况
+            ex = game["executed"]
+            if not game["is_tie"] and i % 3 == 0:
+                ex = sorted({ex[0], rng.randrange(len(game["players"]))})
+            dealer.session["player_cards"] = game["final_players"]
+            expected.append(dealer.evaluate_victory(ex, is_tie=game["is_tie"]))
+            finals.append(game["final_players"])
+            executed.append(ex)
+            ties.append(game["is_tie"])
+            dg = dealer.session.get("doppelganger")
+            copied.append(WerewolfDealer.role_id(dg["copied_role"]) if dg else -1)
+        res = evaluate_victory_batch(encode_cards(finals), encode_executed(executed), ties, copied)
+        for key in ("good", "wolf", "tanner"):
+            self.assertEqual(res[key].tolist(), [e[key] for e in expected], key)
+
+    def test_padding_and_validation(self):
+        cards = encode_cards([["werewolf", "villager", "tanner"], ["villager", "villager", "villager", "minion"]])
+        self.assertEqual(cards.shape, (2, 4))
+        self.assertEqual(cards[0, 3], -1)
+        res = evaluate_victory_batch(cards, np.array([[3], [9]]), [False, False])
+        # 空座位/越界座位视为未处决：狼人阵营胜
+        self.assertEqual(res["wolf"].tolist(), [True, True])
+        with self.assertRaises(ValueError):
+            evaluate_victory_batch(cards, [[0], [1]], [False])
+
+
+    def test_hunter_chain(self):
+        roles = ["hunter", "hunter", "werewolf", "villager"]
+        votes = [1, 2, 0, 0]
+        # 0 号猎人被处决 -> 带走 1 号猎人 -> 带走 2 号狼人
+        self.assertEqual(WerewolfDealer.resolve_executions(roles, [0], votes), [0, 1, 2])
+        self.assertEqual(WerewolfDealer.resolve_executions(roles, [0]), [0])
+        cards = encode_cards([roles, roles])
+        res = evaluate_victory_batch(cards, [[0], [0]], [False, False], votes=[votes, [-1, 2, 0, 0]])
+        self.assertEqual(res["good"].tolist(), [True, False])
+        self.assertEqual(res["wolf"].tolist(), [False, True])
+
+    def test_hunter_pool_matches_scalar(self):
+        dealer = WerewolfDealer()
+        finals, executed, ties, votes, copied, expected = [], [], [], [], [], []
+        for seed in range(400):
+            game = play_game(HUNTER_POOL, seed, policy="plurality", dealer=dealer)
+            expected.append(game["result"])
+            finals.append(game["final_players"])
+            ties.append(game["is_tie"])
+            votes.append(game["votes"])
+            dg = dealer.session.get("doppelganger")
+            copied.append(WerewolfDealer.role_id(dg["copied_role"]) if dg else -1)
+            # 只取得票最多的座位，连锁交给批量结算
+            counts = np.bincount(game["votes"], minlength=len(game["votes"]))
+            executed.append([] if game["is_tie"] else np.flatnonzero(counts == counts.max()).tolist())
+        res = evaluate_victory_batch(encode_cards(finals), encode_executed(executed), ties, copied,
+                                     votes=encode_executed(votes))
+        for key in ("good", "wolf", "tanner"):
+            self.assertEqual(res[key].tolist(), [e[key] for e in expected], key)
+
+if __name__ == "__main__":
+    unittest.main()
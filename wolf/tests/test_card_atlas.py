@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from tools.build_card_atlas import build_atlas, collect_sources, pack
+
+
+class TestCardAtlas(unittest.TestCase):
+    def test_pack_splits_pages(self):
+        pages = pack([(f"r{i}", (100, 100)) for i in range(5)], page=210, padding=2)
+        self.assertEqual([len(p) for p in pages], [4, 1])
+        with self.assertRaises(ValueError):
+            pack([("big", (300, 10))], page=210)
+
+    def test_build_atlas_regions(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as out:
+            colors = {"seer": (255, 0, 0, 255), "robber": (0, 0, 255, 255)}
+            for name, color in colors.items():
+                Image.new("RGBA", (40, 40), color).save(os.path.join(src, f"{name}.png"))
+            back = os.path.join(src, "back.jpg")
+            Image.new("RGB", (20, 40), (0, 255, 0)).save(back)
+            sources = collect_sources([src], back)
+            self.assertEqual(set(sources), {"seer", "robber", "back", "background"})
+            del sources["back"]
+
+            path = build_atlas(sources, 16, out, page=64)
+            self.assertEqual(os.path.basename(path), "cards-16.atlas")
+            with open(path, encoding="utf-8") as f:
+                meta = json.load(f)
+            (page_name, regions), = meta.items()
+            self.assertEqual(regions["background"][2:], [8, 16])
+            sheet = Image.open(os.path.join(out, page_name)).convert("RGBA")
+            for name, color in colors.items():
+                x, y, w, h = regions[name]
+                # 区域以左下角为原点，换算回 PIL 坐标取中心像素
+                self.assertEqual(sheet.getpixel((x + w // 2, sheet.height - y - h // 2)), color)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
+import random
+import types
 import unittest
+from core import game_record
 from core.werewolf_dealer import WerewolfDealer
 class TestDealer(unittest.TestCase):
     def setUp(self):
@@ -17,5 +20,86 @@ class TestDealer(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.dealer.deal(11)
 
+    def test_night_plan_cached_on_deal(self):
+        pool = ['werewolf', 'werewolf', 'seer', 'robber', 'mason', 'mason', 'drunk']
+        self.dealer.start_game_with_selection(pool)
+        plan = self.dealer.get_night_plan()
+        self.assertIs(plan, self.dealer.session['night_plan'])
+        initial = self.dealer.session['initial_player_cards']
+        for role in ('werewolf', 'seer', 'robber', 'drunk'):
+            expected = [i for i, r in enumerate(initial) if r == role]
+            self.assertEqual(self.dealer.get_role_indices(role), expected)
+        # 夜晚交换不影响基于初始身份的步骤
+        steps_before = self.dealer.get_night_steps()
+        self.dealer.run_night_automation()
+        self.assertIs(self.dealer.get_night_plan(), plan)
+        self.assertEqual(self.dealer.get_night_steps(), steps_before)
+        # 重新发牌后计划随会话重建
+        self.dealer.start_game_with_selection(pool)
+        self.assertIsNot(self.dealer.get_night_plan(), plan)
+
+    def _fixed_deal(self, cards):
+        # 不洗牌：前 N 张发给玩家，最后三张为中央牌
+        self.dealer.start_game_with_selection(cards, rng=types.SimpleNamespace(shuffle=lambda pool: None))
+
+    def test_doppelganger_copies_and_acts_immediately(self):
+        self._fixed_deal(['doppelganger', 'robber', 'werewolf', 'villager', 'seer', 'drunk', 'tanner'])
+        log = self.dealer.run_night_automation(choices={'doppelganger': {0: 1}, 'robber': {0: 2, 1: 3}})
+        self.assertEqual(log[0], {'role': 'doppelganger', 'player': 0, 'copied_from': 1, 'copied_role': 'robber'})
+        self.assertEqual(log[1]['swapped_with'], 2)
+        self.assertTrue(log[1]['doppelganger'])
+        cards = self.dealer.session['player_cards']
+        self.assertEqual(cards[:4], ['werewolf', 'villager', 'doppelganger', 'robber'])
+        # 编码记录可按行动重放出同样的终局
+        actions = game_record.actions_from_log(log)
+        rid = WerewolfDealer.role_id
+        final, _ = game_record.replay_final([rid(r) for r in self.dealer.session['initial_player_cards']],
+                                            [rid(r) for r in self.dealer.session['initial_center_cards']], actions)
+        self.assertEqual(final, [rid(r) for r in cards])
+
+    def test_doppelganger_wolf_and_insomniac(self):
+        self._fixed_deal(['doppelganger', 'werewolf', 'minion', 'villager', 'seer', 'drunk', 'tanner'])
+        log = self.dealer.run_night_automation(choices={'doppelganger': {0: 1}})
+        wolves = next(e for e in log if e['role'] == 'werewolf')
+        self.assertEqual(wolves['wolves'], [1, 0])
+        minion = next(e for e in log if e['role'] == 'minion')
+        self.assertEqual(minion['wolves_seen'], [1, 0])
+        # 化身幽灵牌按狼人结算：处决 0 号好人胜
+        self.assertTrue(self.dealer.evaluate_victory([0])['good'])
+
+        self._fixed_deal(['doppelganger', 'insomniac', 'troublemaker', 'villager', 'seer', 'drunk', 'tanner'])
+        log = self.dealer.run_night_automation(choices={'doppelganger': {0: 1}, 'troublemaker': {2: (0, 3)}})
+        self.assertEqual([e['role'] for e in log], ['doppelganger', 'troublemaker', 'insomniac', 'insomniac'])
+        self.assertEqual(log[-1], {'role': 'insomniac', 'insomniac': 0, 'final_card': 'villager', 'doppelganger': True})
+
+    def test_doppelganger_random_pools_replay(self):
+        pool = ['doppelganger', 'werewolf', 'seer', 'robber', 'troublemaker', 'drunk', 'insomniac', 'villager']
+        rid = WerewolfDealer.role_id
+        for seed in range(200):
+            rng = random.Random(seed)
+            self.dealer.start_game_with_selection(pool, rng=rng)
+            s = self.dealer.session
+            log = self.dealer.run_night_automation(rng=rng)
+            self.assertFalse(any('未实现' in str(e.get('note', '')) for e in log))
+            final, center = game_record.replay_final([rid(r) for r in s['initial_player_cards']],
+                                                     [rid(r) for r in s['initial_center_cards']],
+                                                     game_record.actions_from_log(log))
+            self.assertEqual(final, [rid(r) for r in s['player_cards']])
+            self.assertEqual(center, [rid(r) for r in s['center_cards']])
+
+    def test_normalize_role_alias_table(self):
+        self.assertEqual(WerewolfDealer.normalize_role('Werewolf'), 'werewolf')
+        self.assertEqual(WerewolfDealer.normalize_role('SEER'), 'seer')
+        self.assertEqual(WerewolfDealer.normalize_role('猎人'), 'hunter')
+        self.assertEqual(WerewolfDealer.normalize_role('Background'), 'background')
+        self.assertEqual(WerewolfDealer.normalize_role(''), '')
+        self.assertEqual(WerewolfDealer.role_id('化身幽灵'), WerewolfDealer.ROLE_IDS['doppelganger'])
+        self.assertEqual(WerewolfDealer.role_id('unknown'), -1)
+        self.assertEqual(WerewolfDealer.role_name(WerewolfDealer.role_id('Drunk')), 'drunk')
+        WerewolfDealer.reset_normalize_stats()
+        WerewolfDealer.normalize_role('robber')
+        stats = WerewolfDealer.normalize_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 0))
+
 if __name__ == '__main__':
     unittest.main()
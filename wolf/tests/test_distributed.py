@@ -0,0 +1,61 @@
+import multiprocessing
+import socket
+import unittest
+
+from core import distributed
+from core.simulation import merge_tally, pool_id, tally
+
+POOLS = [
+    ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"],
+    ["doppelganger", "werewolf", "minion", "tanner", "hunter", "seer", "robber"],
+]
+
+
+class TestDistributed(unittest.TestCase):
+    def test_localhost_workers_with_lost_lease(self):
+        units = distributed.make_units(POOLS, 120, seed=3, policy="plurality", unit_games=25)
+        with distributed.Coordinator(units, lease=30.0) as coord:
+            host, port = coord.address
+            # 领取一个单元后直接断线：该租约应重新排队
+            with socket.create_connection((host, port)) as sock:
+                distributed.send_message(sock, {"type": "request"})
+                self.assertEqual(distributed.recv_message(sock)["type"], "unit")
+            workers = [multiprocessing.Process(target=distributed.run_worker, args=(host, port)) for _ in range(2)]
+            for w in workers:
+                w.start()
+            self.assertTrue(coord.wait(60))
+            for w in workers:
+                w.join(30)
+                self.assertEqual(w.exitcode, 0)
+            self.assertEqual(coord.progress, (len(units), len(units)))
+        for pool in POOLS:
+            expected = tally(pool, 120, seed=3, policy="plurality")
+            self.assertEqual(coord.totals[pool_id(pool)], merge_tally({}, expected))
+
+    def test_expired_lease_requeued_and_duplicate_ignored(self):
+        units = distributed.make_units(POOLS[:1], 10, unit_games=10)
+        coord = distributed.Coordinator(units, lease=0.0)
+        try:
+            first = coord._lease_next(0)
+            second = coord._lease_next(1)
+            self.assertEqual(first["unit"]["unit_id"], second["unit"]["unit_id"])
+            counts = distributed.run_unit(first["unit"])
+            coord._complete(0, counts)
+            coord._complete(0, counts)
+            self.assertEqual(coord.totals[units[0]["pool_id"]]["games"], 10)
+            self.assertEqual(coord._lease_next(2)["type"], "done")
+        finally:
+            coord.close()
+
+    def test_protocol_errors(self):
+        a, b = socket.socketpair()
+        with a, b:
+            a.sendall(distributed._LENGTH.pack(distributed.MAX_MESSAGE + 1))
+            with self.assertRaises(distributed.ProtocolError):
+                distributed.recv_message(b)
+        with self.assertRaises(ValueError):
+            distributed.make_units(POOLS, 10, unit_games=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from core import game_log
+from core.simulation import simulate
+from core.werewolf_dealer import WerewolfDealer
+
+POOL = ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"]
+
+
+class TestGameLog(unittest.TestCase):
+    def test_night_log_streams_to_sink(self):
+        d = WerewolfDealer()
+        d.start_game_with_selection(POOL, rng=random.Random(3))
+        expected = d.run_night_automation(rng=random.Random(9))
+
+        d.start_game_with_selection(POOL, rng=random.Random(3))
+        buf = io.BytesIO()
+        sink = game_log.JsonlSink(buf)
+        self.assertEqual(d.run_night_automation(rng=random.Random(9), sink=sink), [])
+        sink.close()
+        lines = buf.getvalue().decode("utf-8").splitlines()
+        self.assertEqual(len(lines), len(expected))
+        self.assertEqual(json.loads(lines[0])["role"], expected[0]["role"])
+
+    def test_generator_sink(self):
+        got = []
+
+        def consumer():
+            while True:
+                got.append((yield))
+
+        d = WerewolfDealer()
+        d.start_game_with_selection(POOL, rng=random.Random(1))
+        d.run_night_automation(rng=random.Random(2), sink=consumer())
+        self.assertTrue(got)
+        self.assertTrue(all("role" in rec for rec in got))
+
+    def test_history_bounded_with_sink(self):
+        d = WerewolfDealer()
+        d.start_game_with_selection(POOL)
+        seen = []
+        d.set_log_sink(seen.append)
+        for i in range(WerewolfDealer.HISTORY_LIMIT * 3):
+            d.swap_between_players(0, 1 + i % 4)
+        self.assertEqual(len(seen), WerewolfDealer.HISTORY_LIMIT * 3)
+        self.assertLessEqual(len(d.session["history"]), WerewolfDealer.HISTORY_LIMIT)
+        self.assertEqual(d.session["history"][-1], seen[-1])
+
+    def test_simulation_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.jsonl")
+            self.assertEqual(game_log.write_jsonl(simulate(POOL, 50, seed=7), path), 50)
+            rows = list(game_log.read_jsonl(path))
+        first = next(simulate(POOL, 1, seed=7))
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(rows[0]["players"], first["players"])
+        self.assertEqual(rows[0]["result"], first["result"])
+        self.assertEqual(rows[0]["seed"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
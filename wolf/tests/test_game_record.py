@@ -0,0 +1,89 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core import game_record
+from core.game_record import (
+    GameRecordReader, GameRecordWriter, RecordFormatError, RECORD_SIZE, HEADER_SIZE,
+    encode_session, replay_final,
+)
+from core.werewolf_dealer import WerewolfDealer
+
+POOL = ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"]
+
+
+def play(seed):
+    random.seed(seed)
+    d = WerewolfDealer()
+    d.start_game_with_selection(POOL)
+    log = d.run_night_automation()
+    executed = [seed % 5]
+    result = d.evaluate_victory(executed)
+    return d, log, executed, result
+
+
+class TestGameRecord(unittest.TestCase):
+    @unittest.skipIf(game_record.np is None, "需要 numpy")
+    def test_roundtrip_and_replay(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.onwr")
+            games = [play(s) for s in range(50)]
+            with GameRecordWriter(path, buffer_records=7) as w:
+                for d, log, executed, result in games[:30]:
+                    w.write(encode_session(d, log, executed, result))
+            # 追加写入：校验文件头后接着写
+            with GameRecordWriter(path) as w:
+                for d, log, executed, result in games[30:]:
+                    w.write(encode_session(d, log, executed, result))
+            self.assertEqual(os.path.getsize(path), HEADER_SIZE + 50 * RECORD_SIZE)
+
+            with GameRecordReader(path) as r:
+                self.assertEqual(len(r), 50)
+                recs = r.records
+                self.assertEqual(recs.dtype.itemsize, RECORD_SIZE)
+                self.assertEqual(sum(len(b) for b in r.iter_batches(16)), 50)
+                for rec, (d, log, executed, result) in zip(r, games):
+                    s = d.session
+                    ids = [WerewolfDealer.role_id(c) for c in s["initial_player_cards"]]
+                    self.assertEqual(rec["players"], ids)
+                    self.assertEqual(rec["executed"], executed)
+                    final, _ = replay_final(rec["players"], rec["center"], rec["actions"])
+                    self.assertEqual(final, [WerewolfDealer.role_id(c) for c in s["player_cards"]])
+                    self.assertEqual(bool(rec["verdict"] & game_record.VERDICT_GOOD), result["good"])
+                good = (recs["verdict"] & game_record.VERDICT_GOOD) > 0
+                self.assertEqual(int(good.sum()), sum(g[3]["good"] for g in games))
+                del recs, good
+
+    def test_replay_with_duplicate_robbers_and_drunks(self):
+        pool = ["robber", "robber", "villager", "werewolf", "seer", "drunk", "drunk", "tanner", "minion", "villager"]
+        d = WerewolfDealer()
+        d.start_game_with_selection(pool, shuffle=False)
+        log = d.run_night_automation(choices={"robber": {0: 3, 1: 4}, "drunk": {5: 0, 6: 1}})
+        rec = game_record.decode_record(encode_session(d, log))
+        final, center = replay_final(rec["players"], rec["center"], rec["actions"])
+        s = d.session
+        self.assertEqual(final, [WerewolfDealer.role_id(c) for c in s["player_cards"]])
+        self.assertEqual(center, [WerewolfDealer.role_id(c) for c in s["center_cards"]])
+
+    def test_action_capacity(self):
+        # 12 名玩家全部有行动、化身幽灵再追加行动也能编码
+        actions = [(WerewolfDealer.ROLE_IDS["seer"], 0, -1)] * game_record.MAX_ACTIONS
+        rec = game_record.decode_record(game_record.encode_game(["seer"] * 12, ["villager"] * 3, actions))
+        self.assertEqual(len(rec["actions"]), game_record.MAX_ACTIONS)
+        with self.assertRaises(ValueError):
+            game_record.encode_game(["seer"] * 12, ["villager"] * 3, actions + actions[:1])
+
+    def test_rejects_foreign_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.onwr")
+            with open(path, "wb") as f:
+                f.write(b"NOPE" + bytes(40))
+            with self.assertRaises(RecordFormatError):
+                GameRecordReader(path)
+            with self.assertRaises(RecordFormatError):
+                GameRecordWriter(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
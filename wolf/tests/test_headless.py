@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from gui.latency import LatencyHistogram
+from gui.headless import HeadlessNightDriver
+from gui.instrumentation import Instrumentation
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        h = LatencyHistogram(3)
+        for v in range(1, 100001):
+            h.record(v)
+        self.assertEqual(h.count, 100000)
+        for p, expected in ((50, 50000), (99, 99000), (100, 100000)):
+            self.assertAlmostEqual(h.percentile(p), expected, delta=expected * 0.001 + 1)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10); b.record(5000)
+        a.merge(b)
+        self.assertEqual((a.count, a.min, a.max), (2, 10, 5000))
+
+
+class TestHeadlessNight(unittest.TestCase):
+    def test_scripted_games_complete(self):
+        tk_before = sys.modules.get('tkinter')
+        driver = HeadlessNightDriver(seed=7, timeout_rate=0.3)
+        self.assertIs(sys.modules.get('tkinter'), tk_before)
+        hs = driver.run(4)
+        self.assertEqual(driver.games, 4)
+        self.assertFalse(driver.dialogs.errors())
+        self.assertEqual(hs.get('night:end').count, 4)
+        self.assertEqual(hs.get('vote').count, 4)
+        # 回到主页，可继续下一局
+        self.assertTrue(driver.app.roles_frame_visible)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_install_records_and_dumps_trace(self):
+        driver = HeadlessNightDriver(seed=3, timeout_rate=1.0)
+        inst = Instrumentation(slow_threshold_ms=0).install(driver.app)
+        driver.run(1)
+        names = set(inst.histograms.histograms)
+        self.assertIn('method:_run_night_step', names)
+        # 倒计时经 after 回调推进
+        self.assertIn('after:_night_tick', names)
+        self.assertTrue(inst.slow_events and inst.slow_events[0]['stack'])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = inst.dump_trace(os.path.join(tmp, 'trace.json'))
+            with open(path, encoding='utf-8') as f:
+                doc = json.load(f)
+        self.assertTrue(all(ev['ph'] in ('X', 'i') for ev in doc['traceEvents']))
+        inst.uninstall()
+        self.assertNotIn('_run_night_step', driver.app.__dict__)
+        self.assertIsNone(driver.root.callback_hook)
+
+
+if __name__ == '__main__':
+    unittest.main()
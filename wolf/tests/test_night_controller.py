@@ -0,0 +1,142 @@
+import unittest
+from core.werewolf_dealer import WerewolfDealer
+from core.night_controller import NightActionError, NightController
+
+
+def make_dealer(players, centers):
+    dealer = WerewolfDealer()
+    dealer.start_game_with_selection(players + centers)
+    s = dealer.session
+    s['player_cards'] = list(players)
+    s['center_cards'] = list(centers)
+    s['initial_player_cards'] = list(players)
+    s['initial_center_cards'] = list(centers)
+    s['night_plan'] = dealer._build_night_plan(players, centers)
+    return dealer
+
+
+class TestNightController(unittest.TestCase):
+    def test_full_night(self):
+        players = ['doppelganger', 'werewolf', 'seer', 'robber', 'troublemaker', 'drunk', 'insomniac']
+        centers = ['villager', 'werewolf', 'tanner']
+        dealer = make_dealer(players, centers)
+        ctl = NightController(dealer)
+        view = ctl.start()
+        self.assertEqual(view['role'], 'doppelganger')
+        self.assertFalse(view['can_continue'])
+        with self.assertRaises(NightActionError):
+            ctl.copy(0)  # 不能复制自己
+        self.assertEqual(ctl.copy(2), 'seer')
+        self.assertEqual(ctl.view()['acting_role'], 'seer')
+        ctl.peek_center(0)
+        with self.assertRaises(NightActionError):
+            ctl.peek_player(3)  # 已选择中央模式
+        with self.assertRaises(NightActionError):
+            ctl.peek_center(0)  # 同一张不可重复
+        ctl.peek_center(1)
+        view = ctl.advance()
+        # 独狼必须先查看中央
+        self.assertEqual(view['role'], 'werewolf')
+        with self.assertRaises(NightActionError):
+            ctl.advance()
+        self.assertEqual(ctl.peek_center(2), 'tanner')
+        self.assertEqual(ctl.advance()['role'], 'seer')
+        self.assertEqual(ctl.peek_player(1), 'werewolf')
+        self.assertEqual(ctl.advance()['role'], 'robber')
+        with self.assertRaises(NightActionError):
+            ctl.swap_center(0)  # 非酒鬼
+        self.assertEqual(ctl.rob(1), 'werewolf')
+        self.assertEqual(ctl.advance()['role'], 'troublemaker')
+        ctl.select_for_swap(0)
+        ctl.select_for_swap(6)
+        ctl.swap_players()
+        self.assertEqual(ctl.advance()['role'], 'drunk')
+        ctl.swap_center(0)
+        self.assertEqual(ctl.advance()['role'], 'insomniac')
+        self.assertEqual(ctl.view_own(), 'doppelganger')
+        self.assertTrue(ctl.advance()['finished'])
+        self.assertEqual(dealer.session['player_cards'],
+                         ['insomniac', 'robber', 'seer', 'werewolf', 'troublemaker', 'villager', 'doppelganger'])
+        self.assertEqual(dealer.session['center_cards'], ['drunk', 'werewolf', 'tanner'])
+
+    def test_center_only_and_timeout(self):
+        players = ['werewolf', 'werewolf', 'villager', 'robber']
+        centers = ['seer', 'drunk', 'villager']
+        ctl = NightController(make_dealer(players, centers))
+        view = ctl.start()
+        self.assertEqual(view['role'], 'werewolf')
+        self.assertTrue(view['can_continue'])
+        with self.assertRaises(NightActionError):
+            ctl.peek_center(0)  # 双狼不能看中央
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor']), ('seer', None))
+        self.assertEqual(view['selectable_centers'], [])
+        view = ctl.advance()
+        self.assertEqual(view['role'], 'robber')
+        self.assertFalse(view['can_continue'])
+        view = ctl.timeout()  # 倒计时结束跳过
+        self.assertEqual(view['role'], 'drunk')
+        self.assertTrue(ctl.advance()['finished'])
+        with self.assertRaises(NightActionError):
+            ctl.advance()
+
+    def test_group_roles_wake_every_holder(self):
+        players = ['werewolf', 'mason', 'werewolf', 'minion', 'mason', 'robber', 'robber']
+        centers = ['villager', 'seer', 'tanner']
+        ctl = NightController(make_dealer(players, centers))
+        view = ctl.start()
+        self.assertEqual((view['role'], view['actors']), ('werewolf', [0, 2]))
+        self.assertIn('玩家1、玩家3', view['prompt'])
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actors'], view['wolves']), ('minion', [3], [0, 2]))
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actors']), ('mason', [1, 4]))
+        # 两名强盗依次单独行动
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor']), ('seer', None))
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor']), ('robber', 5))
+        ctl.rob(0)
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor']), ('robber', 6))
+        self.assertFalse(view['can_continue'])
+        self.assertEqual(ctl.rob(5), 'werewolf')
+        self.assertTrue(ctl.advance()['finished'])
+        self.assertEqual([e['role'] for e in ctl.log], ['werewolf', 'minion', 'mason', 'robber', 'robber'])
+
+    def test_doppelganger_joins_wolves_and_wakes_after_insomniac(self):
+        players = ['doppelganger', 'werewolf', 'minion', 'insomniac', 'villager']
+        centers = ['villager', 'seer', 'tanner']
+        ctl = NightController(make_dealer(players, centers))
+        ctl.start()
+        self.assertEqual(ctl.copy(1), 'werewolf')
+        view = ctl.advance()
+        self.assertEqual(view['actors'], [1, 0])
+        self.assertFalse(view['selectable_centers'])  # 不再是独狼
+        self.assertEqual(ctl.advance()['wolves'], [1, 0])
+
+        players = ['doppelganger', 'insomniac', 'troublemaker', 'villager', 'villager']
+        ctl = NightController(make_dealer(players, ['villager', 'hunter', 'tanner']))
+        ctl.start()
+        self.assertEqual(ctl.copy(1), 'insomniac')
+        view = ctl.view()
+        self.assertTrue(view['done'])
+        with self.assertRaises(NightActionError):
+            ctl.view_own()  # 复制时不立即查看
+        view = ctl.advance()
+        self.assertEqual(view['role'], 'troublemaker')
+        ctl.swap_players(0, 3)
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor'], view['doppelganger']), ('insomniac', 1, False))
+        ctl.view_own()
+        view = ctl.advance()
+        self.assertEqual((view['role'], view['actor'], view['doppelganger']), ('insomniac', 0, True))
+        self.assertIn('化身幽灵（失眠者）', view['prompt'])
+        self.assertEqual(ctl.view_own(), 'villager')
+        self.assertTrue(ctl.advance()['finished'])
+        self.assertTrue(ctl.log[-1]['doppelganger'])
+        self.assertEqual(ctl.session['doppelganger']['copies'], {0: 'insomniac'})
+
+
+if __name__ == '__main__':
+    unittest.main()
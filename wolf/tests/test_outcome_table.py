@@ -0,0 +1,30 @@
+import unittest
+
+from core import outcome_table
+from core.game_record import VERDICT_GOOD, VERDICT_TANNER, VERDICT_WOLF
+
+
+class TestOutcomeTable(unittest.TestCase):
+    def test_table_matches_reference(self):
+        table = outcome_table.table()
+        self.assertEqual(len(table), outcome_table.TABLE_SIZE)
+        for sig in range(outcome_table.TABLE_SIZE):
+            self.assertEqual(table[sig], outcome_table.reference_outcome(sig))
+        self.assertEqual(table, outcome_table.build_table())
+
+    def test_signature(self):
+        sig = outcome_table.signature(["werewolf", "tanner", "villager"], ["tanner", "hunter"])
+        self.assertEqual(sig, outcome_table.SIG_WOLF | outcome_table.SIG_TANNER
+                         | outcome_table.SIG_KILL_TANNER | outcome_table.SIG_KILL_OTHER)
+        self.assertEqual(outcome_table.table()[sig], VERDICT_TANNER)
+        # 平票忽略死亡者；只有爪牙时按有狼人计
+        sig = outcome_table.signature(["minion", "villager"], ["minion"], is_tie=True)
+        self.assertEqual(sig, outcome_table.SIG_MINION | outcome_table.SIG_TIE)
+        self.assertEqual(outcome_table.lookup(sig), {"good": False, "wolf": True, "tanner": False})
+        sig = outcome_table.signature(["werewolf", "tanner"], ["werewolf", "tanner"])
+        self.assertEqual(outcome_table.table()[sig], VERDICT_GOOD)
+        self.assertEqual(outcome_table.table()[outcome_table.signature(["villager"], [])], VERDICT_WOLF)
+
+
+if __name__ == "__main__":
+    unittest.main()
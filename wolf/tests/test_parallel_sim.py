@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+
+from core import game_record
+from core.parallel_sim import simulate_parallel
+from core.simulation import simulate
+from core.werewolf_dealer import WerewolfDealer
+
+POOL = ["doppelganger", "werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "tanner", "hunter"]
+
+
+class TestParallelSim(unittest.TestCase):
+    def test_matches_sequential(self):
+        games = list(simulate(POOL, 300, seed=11, policy="plurality"))
+        expected = np.array([game_record.verdict_bits(g["result"], g["is_tie"]) for g in games], dtype=np.uint8)
+        for workers in (1, 2):
+            res = simulate_parallel(POOL, 300, seed=11, policy="plurality", workers=workers, chunk=64)
+            self.assertEqual(res["verdicts"].tolist(), expected.tolist())
+            first = games[0]["players"] + games[0]["center"]
+            self.assertEqual(res["deals"][0, :len(first)].tolist(), [WerewolfDealer.role_id(r) for r in first])
+            self.assertEqual(res["counts"]["good"], int(((expected & game_record.VERDICT_GOOD) > 0).sum()))
+            self.assertEqual(res["counts"]["tie"], int(((expected & game_record.VERDICT_TIE) > 0).sum()))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            simulate_parallel(POOL, 10, policy="nope")
+        self.assertEqual(simulate_parallel(POOL, 0, workers=1)["counts"]["good"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
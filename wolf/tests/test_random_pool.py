@@ -0,0 +1,46 @@
+import random
+import unittest
+from collections import Counter
+from core.random_pool import RandomPoolSampler, expand_pool, random_pool, random_pools
+
+
+class TestRandomPool(unittest.TestCase):
+    def test_pool_size_and_uniqueness(self):
+        rng = random.Random(1)
+        for pool in random_pools(200, 5, 2, rng=rng):
+            self.assertEqual(len(pool), len(set(pool)))
+            self.assertNotIn('werewolf', pool)
+            self.assertEqual(len(expand_pool(pool, 2)), 5 + 3)
+
+    def test_needs_mason_to_fill(self):
+        # 贪心填充在此类情况下可能失败：唯一解是 守夜人 + 预言家
+        rng = random.Random(2)
+        for _ in range(50):
+            pool = random_pool(1, 1, {'candidates': ['mason', 'seer', 'robber', 'drunk']}, rng=rng)
+            self.assertEqual(sum(2 if r == 'mason' else 1 for r in pool), 3)
+
+    def test_uniform_over_valid_pools(self):
+        sampler = RandomPoolSampler(['mason', 'seer', 'robber', 'drunk'], 3)
+        # 合法组合：mason+任一单张（3 种）+ 三张单张（1 种）
+        self.assertEqual(sampler.count(), 4)
+        seen = Counter(frozenset(p) for p in sampler.sample_many(4000, random.Random(3)))
+        self.assertEqual(len(seen), 4)
+        for cnt in seen.values():
+            self.assertGreater(cnt, 800)
+
+    def test_constraints(self):
+        rng = random.Random(4)
+        cons = {'include': ['seer'], 'exclude': ['drunk']}
+        for pool in random_pools(50, 6, 2, cons, rng=rng):
+            self.assertIn('seer', pool)
+            self.assertNotIn('drunk', pool)
+
+    def test_impossible_raises(self):
+        with self.assertRaises(ValueError):
+            random_pool(4, 1, {'candidates': ['seer', 'robber']})
+        with self.assertRaises(ValueError):
+            random_pool(4, 1, {'include': ['seer'], 'exclude': ['seer']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from core.result_cache import ResultCache, cache_key
+from core.simulation import tally
+from core.sweep import Sweep
+from core.distributed import make_units
+
+POOL = ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"]
+
+
+class TestResultCache(unittest.TestCase):
+    def test_key_is_canonical(self):
+        self.assertEqual(cache_key(POOL, 100), cache_key(list(reversed(POOL)), 100))
+        self.assertEqual(cache_key(POOL, 100), cache_key(["狼人"] + POOL[1:], 100))
+        self.assertNotEqual(cache_key(POOL, 100), cache_key(POOL, 101))
+        self.assertNotEqual(cache_key(POOL, 100), cache_key(POOL, 100, policy="tie"))
+        self.assertNotEqual(cache_key(POOL, 100), cache_key(POOL, 100, seed=1))
+
+    def test_hit_and_sweep_runner(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            first = cache.tally(POOL, 200, seed=3)
+            self.assertEqual(first, tally(POOL, 200, seed=3))
+            self.assertEqual(cache.tally(list(reversed(POOL)), 200, seed=3), first)
+            # 缓存键不含顺序，模拟结果本身也必须与顺序无关
+            self.assertEqual(tally(list(reversed(POOL)), 200, seed=3), first)
+            self.assertEqual(tally(["狼人"] + POOL[1:], 200, seed=3), first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            units = make_units([POOL], 200, seed=3, unit_games=50)
+            Sweep(units, runner=cache.run_unit).run()
+            totals = Sweep(units, runner=cache.run_unit).run()
+            self.assertEqual(cache.hits, 1 + 4)
+            self.assertEqual(totals[units[0]["pool_id"]], first)
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp, max_bytes=10 ** 6)
+            for games in range(1, 6):
+                cache.tally(POOL, games)
+            entry = cache.size // 5
+            small = ResultCache(tmp, max_bytes=entry * 4)
+            old = small._path(cache_key(POOL, 1))
+            os.utime(old, (1, 1))
+            small.get(cache_key(POOL, 2))
+            small.tally(POOL, 6)
+            self.assertLessEqual(small.size, entry * 4)
+            self.assertFalse(os.path.exists(old))
+            self.assertIsNotNone(small.get(cache_key(POOL, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
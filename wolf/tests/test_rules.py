@@ -1,3 +1,6 @@
+import json
+import os
+import tempfile
 import unittest
 from core import game_rules
 
@@ -7,5 +10,32 @@ class TestRules(unittest.TestCase):
         rules = game_rules.load_rules("resources/roles_config.json")
         self.assertTrue(game_rules.validate_rules(rules))
 
+    def test_invalid_rules_rejected(self):
+        # 角色池数量不足、未知角色、人数越界均应报错
+        with self.assertRaises(ValueError):
+            game_rules.validate_rules({"4": {"入门": ["狼人", "狼人"]}})
+        with self.assertRaises(ValueError):
+            game_rules.validate_rules({"4": {"入门": ["狼人"] * 6 + ["路人甲"]}})
+        with self.assertRaises(ValueError):
+            game_rules.validate_rules({"2": {"入门": ["村民"] * 5}})
+
+    def test_compile_from_file(self):
+        rules = {"4": {"入门": ["狼人", "狼人", "预言家", "强盗", "捣蛋鬼", "村民", "失眠者"]}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "roles_config.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rules, f, ensure_ascii=False)
+            first = game_rules.load_compiled_rules(path)
+            self.assertEqual(first.role_pool(4, "入门").count("werewolf"), 2)
+            self.assertEqual(first.raw, rules)
+            # 不写任何缓存文件；内容变化后重新读取即得到新结果
+            self.assertEqual(os.listdir(tmp), ["roles_config.json"])
+            rules["4"]["入门"].append("村民")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rules, f, ensure_ascii=False)
+            second = game_rules.load_compiled_rules(path)
+            self.assertNotEqual(second.source_hash, first.source_hash)
+            self.assertEqual(second.role_pool(4, "入门").count("villager"), 2)
+
 if __name__ == '__main__':
     unittest.main()
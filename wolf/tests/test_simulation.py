@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from core import result_export
+from core.game_record import GameRecordWriter
+from core.simulation import encode_result, play_game, pool_id, simulate
+
+POOL = ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"]
+
+
+class TestSimulation(unittest.TestCase):
+    def test_seed_reproducible(self):
+        a = play_game(POOL, 42)
+        b = play_game(list(reversed(POOL)), 42)
+        self.assertEqual(pool_id(POOL), pool_id(list(reversed(POOL))))
+        self.assertNotEqual(pool_id(POOL), pool_id(POOL[:-1] + ["tanner"]))
+        c = play_game(POOL, 42)
+        self.assertEqual((a["players"], a["log"], a["result"]), (c["players"], c["log"], c["result"]))
+        self.assertEqual(len(b["players"]), 5)
+        self.assertEqual((a["players"], a["log"], a["result"]), (b["players"], b["log"], b["result"]))
+        with self.assertRaises(ValueError):
+            play_game(POOL, 1, policy="nope")
+
+    def test_npz_export_and_journal(self):
+        games = list(simulate(POOL, 300, seed=5))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = result_export.write_results(games, os.path.join(tmp, "res.parquet"), batch_size=64,
+                                               use_arrow=False)
+            self.assertTrue(path.endswith(".npz"))
+            cols = result_export.read_results(path)
+            self.assertEqual(cols["deal"].shape, (300, 15))
+            self.assertEqual(cols["seed"].tolist(), list(range(5, 305)))
+            self.assertEqual(int(cols["good"].sum()), sum(g["result"]["good"] for g in games))
+            self.assertTrue((cols["pool_id"] == pool_id(POOL)).all())
+            # 逐批写出：300 局 / 每批 64 局 = 5 批，每批每列一个成员
+            with zipfile.ZipFile(path) as zf:
+                self.assertEqual(len(zf.namelist()), 5 * len(cols))
+            empty = result_export.write_results([], os.path.join(tmp, "empty.npz"), use_arrow=False)
+            self.assertEqual(result_export.read_results(empty)["deal"].shape, (0, 15))
+
+            onwr = os.path.join(tmp, "games.onwr")
+            with GameRecordWriter(onwr) as w:
+                for g in games:
+                    w.write(encode_result(g))
+            jpath = result_export.export_journal(onwr, os.path.join(tmp, "journal.npz"), batch_size=128,
+                                                 use_arrow=False)
+            jcols = result_export.read_results(jpath)
+            for name in ("deal", "action_kind", "executed", "wolf", "tanner"):
+                self.assertEqual(jcols[name].tolist(), cols[name].tolist())
+
+    @unittest.skipIf(result_export.pa is None, "需要 pyarrow")
+    def test_parquet_roundtrip(self):
+        games = list(simulate(POOL, 100, seed=1))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = result_export.write_results(games, os.path.join(tmp, "res.parquet"), batch_size=32)
+            cols = result_export.read_results(path)
+            self.assertEqual(cols["deal"].shape, (100, 15))
+            self.assertEqual(cols["seed"].tolist(), list(range(1, 101)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from core import stopping
+
+POOLS = [
+    ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"],
+    ["werewolf", "minion", "tanner", "hunter", "seer", "robber", "drunk"],
+]
+
+
+class TestStopping(unittest.TestCase):
+    def test_intervals(self):
+        lo, hi = stopping.wilson_interval(5, 10)
+        self.assertAlmostEqual(lo, 0.2366, places=3)
+        self.assertAlmostEqual(hi, 0.7634, places=3)
+        self.assertEqual(stopping.wilson_interval(0, 0), (0.0, 1.0))
+        lo, hi = stopping.beta_interval(0, 0)
+        self.assertAlmostEqual(lo, 0.025, places=6)
+        self.assertAlmostEqual(hi, 0.975, places=6)
+        self.assertAlmostEqual(stopping.beta_cdf(0.5, 2, 2), 0.5, places=9)
+        # 大样本下两种区间接近
+        w = stopping.wilson_interval(3000, 10000)
+        b = stopping.beta_interval(3000, 10000)
+        self.assertAlmostEqual(w[0], b[0], places=3)
+        self.assertAlmostEqual(w[1], b[1], places=3)
+
+    def test_adaptive_stops_early(self):
+        for method in ("wilson", "beta"):
+            res = stopping.adaptive_sweep(POOLS, tolerance=0.08, method=method, batch_games=250, max_games=20000)
+            for row in res:
+                self.assertTrue(row["decided"])
+                self.assertLess(row["counts"]["games"], 20000)
+                for lo, hi in row["intervals"].values():
+                    self.assertLessEqual(hi - lo, 0.08)
+
+    def test_budget_and_workers(self):
+        res = stopping.adaptive_sweep(POOLS, tolerance=0.001, batch_games=100, max_games=300)
+        self.assertEqual([r["counts"]["games"] for r in res], [300, 300])
+        self.assertFalse(any(r["decided"] for r in res))
+        par = stopping.adaptive_sweep(POOLS, tolerance=0.001, batch_games=100, max_games=300, workers=2)
+        self.assertEqual([r["counts"] for r in par], [r["counts"] for r in res])
+        with self.assertRaises(ValueError):
+            stopping.adaptive_sweep(POOLS, tolerance=0.1, method="nope")
+
+    def test_parallel_stopping_point_matches_serial(self):
+        kwargs = dict(tolerance=0.1, batch_games=50, max_games=20000, seed=7)
+        serial = stopping.adaptive_sweep(POOLS, **kwargs)
+        self.assertTrue(all(r["decided"] for r in serial))
+        par = stopping.adaptive_sweep(POOLS, workers=3, **kwargs)
+        self.assertEqual([r["counts"] for r in par], [r["counts"] for r in serial])
+        self.assertEqual([r["decided"] for r in par], [r["decided"] for r in serial])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core import sweep
+from core.distributed import make_units, run_unit
+from core.simulation import pool_id, tally
+
+POOLS = [
+    ["werewolf", "werewolf", "seer", "robber", "troublemaker", "drunk", "insomniac", "villager"],
+    ["werewolf", "minion", "tanner", "hunter", "seer", "robber", "drunk"],
+]
+
+
+class _Crash(Exception):
+    pass
+
+
+class TestSweep(unittest.TestCase):
+    def test_resume_after_interrupt(self):
+        units = make_units(POOLS, 90, seed=4, unit_games=20)
+        calls = []
+
+        def flaky(unit):
+            calls.append(unit["unit_id"])
+            if len(calls) == 4:
+                raise KeyboardInterrupt
+            return run_unit(unit)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sweep.ckpt")
+            with self.assertRaises(KeyboardInterrupt):
+                sweep.Sweep(units, checkpoint=path, every=0.0, runner=flaky).run()
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.assertEqual(state["done"], [0, 1, 2])
+            self.assertEqual(state["streams"][str(pool_id(POOLS[0]))], 4 + 60)
+            self.assertEqual(os.listdir(tmp), ["sweep.ckpt"])
+
+            resumed = sweep.Sweep(units, checkpoint=path, runner=lambda u: calls.append(u["unit_id"]) or run_unit(u))
+            self.assertTrue(resumed.resumed)
+            totals = resumed.run()
+            # 已完成的单元不重做，中断的单元整块重做
+            self.assertEqual(calls[4:], list(range(3, len(units))))
+            for pool in POOLS:
+                self.assertEqual(totals[pool_id(pool)], tally(pool, 90, seed=4))
+
+            with self.assertRaises(ValueError):
+                sweep.Sweep(make_units(POOLS, 91, seed=4, unit_games=20), checkpoint=path)
+
+    def test_atomic_write_keeps_old_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "c.ckpt")
+            sweep.write_checkpoint(path, {"format": sweep.CHECKPOINT_FORMAT, "x": 1})
+            with self.assertRaises(TypeError):
+                sweep.write_checkpoint(path, {"format": sweep.CHECKPOINT_FORMAT, "x": object()})
+            self.assertEqual(sweep.read_checkpoint(path)["x"], 1)
+            self.assertEqual(os.listdir(tmp), ["c.ckpt"])
+            self.assertIsNone(sweep.read_checkpoint(os.path.join(tmp, "missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import itertools
+import unittest
+
+from core.simulation import play_game, tally
+from core.symmetry import (canonical_deal, deal_orbits, expectation, orbit_count, stratified_rates,
+                           total_deals)
+
+POOL = ["werewolf", "werewolf", "seer", "robber", "troublemaker", "villager", "villager"]
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_weights_cover_all_deals(self):
+        self.assertEqual(total_deals(POOL), 5040 // (2 * 2))
+        for seat_symmetric in (True, False):
+            orbits = list(deal_orbits(POOL, seat_symmetric))
+            self.assertEqual(sum(w for _d, w in orbits), total_deals(POOL))
+            self.assertEqual(len({d for d, _w in orbits}), len(orbits))
+        self.assertLess(orbit_count(POOL), orbit_count(POOL, seat_symmetric=False))
+        self.assertLess(orbit_count(POOL, seat_symmetric=False), total_deals(POOL))
+
+    def test_canonical_deal_matches_brute_force(self):
+        weights = dict(deal_orbits(POOL))
+        seen = {}
+        for perm in set(itertools.permutations(POOL)):
+            key = canonical_deal(perm[:4], perm[4:])
+            seen[key] = seen.get(key, 0) + 1
+        self.assertEqual(seen, weights)
+        self.assertEqual(canonical_deal(["狼人", "seer"], ["villager", "werewolf", "robber"]),
+                         (("werewolf", "seer"), ("werewolf", "robber", "villager")))
+
+    def test_expectation_is_exact(self):
+        def wolves_in_center(players, center):
+            return center.count("werewolf")
+
+        perms = list(itertools.permutations(POOL))
+        brute = sum(p[4:].count("werewolf") for p in perms) / len(perms)
+        self.assertAlmostEqual(expectation(POOL, wolves_in_center), brute)
+        self.assertAlmostEqual(expectation(POOL, wolves_in_center, seat_symmetric=False), brute)
+
+    def test_fixed_deal_and_stratified_rates(self):
+        deal = ["seer", "werewolf", "villager", "robber", "werewolf", "troublemaker", "villager"]
+        game = play_game(POOL, 5, deal=deal)
+        self.assertEqual(game["players"] + game["center"], deal)
+        with self.assertRaises(ValueError):
+            play_game(POOL, 5, deal=deal[:-1] + ["tanner"])
+
+        rates = stratified_rates(POOL, games_per_orbit=150, seed=1)
+        self.assertEqual(rates["orbits"], orbit_count(POOL))
+        counts = tally(POOL, 4000, seed=100)
+        for faction in ("good", "wolf"):
+            self.assertAlmostEqual(rates[faction], counts[faction] / counts["games"], delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""构建期生成卡图 atlas（Kivy .atlas 格式），供 Android 端一次性上传 GPU 纹理。
+
+每个尺寸档生成一组 cards-<高度>.atlas 与对应的 PNG 页：所有角色图与卡背（background）
+按该高度等比缩放后装箱到同一张大纹理上。运行时见 Android/card_textures.py。
+只依赖 Pillow，不需要在构建机上安装 Kivy。
+
+用法（在项目根目录下）：
+    python wolf/tools/build_card_atlas.py                      # 默认输出到 Android/atlas（运行时读取的目录）
+    python wolf/tools/build_card_atlas.py --sizes 128,256,400 --page 2048
+"""
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_ROLE_DIRS = (
+    os.path.join(PROJECT_ROOT, 'images', 'roles'),
+    os.path.join(PROJECT_ROOT, 'wolf', 'resources', 'roles'),
+)
+DEFAULT_BACKGROUND = os.path.join(PROJECT_ROOT, 'images', 'background.jpg')
+# 原图约 400px，更大的档位没有意义；中端机常见 GL_MAX_TEXTURE_SIZE 为 2048/4096
+DEFAULT_SIZES = (128, 256, 400)
+DEFAULT_PAGE = 2048
+PADDING = 2
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+
+
+def collect_sources(role_dirs: Sequence[str], background: Optional[str]) -> Dict[str, str]:
+    """角色名 -> 图片路径；靠前目录优先，卡背登记为 'background'。"""
+    sources: Dict[str, str] = {}
+    for d in role_dirs:
+        if not os.path.isdir(d):
+            continue
+        for fn in sorted(os.listdir(d)):
+            name, ext = os.path.splitext(fn)
+            if ext.lower() in IMAGE_EXTS and name not in sources:
+                sources[name] = os.path.join(d, fn)
+    if background and os.path.exists(background):
+        sources.setdefault('background', background)
+    return sources
+
+
+def _fit(img: Image.Image, height: int) -> Image.Image:
+    w, h = img.size
+    width = max(1, round(w * height / h))
+    return img.convert('RGBA').resize((width, height), Image.LANCZOS)
+
+
+def pack(sizes: List[Tuple[str, Tuple[int, int]]], page: int, padding: int = PADDING):
+    """按行（shelf）装箱，返回 [[(名称, x, y), ...], ...]，每个子列表为一页，y 自上而下。"""
+    pages: List[List[Tuple[str, int, int]]] = [[]]
+    x = y = shelf_h = 0
+    for name, (w, h) in sorted(sizes, key=lambda it: (-it[1][1], it[0])):
+        if w + padding > page or h + padding > page:
+            raise ValueError(f"图片 {name} 尺寸 {w}x{h} 超过 atlas 页尺寸 {page}")
+        if x + w + padding > page:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h + padding > page:
+            pages.append([])
+            x = y = shelf_h = 0
+        pages[-1].append((name, x + padding, y + padding))
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+    return pages
+
+
+def build_atlas(sources: Dict[str, str], height: int, out_dir: str, page: int = DEFAULT_PAGE,
+                padding: int = PADDING) -> str:
+    """生成 cards-<height>.atlas 及其 PNG 页，返回 .atlas 路径。"""
+    if not sources:
+        raise ValueError("没有可打包的卡图")
+    images = {}
+    for name, path in sources.items():
+        with Image.open(path) as im:
+            images[name] = _fit(im, height)
+    layout = pack([(n, im.size) for n, im in images.items()], page, padding)
+    os.makedirs(out_dir, exist_ok=True)
+    base = f"cards-{height}"
+    meta: Dict[str, Dict[str, List[int]]] = {}
+    for idx, entries in enumerate(layout):
+        used_w = max(x + images[n].size[0] for n, x, _ in entries) + padding
+        used_h = max(y + images[n].size[1] for n, _, y in entries) + padding
+        sheet = Image.new('RGBA', (used_w, used_h), (0, 0, 0, 0))
+        page_meta = {}
+        for name, x, y in entries:
+            im = images[name]
+            sheet.paste(im, (x, y))
+            w, h = im.size
+            # Kivy 纹理坐标原点在左下角
+            page_meta[name] = [x, used_h - y - h, w, h]
+        page_name = f"{base}-{idx}.png"
+        sheet.save(os.path.join(out_dir, page_name), optimize=True)
+        meta[page_name] = page_meta
+    atlas_path = os.path.join(out_dir, f"{base}.atlas")
+    with open(atlas_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, sort_keys=True)
+    return atlas_path
+
+
+def _sizes(text):
+    try:
+        sizes = sorted({int(s) for s in text.split(',') if s.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效尺寸列表：{text}")
+    if not sizes or sizes[0] <= 0:
+        raise argparse.ArgumentTypeError(f"无效尺寸列表：{text}")
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成 Kivy 卡图 atlas")
+    parser.add_argument('--out', default=os.path.join(PROJECT_ROOT, 'Android', 'atlas'), help="输出目录")
+    parser.add_argument('--roles', action='append', default=None, help="角色图片目录（可多次指定）")
+    parser.add_argument('--background', default=DEFAULT_BACKGROUND, help="卡背图片")
+    parser.add_argument('--sizes', type=_sizes, default=list(DEFAULT_SIZES), help="尺寸档（像素高度），逗号分隔")
+    parser.add_argument('--page', type=int, default=DEFAULT_PAGE, help="atlas 页最大边长")
+    args = parser.parse_args(argv)
+
+    sources = collect_sources(args.roles or DEFAULT_ROLE_DIRS, args.background)
+    for h in args.sizes:
+        path = build_atlas(sources, h, args.out, page=args.page)
+        print("生成：", path)
+    print("atlas 生成完成，共", len(sources), "张卡图，", len(args.sizes), "个尺寸档")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
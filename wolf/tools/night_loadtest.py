@@ -0,0 +1,78 @@
+"""无头压测：脚本化点击跑完多局引导式夜晚，输出各步骤点击耗时分布。
+
+用法（在 wolf/ 目录下）：
+    python tools/night_loadtest.py --games 2000 --seed 1 --timeout-rate 0.05
+    python tools/night_loadtest.py --games 500 --json latency.json --fail-over-ms 50
+    python tools/night_loadtest.py --games 20 --trace night_trace.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+WOLF_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if WOLF_DIR not in sys.path:
+    sys.path.insert(0, WOLF_DIR)
+
+from gui.headless import HeadlessNightDriver  # noqa: E402
+from gui.instrumentation import Instrumentation  # noqa: E402
+
+
+def _range(text):
+    lo, _, hi = text.partition('-')
+    lo = int(lo)
+    hi = int(hi) if hi else lo
+    if lo > hi:
+        raise argparse.ArgumentTypeError(f"无效区间：{text}")
+    return lo, hi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tk 夜晚流程无头压测")
+    parser.add_argument('--games', type=int, default=200, help="局数")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子（复现用）")
+    parser.add_argument('--players', type=_range, default=(4, 12), help="玩家人数区间，如 4-12")
+    parser.add_argument('--wolves', type=_range, default=(1, 3), help="狼人数量区间，如 1-3")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="每步不操作、等待倒计时的概率")
+    parser.add_argument('--json', dest='json_path', default=None, help="将汇总写入 JSON 文件")
+    parser.add_argument('--trace', default=None, help="开启方法级耗时统计并写出 Chrome trace JSON")
+    parser.add_argument('--fail-over-ms', type=float, default=None, help="任一点击超过该耗时则以非零码退出")
+    args = parser.parse_args(argv)
+
+    driver = HeadlessNightDriver(seed=args.seed, timeout_rate=args.timeout_rate)
+    inst = Instrumentation().install(driver.app) if args.trace else None
+    step = max(1, args.games // 10)
+
+    def progress(done):
+        if done % step == 0 or done == args.games:
+            print(f"已完成 {done}/{args.games} 局", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    hs = driver.run(args.games, players=args.players, wolves=args.wolves, progress=progress)
+    elapsed = time.perf_counter() - t0
+
+    print(hs.format_table())
+    if inst is not None:
+        inst.dump_trace(args.trace)
+        print("\n方法与回调耗时：")
+        print(inst.format_report())
+    print(f"\n共 {driver.games} 局，倒计时推进 {driver.timeouts} 次，用时 {elapsed:.1f}s")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'games': driver.games,
+                'timeouts': driver.timeouts,
+                'elapsed_s': round(elapsed, 3),
+                'histograms': hs.summary(),
+            }, f, ensure_ascii=False, indent=2)
+    if args.fail_over_ms is not None:
+        worst = hs.get('all').max or 0
+        if worst > args.fail_over_ms * 1000:
+            print(f"最长点击耗时 {worst / 1000:.2f}ms 超过阈值 {args.fail_over_ms}ms", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""角色池平衡性扫描：对每个角色池模拟若干局并输出各阵营胜率，支持检查点续跑。
+
+用法（在 wolf/ 目录下）：
+    python tools/run_sweep.py --pool werewolf,werewolf,seer,robber,troublemaker,drunk,insomniac,villager --games 100000
+    python tools/run_sweep.py --pools-file pools.json --games 1000000 --checkpoint sweep.ckpt
+    python tools/run_sweep.py --pools-file pools.json --tolerance 0.01 --workers 8
+中断（Ctrl-C）后以相同参数与 --checkpoint 重新运行即可从断点继续。
+给出 --tolerance 时改为自适应停止：每个角色池按批模拟，各阵营胜率区间宽度都不超过容差即停止，
+--games 为每池上限（该模式不写检查点）。
+加 --cache 时每个工作单元的结果缓存到磁盘（core.result_cache），重复运行相同参数直接读取。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+WOLF_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if WOLF_DIR not in sys.path:
+    sys.path.insert(0, WOLF_DIR)
+
+from core.distributed import DEFAULT_UNIT_GAMES, make_units, run_unit  # noqa: E402
+from core.result_cache import ResultCache  # noqa: E402
+from core.simulation import VOTE_POLICIES, pool_id  # noqa: E402
+from core.stopping import INTERVALS, adaptive_sweep  # noqa: E402
+from core.sweep import DEFAULT_CHECKPOINT_EVERY, Sweep  # noqa: E402
+
+
+def _load_pools(args):
+    pools = [p.split(',') for p in args.pool or []]
+    if args.pools_file:
+        with open(args.pools_file, 'r', encoding='utf-8') as f:
+            pools.extend(json.load(f))
+    return pools
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="角色池胜率扫描")
+    parser.add_argument('--pool', action='append', default=None, help="逗号分隔的角色池（可多次指定）")
+    parser.add_argument('--pools-file', default=None, help="JSON 文件：角色池列表")
+    parser.add_argument('--games', type=int, default=10000, help="每个角色池的局数")
+    parser.add_argument('--seed', type=int, default=0, help="起始种子")
+    parser.add_argument('--policy', choices=sorted(VOTE_POLICIES), default='random', help="投票策略")
+    parser.add_argument('--unit-games', type=int, default=DEFAULT_UNIT_GAMES, help="每个工作单元的局数")
+    parser.add_argument('--checkpoint', default=None, help="检查点文件（存在则续跑）")
+    parser.add_argument('--every', type=float, default=DEFAULT_CHECKPOINT_EVERY, help="检查点间隔（秒）")
+    parser.add_argument('--tolerance', type=float, default=None, help="自适应停止的区间宽度容差，如 0.01")
+    parser.add_argument('--method', choices=sorted(INTERVALS), default='wilson', help="区间方法")
+    parser.add_argument('--confidence', type=float, default=0.95, help="置信水平")
+    parser.add_argument('--workers', type=int, default=1, help="自适应模式的工作进程数")
+    parser.add_argument('--cache', action='store_true', help="使用磁盘结果缓存")
+    parser.add_argument('--cache-dir', default=None, help="结果缓存目录")
+    parser.add_argument('--json', dest='json_path', default=None, help="将结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    pools = _load_pools(args)
+    if not pools:
+        parser.error("至少需要一个角色池（--pool 或 --pools-file）")
+    cache = ResultCache(args.cache_dir) if args.cache or args.cache_dir else None
+    runner = cache.run_unit if cache is not None else run_unit
+    t0 = time.perf_counter()
+    if args.tolerance is not None:
+        rows = adaptive_sweep(pools, args.tolerance, args.method, args.confidence, args.unit_games,
+                              args.games, args.seed, args.policy, args.workers, runner=runner)
+    else:
+        units = make_units(pools, args.games, args.seed, args.policy, args.unit_games)
+        sweep = Sweep(units, checkpoint=args.checkpoint, every=args.every, runner=runner)
+        if sweep.resumed:
+            print(f"从检查点继续：已完成 {len(sweep.done)}/{len(units)} 个单元", file=sys.stderr)
+        step = max(1, len(units) // 20)
+
+        def progress(done, total):
+            if done % step == 0 or done == total:
+                print(f"已完成 {done}/{total} 个单元", file=sys.stderr)
+
+        try:
+            totals = sweep.run(progress)
+        except KeyboardInterrupt:
+            print("已中断，进度已写入检查点" if args.checkpoint else "已中断", file=sys.stderr)
+            return 130
+        rows = [{'pool': pool, 'pool_id': pool_id(pool), 'counts': totals.get(pool_id(pool), {})} for pool in pools]
+    elapsed = time.perf_counter() - t0
+
+    for row in rows:
+        counts = row['counts']
+        games = counts.get('games', 0)
+        row['rates'] = {k: counts.get(k, 0) / (games or 1) for k in ('good', 'wolf', 'tanner')}
+        note = "" if row.get('decided', True) else "，未收敛"
+        print(f"{','.join(row['pool'])}: 好人 {row['rates']['good']:.3f}  狼人 {row['rates']['wolf']:.3f}  "
+              f"皮匠 {row['rates']['tanner']:.3f}  ({games} 局{note})")
+    print(f"\n用时 {elapsed:.1f}s", file=sys.stderr)
+    if cache is not None and args.tolerance is None:
+        print(f"缓存命中 {cache.hits}，未命中 {cache.misses}", file=sys.stderr)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())